@@ -0,0 +1,133 @@
+"""
+Бенчмарк и проверка ``DBusNotify`` на локальной шине.
+
+Запускает собственный ``dbus-daemon --session`` и заглушку сервера `org.freedesktop.Notifications`
+(сессия пользователя не затрагивается), затем измеряет задержку уведомлений через шину и запуск notify-send.
+
+Запуск (из директории `benchmarks`):
+    python dbus_notify.py [--count 2000] [--dbus-daemon dbus-daemon]
+"""
+import argparse
+import asyncio as io
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from dbus_next.aio import MessageBus  # noqa: E402
+from dbus_next.service import ServiceInterface, method, signal  # noqa: E402
+
+STUB_ACTION_DELAY = 0.05
+
+
+class NotificationsStub(ServiceInterface):
+    """Заглушка сервера уведомлений: нажимает первую кнопку через ``STUB_ACTION_DELAY`` секунд."""
+
+    def __init__(self) -> None:
+        super().__init__("org.freedesktop.Notifications")
+        self.count = 0
+        self.urgencies: list[int] = []
+
+    @method()
+    def Notify(self, app_name: "s", replaces_id: "u", app_icon: "s", summary: "s", body: "s",  # noqa: F821
+               actions: "as", hints: "a{sv}", expire_timeout: "i") -> "u":  # noqa: F821, F722
+        self.count += 1
+        notification_id = replaces_id or self.count
+        self.urgencies.append(hints["urgency"].value)
+        if actions:
+            io.get_running_loop().call_later(STUB_ACTION_DELAY, self.ActionInvoked, notification_id, actions[0])
+        return notification_id
+
+    @method()
+    def CloseNotification(self, notification_id: "u"):  # noqa: F821
+        self.NotificationClosed(notification_id, 3)
+
+    @signal()
+    def ActionInvoked(self, notification_id, action_key) -> "us":  # noqa: F821
+        return [notification_id, action_key]
+
+    @signal()
+    def NotificationClosed(self, notification_id, reason) -> "uu":  # noqa: F821
+        return [notification_id, reason]
+
+
+async def run_stub(ready: io.Event) -> None:
+    bus = await MessageBus().connect()
+    bus.export("/org/freedesktop/Notifications", NotificationsStub())
+    await bus.request_name("org.freedesktop.Notifications")
+    ready.set()
+    await io.Future()
+
+
+async def bench(count: int) -> None:
+    from notification.dbus_notify import DBusNotify, NotificationsBus
+    from property.constants import NotifyUrgency
+
+    ready = io.Event()
+    stub_task = io.create_task(run_stub(ready))
+    await ready.wait()
+
+    first = DBusNotify("benchmark", "urgency", urgency=NotifyUrgency.CRIT)
+    result = await first.do_notify(communicate=True)
+    replaced = await first.do_notify(communicate=True)
+    print(f"Notify: id={result.out}, replaces_id сохраняет id: {replaced.out == result.out}")
+
+    buttons = DBusNotify("benchmark", "actions")
+    buttons.throw_extra_buttons(((1, "OK"), (2, "Cancel")))
+    print(f"Нажатая кнопка: {(await buttons.do_notify(communicate=True)).out}")
+
+    closing = DBusNotify("benchmark", "close")
+    await closing.do_notify()
+    await closing.wait_sent()
+    closed = io.create_task(NotificationsBus().wait_action(closing.notification_id))
+    await closing.close()
+    print(f"CloseNotification -> NotificationClosed: {await closed is None}")
+
+    notifications = [DBusNotify("benchmark", str(index)) for index in range(count)]
+    start = time.perf_counter()
+    for notification in notifications:
+        await notification.do_notify()
+    queued = time.perf_counter() - start
+    await io.gather(*(notification.wait_sent() for notification in notifications))
+    delivered = time.perf_counter() - start
+    print(f"{count} уведомлений: задержка вызова {queued / count * 1e6:.1f} мкс, "
+          f"доставка всех {delivered:.3f} сек ({delivered / count * 1e6:.0f} мкс/уведомление)")
+
+    start = time.perf_counter()
+    for _ in range(20):
+        await DBusNotify("benchmark", "round trip").do_notify(communicate=True)
+    print(f"Ожидание ответа сервера: {(time.perf_counter() - start) / 20 * 1e6:.0f} мкс")
+
+    start = time.perf_counter()
+    try:
+        for _ in range(20):
+            subprocess.run(["notify-send", "benchmark", "fork"], check=False, stderr=subprocess.DEVNULL)
+        print(f"notify-send: {(time.perf_counter() - start) / 20 * 1e6:.0f} мкс")
+    except FileNotFoundError:
+        print("notify-send не установлен.")
+
+    NotificationsBus().disconnect()
+    stub_task.cancel()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--dbus-daemon", default="dbus-daemon")
+    args = parser.parse_args()
+
+    daemon = subprocess.Popen(
+        [args.dbus_daemon, "--session", "--nofork", "--print-address=1"], stdout=subprocess.PIPE, text=True
+    )
+    try:
+        os.environ["DBUS_SESSION_BUS_ADDRESS"] = daemon.stdout.readline().strip()
+        io.run(bench(args.count))
+    finally:
+        daemon.terminate()
+        daemon.wait()
+
+
+if __name__ == "__main__":
+    main()
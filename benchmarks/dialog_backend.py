@@ -0,0 +1,74 @@
+"""
+Сравнение задержки показа окна: процесс zenity на окно против постоянного процесса окон на tkinter.
+
+Запускает собственный ``Xvfb`` и показывает одно и то же окно ``--info --timeout=1`` через оба способа.
+Окно закрывается по таймауту, поэтому задержка показа - время ответа минус таймаут.
+
+Запуск (из директории `benchmarks`):
+    python dialog_backend.py [--count 20] [--xvfb Xvfb] [--display :99]
+"""
+import argparse
+import asyncio as io
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from notification.base import ShellExec  # noqa: E402
+from notification.tk_dialog import TkDialogClient  # noqa: E402
+from property.helpers import percentiles  # noqa: E402
+
+DIALOG_TIMEOUT = 1
+ARGV = ["zenity", "--info", "--title=benchmark", f"--timeout={DIALOG_TIMEOUT}", "--text=Окно бенчмарка"]
+
+
+def report(title: str, samples: list[float]) -> None:
+    stats = percentiles([sample * 1000 for sample in samples])
+    print(f"{title:<32} " + "  ".join(f"{name}={value:.1f} мс" for name, value in stats.items()))
+
+
+async def measure(count: int) -> None:
+    shell = ShellExec()
+    zenity_samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        await shell.exec_subprocess(ARGV, interplay=True, ignore_error=True)
+        zenity_samples.append(time.perf_counter() - start - DIALOG_TIMEOUT)
+    report("zenity (процесс на окно)", zenity_samples)
+
+    client = TkDialogClient()
+    start = time.perf_counter()
+    await client.start()
+    await client.run(ARGV)
+    report("tkinter (первое окно с запуском)", [time.perf_counter() - start - DIALOG_TIMEOUT])
+    tk_samples = []
+    for _ in range(count):
+        start = time.perf_counter()
+        result = await client.run(ARGV)
+        tk_samples.append(time.perf_counter() - start - DIALOG_TIMEOUT)
+    report("tkinter (постоянный процесс)", tk_samples)
+    print(f"Ответ tkinter: {result!r}")
+    await client.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=20)
+    parser.add_argument("--xvfb", default="Xvfb")
+    parser.add_argument("--display", default=":99")
+    args = parser.parse_args()
+
+    xvfb = subprocess.Popen([args.xvfb, args.display, "-screen", "0", "1280x1024x24", "-nolisten", "tcp"])
+    try:
+        time.sleep(1)
+        os.environ["DISPLAY"] = args.display
+        io.run(measure(args.count))
+    finally:
+        xvfb.terminate()
+        xvfb.wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Нагрузка учёта времени работы (``WorkSessionTracker``) на процесс.
+
+Вызывает обработчики событий так же часто, как слушатели pynput при быстром наборе и движении мыши,
+и считает процессорное время обработчиков и периодической проверки относительно длительности замера.
+Собственная обработка событий X сервера в pynput не учитывается (не зависит от обработчиков).
+
+Запуск (из директории `benchmarks`):
+    python session_tracker.py [--keys 15] [--moves 1000] [--seconds 60]
+"""
+import argparse
+import asyncio as io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("PYNPUT_BACKEND", "dummy")
+
+from scheduler.session import WorkSessionTracker  # noqa: E402
+
+
+async def on_break(active_minutes: int, worked_hours: float) -> None:
+    print(f"Перерыв: {active_minutes} мин., {worked_hours} ч.")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keys", type=int, default=15, help="Нажатий клавиш в секунду.")
+    parser.add_argument("--moves", type=int, default=1000, help="Событий мыши в секунду.")
+    parser.add_argument("--seconds", type=int, default=60, help="Моделируемая длительность работы.")
+    args = parser.parse_args()
+
+    tracker = WorkSessionTracker(on_break=on_break, break_time=lambda: 45 * 60, idle=lambda: 300)
+    key_hit, mouse_hit = tracker.keyboard_counter.hit, tracker.mouse_counter.hit
+    key_events, mouse_events = args.keys * args.seconds, args.moves * args.seconds
+
+    start = time.process_time()
+    for _ in range(key_events):
+        key_hit(None)
+    for _ in range(mouse_events):
+        mouse_hit(0, 0)
+    handlers = time.process_time() - start
+
+    checks = int(args.seconds / tracker.CHECK_INTERVAL) or 1
+    start = time.process_time()
+    for _ in range(checks):
+        io.run(tracker.check())
+    checking = time.process_time() - start
+
+    per_event = handlers / (key_events + mouse_events) * 1e6
+    print(f"Обработчик события: {per_event:.2f} мкс")
+    print(f"Проверка: {checking / checks * 1000:.2f} мс")
+    print(f"Нагрузка: {(handlers + checking) / args.seconds * 100:.3f}% CPU")
+
+
+if __name__ == "__main__":
+    main()
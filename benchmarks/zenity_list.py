@@ -0,0 +1,102 @@
+"""
+Бенчмарк построения и передачи больших таблиц ``zenity --list``.
+
+Запуск (из директории `benchmarks`, как и приложение - из поддиректории проекта):
+    python zenity_list.py [--rows 100000] [--zenity]
+
+Без ``--zenity`` вместо окна используется ``wc -l``, читающий ячейки из stdin так же, как zenity.
+"""
+import argparse
+import asyncio as io
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from notification.base import ShellExec  # noqa: E402
+from notification.zenity import Zenity, ZenityListBuilder  # noqa: E402
+
+COLUMNS = ("🚩", "name", "📆", "⏰", "✅")
+
+
+def make_row(index: int) -> tuple[str, ...]:
+    return f"{index:024x}", f"reminder {index}", "2024-10-04", "09:00:00", "False"
+
+
+def legacy_columns(rows: int) -> dict[str, tuple[str, ...]]:
+    """Прежний способ: ``tuple += (value,)`` для каждой ячейки (O(rows²))."""
+    columns = {name: tuple() for name in COLUMNS}
+    for index in range(rows):
+        for name, value in zip(COLUMNS, make_row(index)):
+            columns[name] += (value,)
+    return columns
+
+
+def builder_columns(rows: int) -> ZenityListBuilder:
+    builder = ZenityListBuilder(COLUMNS)
+    for index in range(rows):
+        builder.add_row(*make_row(index))
+    return builder
+
+
+def measure(title: str, func, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{title:<45} {elapsed:>9.3f} сек. {peak / 2 ** 20:>9.1f} MiB")
+    return result
+
+
+async def feed_list(builder: ZenityListBuilder, real_zenity: bool) -> None:
+    zenity = Zenity(title="benchmark", timeout=1)
+    zenity.throw_list_args(columns=builder, return_column_number=1, radiolist=True, stdin=True)
+    cmd = ["zenity"] if real_zenity else ["wc", "-l"]
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    if real_zenity:
+        result = await zenity.do_notify(ignore_error=True)
+    else:
+        result = await ShellExec().exec_subprocess(
+            cmd, interplay=True, ignore_error=True, stdin=(cell.replace("\n", " ") for cell in builder.cells()),
+        )
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{'stdin ' + ' '.join(cmd):<45} {elapsed:>9.3f} сек. {peak / 2 ** 20:>9.1f} MiB"
+          f"  (code={result.code}, out={str(result.out)[:20]!r})")
+
+
+def argv_list(builder: ZenityListBuilder) -> None:
+    argv = ["true", *builder.cells()]
+    print(f"argv: {len(argv)} аргументов, {sum(map(len, argv)) / 2 ** 20:.1f} MiB, ARG_MAX={os.sysconf('SC_ARG_MAX')}")
+    try:
+        io.run(ShellExec().exec_subprocess(argv, interplay=True, ignore_error=True))
+        print("argv: процесс запущен")
+    except OSError as e:
+        print(f"argv: {e!r}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--legacy-rows", type=int, nargs="*", default=[1_000, 5_000, 10_000])
+    parser.add_argument("--zenity", action="store_true", help="Открыть настоящее окно zenity (нужен DISPLAY).")
+    args = parser.parse_args()
+
+    for rows in args.legacy_rows:
+        measure(f"tuple += ({rows} строк)", legacy_columns, rows)
+    for rows in (*args.legacy_rows, args.rows):
+        builder = measure(f"ZenityListBuilder ({rows} строк)", builder_columns, rows)
+
+    argv_list(builder)
+    io.run(feed_list(builder, args.zenity))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,41 +1,192 @@
+import asyncio as io
+import logging
 from contextlib import asynccontextmanager
 
 from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorDatabase, AsyncIOMotorCollection
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession, AsyncEngine
 from typing_extensions import AsyncGenerator
 
 from exceptions.database import ConfigException
-from property.settings import DataBaseSettings
+from property.settings import DataBaseSettings, SettingsSnapshot
+
+logger = logging.getLogger(__name__)
 
 
 class DataBasesSessionsManager:
     """Контекстный менеджер для реализации запрос к бд."""
+    _POSTGRES_ENGINE: AsyncEngine | None = None
+    _POSTGRES_SESSION_MAKER: async_sessionmaker[AsyncSession] | None = None
+    _MONGO_CLIENTS: dict[tuple[io.AbstractEventLoop | None, str], AsyncIOMotorClient] = {}
+    _MONGO_HANDLES: dict[tuple, AsyncIOMotorDatabase | AsyncIOMotorCollection] = {}
+    POSTGRES_OPTIONS: tuple[str, ...] = (
+        "DB_NAME", "DB_USER", "DB_PASSWORD", "DB_HOST", "DB_PORT", "DB_POOL_SIZE", "DB_MAX_OVERFLOW",
+        "DB_POOL_PRE_PING", "DB_POOL_RECYCLE", "DB_STATEMENT_CACHE_SIZE",
+    )
+    MONGO_OPTIONS: tuple[str, ...] = (
+        "DB_USER_MONGO", "DB_PASSWORD_MONGO", "DB_HOST_MONGO", "DB_PORT_MONGO", "DB_POOL_SIZE_MONGO",
+        "DB_MIN_POOL_SIZE_MONGO", "DB_MAX_IDLE_TIME_MS_MONGO", "DB_SERVER_SELECTION_TIMEOUT_MS_MONGO",
+        "DB_CONNECT_TIMEOUT_MS_MONGO", "DB_SOCKET_TIMEOUT_MS_MONGO", "DB_COMPRESSORS_MONGO", "DB_ZLIB_LEVEL_MONGO",
+    )
+    RELOAD_GRACE: float = 30
+
+    @classmethod
+    def get_postgres_engine(cls) -> AsyncEngine:
+        """
+        Получение общего для всего процесса движка postgres.
+            Движок создаётся лениво при первом обращении, параметры пула берутся из секции [DB] `settings.ini`.
+            Кэши скомпилированных выражений SQLAlchemy и подготовленных запросов asyncpg живут вместе с движком.
+
+        :return: Асинхронный движок с пулом соединений.
+        """
+        if cls._POSTGRES_ENGINE is None:
+            settings = DataBaseSettings()
+            url = make_url(settings.get_postgres_url).update_query_dict({
+                "prepared_statement_cache_size": str(settings.statement_cache_size),
+            })
+            cls._POSTGRES_ENGINE = create_async_engine(
+                url=url,
+                echo=settings.echo,
+                pool_size=settings.pool_size,
+                max_overflow=settings.max_overflow,
+                pool_pre_ping=settings.pool_pre_ping,
+                pool_recycle=settings.pool_recycle,
+                connect_args={"statement_cache_size": settings.statement_cache_size},
+            )
+            cls._POSTGRES_SESSION_MAKER = async_sessionmaker(
+                bind=cls._POSTGRES_ENGINE, class_=AsyncSession, expire_on_commit=False
+            )
+        return cls._POSTGRES_ENGINE
 
-    @staticmethod
+    @classmethod
     @asynccontextmanager
-    async def get_postgres_session(expire: bool | None = False, echo: bool | None = DataBaseSettings().echo,
-                                   url: str | None = DataBaseSettings().get_postgres_url) -> AsyncGenerator[
-        AsyncSession]:
-        engine = create_async_engine(url=url, echo=echo)
-        _async_session = async_sessionmaker(bind=engine, class_=AsyncSession, expire_on_commit=expire)
-        try:
-            async with _async_session() as session:
+    async def get_postgres_session(
+            cls, expire: bool | None = False, reraise: bool = False
+    ) -> AsyncGenerator[AsyncSession]:
+        """
+        Сессия postgres. При ошибке запроса транзакция откатывается.
+
+        :param expire: Сбрасывать состояние моделей после commit.
+        :param reraise: Передавать ошибку вызывающему коду (иначе она только логируется).
+
+        :return: Асинхронный генератор сессии.
+        """
+        cls.get_postgres_engine()
+        async with cls._POSTGRES_SESSION_MAKER(expire_on_commit=expire) as session:
+            try:
                 yield session
-        except Exception as e:
-            await session.rollback()
-            print(f"\n\t>>> ERROR: {e}.\n")
-        finally:
-            await session.close()
+            except Exception as e:
+                await session.rollback()
+                if reraise:
+                    raise
+                logger.exception("Ошибка запроса к postgres: %s", e)
 
-    @staticmethod
+    @classmethod
+    async def warm_up(cls) -> None:
+        """
+        Открытие соединений postgres и mongodb заранее (перед открытием меню),
+            чтобы первый запрос не ждал подключения. Соединение postgres возвращается в пул.
+
+        :return: None.
+        """
+        async with cls.get_postgres_engine().connect() as connection:
+            await connection.exec_driver_sql("SELECT 1")
+        await cls.get_mongo_client().admin.command("ping")
+
+    @classmethod
+    async def dispose(cls) -> None:
+        """Закрытие пулов соединений postgres и mongodb. Вызывается при завершении работы приложения."""
+        if cls._POSTGRES_ENGINE is not None:
+            await cls._POSTGRES_ENGINE.dispose()
+            cls._POSTGRES_ENGINE = None
+            cls._POSTGRES_SESSION_MAKER = None
+        cls.close_mongo()
+
+    @classmethod
+    def on_settings_changed(cls, old: SettingsSnapshot | None, new: SettingsSnapshot) -> None:
+        """
+        Применение новых настроек (подписчик ``Settings.subscribe``): пулы, параметры которых изменились,
+            отвязываются и создаются заново при следующем запросе. Старые пулы закрываются в фоне:
+            postgres - сразу (выданные соединения закрываются при возврате), mongodb - через ``RELOAD_GRACE`` секунд,
+            чтобы начатые запросы успели завершиться.
+
+        :param old: Предыдущий снимок настроек.
+        :param new: Новый снимок настроек.
+
+        :return: None.
+        """
+        try:
+            loop = io.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if cls._POSTGRES_ENGINE is not None and (
+                new.changed(old, "DB", *cls.POSTGRES_OPTIONS) or new.changed(old, "ALL", "DEBUG")
+        ):
+            engine = cls._POSTGRES_ENGINE
+            cls._POSTGRES_ENGINE = None
+            cls._POSTGRES_SESSION_MAKER = None
+            if loop is not None:
+                loop.create_task(engine.dispose())
+
+        if cls._MONGO_CLIENTS and new.changed(old, "DB", *cls.MONGO_OPTIONS):
+            clients = list(cls._MONGO_CLIENTS.values())
+            cls._MONGO_CLIENTS.clear()
+            cls._MONGO_HANDLES.clear()
+            for client in clients:
+                if loop is not None:
+                    loop.call_later(cls.RELOAD_GRACE, client.close)
+                else:
+                    client.close()
+
+    @classmethod
+    def __get_mongo_client_key(cls, url: str | None) -> tuple[io.AbstractEventLoop | None, str]:
+        """
+        Ключ общего клиента mongodb: текущий event loop и адрес подключения.
+            Клиенты закрытых event loop при этом закрываются и удаляются.
+
+        :param url: Ссылка для подключения к бд (по умолчанию из `settings.ini`).
+
+        :return: (event loop, url).
+        """
+        try:
+            loop = io.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        for closed_key in [key for key in cls._MONGO_CLIENTS if key[0] is not None and key[0].is_closed()]:
+            cls._MONGO_CLIENTS.pop(closed_key).close()
+            cls._MONGO_HANDLES = {key: val for key, val in cls._MONGO_HANDLES.items() if key[0] != closed_key}
+
+        return loop, url or DataBaseSettings().get_mongo_url
+
+    @classmethod
+    def get_mongo_client(cls, url: str | None = None) -> AsyncIOMotorClient:
+        """
+        Получение общего клиента mongodb для текущего event loop.
+            Клиент (пул соединений и потоки мониторинга) создаётся один раз на event loop и адрес подключения.
+
+        :param url: Ссылка для подключения к бд (по умолчанию из `settings.ini`).
+
+        :return: Client(motor).
+        """
+        client_key = cls.__get_mongo_client_key(url)
+        if client_key not in cls._MONGO_CLIENTS:
+            cls._MONGO_CLIENTS[client_key] = AsyncIOMotorClient(
+                client_key[1], **DataBaseSettings().mongo_client_options
+            )
+        return cls._MONGO_CLIENTS[client_key]
+
+    @classmethod
     def get_mongo_db_motor(
-            url: str = DataBaseSettings().get_mongo_url, db_name: str | None = "LA",
+            cls, url: str | None = None, db_name: str | None = "LA",
             collection_name: str | None = "Notifications"
     ) -> AsyncIOMotorDatabase | AsyncIOMotorCollection | AsyncIOMotorClient | ConfigException:
         """
         Получение `мотора` mongodb.
             :EXTRA INFO:
             Передача (db_name, collection_name) = None вернёт AsyncIOMotorClient.
+            Клиент и объекты бд/коллекций переиспользуются в рамках одного event loop.
         :param db_name: Название базы данных.
         :param collection_name: Название коллекции.
         :param url: Ссылка для подключения к бд.
@@ -43,11 +194,20 @@ class DataBasesSessionsManager:
         :return: Client(motor)/Database/Collection
         """
         if collection_name is None and db_name is None:
-            return AsyncIOMotorClient(url)
+            return cls.get_mongo_client(url)
         if db_name:
-            db: AsyncIOMotorDatabase = AsyncIOMotorClient(url).get_database(name=db_name)
-            if collection_name:
-                return db.get_collection(name=collection_name)
-            return db
+            handle_key = (cls.__get_mongo_client_key(url), db_name, collection_name)
+            if handle_key not in cls._MONGO_HANDLES:
+                db: AsyncIOMotorDatabase = cls.get_mongo_client(url).get_database(name=db_name)
+                cls._MONGO_HANDLES[handle_key] = db.get_collection(name=collection_name) if collection_name else db
+            return cls._MONGO_HANDLES[handle_key]
         else:
             raise ConfigException(f"Не передано название бд для поиска коллекции <{collection_name}>!")
+
+    @classmethod
+    def close_mongo(cls) -> None:
+        """Закрытие всех клиентов mongodb (пулов соединений и потоков мониторинга)."""
+        for client in cls._MONGO_CLIENTS.values():
+            client.close()
+        cls._MONGO_CLIENTS.clear()
+        cls._MONGO_HANDLES.clear()
@@ -1,6 +1,6 @@
 from typing import Optional
 
-from sqlalchemy import text, Date, Time
+from sqlalchemy import text, Date, Time, DateTime, Computed
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.ext.asyncio import AsyncAttrs
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
@@ -43,6 +43,9 @@ class Reminder(Base):
     create_data = mapped_column(Date, comment="Дата создания уведомления.")
     target_data = mapped_column(Date, comment="Дата исполнения уведомления.", nullable=False)
     target_time = mapped_column(Time, comment="Время исполнения уведомления.", nullable=False)
+    fire_at = mapped_column(
+        DateTime, Computed("target_data + target_time", persisted=True), comment="Дата и время исполнения уведомления."
+    )
     status: Mapped[bool] = mapped_column(comment="Статус выполнения.", default=False)
     mongo_uuid: Mapped[str] = mapped_column(comment="Ссылка на тело уведомления.", nullable=False)
     urgency_id: Mapped[int] = mapped_column(comment="ID уровня важности уведомления.", nullable=False, default=1)
@@ -68,3 +71,21 @@ class Category(Base):
     name: Mapped[str] = mapped_column(comment="Название категории.")
     description: Mapped[str] = mapped_column(comment="Подробное описание повторений.")
     create_date = mapped_column(Date, comment="Дата создания категории повторений.")
+
+
+class Urgency(Base):
+    __tablename__ = "urgency"
+
+    id: Mapped[int] = mapped_column(primary_key=True, comment="ID уровня уведомления.")
+    name: Mapped[str] = mapped_column(comment="Название уровня уведомления.")
+    create_date = mapped_column(Date, comment="Дата создания уровня уведомления.")
+
+
+class Repeat(Base):
+    __tablename__ = "repeat"
+
+    id: Mapped[int] = mapped_column(primary_key=True, comment="ID периодов повторений уведомлений.")
+    name: Mapped[str] = mapped_column(comment="Название периодов повторений.")
+    description: Mapped[str] = mapped_column(comment="Подробное описание повторений.")
+    count: Mapped[int] = mapped_column(comment="Период повторений.", nullable=True)
+    create_date = mapped_column(Date, comment="Дата создания периода повторений.")
@@ -0,0 +1,223 @@
+import asyncio as io
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Callable
+
+from bson import ObjectId
+from bson.errors import InvalidId
+from sqlalchemy import select
+
+from database.database import DataBasesSessionsManager
+from database.dto.dto import Reminder
+from database.repositiry.mongo_rep import NotificationsRepository
+from database.repositiry.postgres_rep import ReminderRepository
+from property.settings import DataBaseSettings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ScanReport:
+    """Итоги сверки postgres и mongodb."""
+    repair: bool = False
+    reminders: int = 0
+    bodies: int = 0
+    orphan_reminders: int = 0
+    orphan_bodies: int = 0
+    skipped_recent: int = 0
+    repaired_reminders: int = 0
+    repaired_bodies: int = 0
+    samples: list[str] = field(default_factory=list)
+    started: float = field(default_factory=time.perf_counter)
+    finished: float | None = None
+
+    MAX_SAMPLES = 20
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    def sample(self, msg: str) -> None:
+        if len(self.samples) < self.MAX_SAMPLES:
+            self.samples.append(msg)
+
+    def __str__(self) -> str:
+        report = (
+            f"Сверка{" (завершена)" if self.finished else ""}: {self.reminders} напоминаний, {self.bodies} тел "
+            f"за {round(self.elapsed, 3)} сек. Напоминаний без тела: {self.orphan_reminders}, "
+            f"тел без напоминания: {self.orphan_bodies} (новых пропущено {self.skipped_recent})."
+        )
+        if self.repair:
+            report += f" Удалено напоминаний: {self.repaired_reminders}, тел: {self.repaired_bodies}."
+        return "\n".join((report, *self.samples))
+
+
+class ConsistencyScanner:
+    """
+    Сверка напоминаний postgres и тел уведомлений mongodb слиянием двух потоков ID, отсортированных одинаково:
+        `reminder.mongo_uuid COLLATE "C"` (индекс `reminder_mongo_uuid_c_idx`) и `_id` в mongodb.
+        Память не зависит от размера бд: в памяти только текущие пачки чтения и пачки на удаление.
+        Тела моложе ``grace`` секунд не считаются потерянными: при создании уведомления тело вставляется
+        раньше напоминания.
+    """
+    BATCH_SIZE: int = 1000
+    REPAIR_BATCH_SIZE: int = 500
+    PROGRESS_EVERY: float = 5
+    RATE_CHECK_EVERY: int = 1000
+
+    def __init__(
+            self,
+            repair: bool = False,
+            grace: float | None = None,
+            rate: float | None = None,
+            batch_size: int | None = None,
+            progress: Callable[[ScanReport], None] | None = None,
+    ) -> None:
+        """
+        :param repair: Удалять потерянные записи.
+        :param grace: Возраст тела (секунды), до которого тело без напоминания пропускается.
+        :param rate: Ограничение скорости (записей в секунду, 0 - без ограничения).
+        :param batch_size: Размер пачки чтения.
+        :param progress: Обработчик промежуточных итогов (вызывается раз в ``PROGRESS_EVERY`` секунд).
+        """
+        settings = DataBaseSettings()
+        self.repair = repair
+        self.grace = settings.reconcile_grace if grace is None else grace
+        self.rate = settings.reconcile_rate if rate is None else rate
+        self.batch_size = batch_size or self.BATCH_SIZE
+        self.progress = progress
+        self.reminder_rep = ReminderRepository()
+        self.mongo_rep = NotificationsRepository()
+        self._orphan_reminders: list[uuid.UUID] = []
+        self._orphan_bodies: list[ObjectId] = []
+
+    async def scan(self) -> ScanReport:
+        """
+        Сверка. Ошибка чтения любой из бд прерывает сверку (исключение не подавляется),
+            чтобы недочитанный поток не был принят за отсутствие записей.
+
+        :return: Итоги сверки.
+        """
+        report = ScanReport(repair=self.repair)
+        grace_border = datetime.now(timezone.utc) - timedelta(seconds=self.grace)
+        self._orphan_reminders, self._orphan_bodies = [], []
+        reminders, bodies = self.__reminder_keys(), self.__body_keys()
+        progress_at, check_at = time.monotonic() + self.PROGRESS_EVERY, self.RATE_CHECK_EVERY
+        try:
+            reminder, body = await anext(reminders, None), await anext(bodies, None)
+            # mongo_uuid не уникален: на одно тело могут ссылаться несколько напоминаний, поэтому при совпадении
+            # сдвигается только поток напоминаний, а тело считается найденным (body_matched) до перехода к следующему.
+            body_matched = False
+            while reminder is not None or body is not None:
+                if body is None or (reminder is not None and reminder[0] < body):
+                    report.reminders += 1
+                    await self.__orphan_reminder(reminder, report)
+                    reminder = await anext(reminders, None)
+                elif reminder is None or body < reminder[0]:
+                    report.bodies += 1
+                    if not body_matched:
+                        await self.__orphan_body(body, grace_border, report)
+                    body, body_matched = await anext(bodies, None), False
+                else:
+                    report.reminders += 1
+                    body_matched = True
+                    reminder = await anext(reminders, None)
+
+                scanned = report.reminders + report.bodies
+                if scanned >= check_at:
+                    check_at = scanned + self.RATE_CHECK_EVERY
+                    await self.__throttle(scanned, report)
+                    if self.progress is not None and time.monotonic() >= progress_at:
+                        self.progress(report)
+                        progress_at = time.monotonic() + self.PROGRESS_EVERY
+        finally:
+            await reminders.aclose()
+            await bodies.aclose()
+
+        await self.__flush_reminders(report)
+        await self.__flush_bodies(report)
+        report.finished = time.perf_counter()
+        return report
+
+    async def run_periodic(self, interval: float) -> None:
+        """
+        Периодическая сверка (первая - через ``interval`` секунд после запуска).
+
+        :param interval: Период (секунды).
+
+        :return: None.
+        """
+        while True:
+            await io.sleep(interval)
+            try:
+                logger.info("Сверка postgres и mongodb: %s", await self.scan())
+            except Exception as e:
+                logger.exception("Сверка postgres и mongodb прервана: %r", e)
+
+    async def __reminder_keys(self) -> AsyncIterator[tuple[str, uuid.UUID]]:
+        stmt = select(Reminder.mongo_uuid, Reminder.uuid).order_by(Reminder.mongo_uuid.collate("C"))
+        async with DataBasesSessionsManager.get_postgres_engine().connect() as connection:
+            results = await connection.stream(stmt.execution_options(yield_per=self.batch_size))
+            async for partition in results.partitions(self.batch_size):
+                for mongo_uuid, reminder_uuid in partition:
+                    yield mongo_uuid, reminder_uuid
+
+    async def __body_keys(self) -> AsyncIterator[str]:
+        async for batch in self.mongo_rep.stream_by_filter(
+                fields={"_id": True}, batch_size=self.batch_size, sort=[("_id", 1)]
+        ):
+            for body in batch:
+                yield str(body["_id"])
+
+    async def __orphan_reminder(self, reminder: tuple[str, uuid.UUID], report: ScanReport) -> None:
+        report.orphan_reminders += 1
+        report.sample(f"Напоминание {reminder[1]} ссылается на отсутствующее тело {reminder[0]}.")
+        if self.repair:
+            self._orphan_reminders.append(reminder[1])
+            if len(self._orphan_reminders) >= self.REPAIR_BATCH_SIZE:
+                await self.__flush_reminders(report)
+
+    async def __orphan_body(self, body: str, grace_border: datetime, report: ScanReport) -> None:
+        try:
+            body_id = ObjectId(body)
+        except InvalidId:
+            return
+        if body_id.generation_time > grace_border:
+            report.skipped_recent += 1
+            return
+        report.orphan_bodies += 1
+        report.sample(f"Тело {body} не связано ни с одним напоминанием.")
+        if self.repair:
+            self._orphan_bodies.append(body_id)
+            if len(self._orphan_bodies) >= self.REPAIR_BATCH_SIZE:
+                await self.__flush_bodies(report)
+
+    async def __flush_reminders(self, report: ScanReport) -> None:
+        if not self._orphan_reminders:
+            return
+        deleted = await self.reminder_rep.delete_objects(self._orphan_reminders)
+        report.repaired_reminders += deleted or 0
+        self._orphan_reminders = []
+
+    async def __flush_bodies(self, report: ScanReport) -> None:
+        """Удаление тел без напоминаний. Тела, на которые успели сослаться новые напоминания, не удаляются."""
+        if not self._orphan_bodies:
+            return
+        referenced = await self.reminder_rep.do_session_execute(
+            select(Reminder.mongo_uuid).where(Reminder.mongo_uuid.in_([str(_id) for _id in self._orphan_bodies]))
+        )
+        if referenced is not None:
+            referenced = {ObjectId(row.mongo_uuid) for row in referenced}
+            orphans = [_id for _id in self._orphan_bodies if _id not in referenced]
+            if orphans:
+                deleted = await self.mongo_rep.delete_objects(orphans)
+                report.repaired_bodies += deleted.deleted_count
+        self._orphan_bodies = []
+
+    async def __throttle(self, scanned: int, report: ScanReport) -> None:
+        """Ограничение скорости: пауза, если сверка опережает ``rate`` записей в секунду."""
+        delay = scanned / self.rate - report.elapsed if self.rate else 0
+        await io.sleep(max(delay, 0))
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import TypeVar, Sequence
+from typing import TypeVar, Sequence, AsyncIterator
 
 from sqlalchemy import Executable, Row
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -24,6 +24,7 @@ class FullDBObjectNotification:
         return "12"
 
 class BaseRepository(ABC):
+    STREAM_BATCH_SIZE: int = 1000
     settings = Settings()
     session = DataBasesSessionsManager.get_postgres_session
 
@@ -47,7 +48,7 @@ class BaseRepository(ABC):
 
         :return: Последовательность результатов поиска.
         """
-        async with self.session(echo=self.settings.debug) as ses:  # type: AsyncSession
+        async with self.session() as ses:  # type: AsyncSession
             results = await ses.execute(stmt)
             if not results:
                 return []
@@ -61,8 +62,44 @@ class BaseRepository(ABC):
 
         :return: Последовательность моделей.
         """
-        async with self.session(echo=self.settings.debug) as ses:  # type: AsyncSession
+        async with self.session() as ses:  # type: AsyncSession
             results = await ses.execute(stmt)
             if not results:
                 return []
             return results.scalars().all()
+
+    async def stream_session_execute(
+            self, stmt: Executable, batch_size: int | None = None
+    ) -> AsyncIterator[Sequence[Row[CLS]]]:
+        """
+        Потоковое чтение результатов запроса пачками через серверный курсор.
+            Ошибки запроса передаются вызывающему коду, чтобы обрыв соединения не выглядел как конец результатов.
+
+        :param stmt: Выражение для исполнения.
+        :param batch_size: Размер пачки (по умолчанию ``STREAM_BATCH_SIZE``).
+
+        :return: Асинхронный генератор пачек строк.
+        """
+        batch_size = batch_size or self.STREAM_BATCH_SIZE
+        async with self.session(reraise=True) as ses:  # type: AsyncSession
+            results = await ses.stream(stmt.execution_options(yield_per=batch_size))
+            async for partition in results.partitions(batch_size):
+                yield partition
+
+    async def stream_solo_session_execute(
+            self, stmt: Executable, batch_size: int | None = None
+    ) -> AsyncIterator[Sequence[CLS]]:
+        """
+        Потоковое чтение моделей пачками через серверный курсор.
+            Ошибки запроса передаются вызывающему коду (см. ``stream_session_execute``).
+
+        :param stmt: Выражение для исполнения.
+        :param batch_size: Размер пачки (по умолчанию ``STREAM_BATCH_SIZE``).
+
+        :return: Асинхронный генератор пачек моделей.
+        """
+        batch_size = batch_size or self.STREAM_BATCH_SIZE
+        async with self.session(reraise=True) as ses:  # type: AsyncSession
+            results = await ses.stream_scalars(stmt.execution_options(yield_per=batch_size))
+            async for partition in results.partitions(batch_size):
+                yield partition
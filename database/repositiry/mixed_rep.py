@@ -1,19 +1,48 @@
+import asyncio as io
+import logging
 import uuid
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Iterable, Sequence
 
 from bson import ObjectId
+from pymongo.errors import PyMongoError
+from sqlalchemy import ColumnElement, Row, select
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import InstrumentedAttribute
 
+from database.dto.dto import Reminder
 from database.repositiry.base import BaseRepository, FullDBObjectNotification
 from database.repositiry.mongo_rep import NotificationsRepository
 from database.repositiry.postgres_rep import ReminderRepository
 
+logger = logging.getLogger(__name__)
+
+@dataclass
+class BulkDeleteResult:
+    """
+    Результат пакетного удаления уведомлений.
+        ``orphaned`` - напоминания, оставшиеся без тел после ошибки (их находит `reconcile`).
+    """
+    deleted: list[Row] = field(default_factory=list)
+    complete: bool = True
+    orphaned: int = 0
+
+    @property
+    def uuids(self) -> list[uuid.UUID]:
+        """ID удалённых напоминаний."""
+        return [row.uuid for row in self.deleted]
+
 
 class MixedRepository(BaseRepository):
+    JOIN_CHUNK_SIZE: int = 500
+    DELETE_CHUNK_SIZE: int = 1000
+    BODY_FIELDS: tuple[str, ...] = ("title", "description", "action", "url", "extra_args")
+
     def __init__(self):
         self.postgres_rep = ReminderRepository()
         self.mongo_rep = NotificationsRepository()
         self._full_notification = FullDBObjectNotification
-        self._res_full_notification: list[FullDBObjectNotification] = []
 
     async def get_by_id(self, id_: int | uuid.UUID | str):
         pass
@@ -21,35 +50,201 @@ class MixedRepository(BaseRepository):
     async def create_objects(self, new_object):
         pass
 
-    async def delete_objects(self, obj_to_delete: FullDBObjectNotification) -> None:
-        ses = await self.postgres_rep.delete_objects(delete_obj=[obj_to_delete.postgres_notify.uuid])
-        motor_client = self.mongo_rep
-        async with motor_client.motor.start_session():
-            del_result = await motor_client.delete_objects([obj_to_delete.mongo_notify.to_dict()["_id"]])
-        if del_result:
-            await ses.commit()
+    async def delete_objects(
+            self, obj_to_delete: FullDBObjectNotification | Iterable[FullDBObjectNotification]
+    ) -> BulkDeleteResult:
+        """
+        Удаление уведомлений (напоминаний и их тел).
+
+        :param obj_to_delete: Уведомление или уведомления.
 
-    async def get_by_filters(self, filters: dict[InstrumentedAttribute[str], str]) -> list[FullDBObjectNotification]:
+        :return: Результат удаления (см. ``delete_by_uuids``).
         """
+        if isinstance(obj_to_delete, FullDBObjectNotification):
+            obj_to_delete = (obj_to_delete,)
+        return await self.delete_by_uuids(obj.postgres_notify.uuid for obj in obj_to_delete)
 
-        :param filters:
-        :return:
+    async def delete_by_uuids(self, uuids: Iterable[uuid.UUID], chunk_size: int | None = None) -> BulkDeleteResult:
         """
-        postgres_notification = {
-            ObjectId(rem.mongo_uuid): rem
-            for rem in await self.postgres_rep.get_by_filter(filters)
-        }
+        Удаление напоминаний и их тел пачками: ``DELETE ... WHERE uuid = ANY(:uuids) RETURNING mongo_uuid``
+            и ``delete_many`` в mongodb на пачку (см. ``__delete_chunk``).
 
-        mongo_bodies = await self.mongo_rep.get_by_filter({
-            "_id": {"$in": list(postgres_notification.keys())}
-        })
+        :param uuids: ID напоминаний.
+        :param chunk_size: Размер пачки (по умолчанию ``DELETE_CHUNK_SIZE``).
 
-        for mongo_body in mongo_bodies:
-            self._res_full_notification.append(
-                self._full_notification(
-                    postgres_notify=postgres_notification[mongo_body.notify["_id"]],
-                    mongo_notify=mongo_body,
-                ),
+        :return: Результат удаления. При ошибке удаление останавливается, уже удалённые пачки не восстанавливаются.
+        """
+        uuids, chunk_size = list(uuids), chunk_size or self.DELETE_CHUNK_SIZE
+        result = BulkDeleteResult()
+        for start in range(0, len(uuids), chunk_size):
+            deleted = await self.__delete_chunk(
+                self.postgres_rep.uuids_condition(uuids[start:start + chunk_size]), result
             )
+            if deleted is None:
+                result.complete = False
+                break
+            result.deleted.extend(deleted)
+        return result
+
+    async def delete_all(self, chunk_size: int | None = None) -> BulkDeleteResult:
+        """
+        Удаление всех напоминаний и их тел пачками по ``chunk_size``.
+
+        :param chunk_size: Размер пачки (по умолчанию ``DELETE_CHUNK_SIZE``).
 
-        return self._res_full_notification
+        :return: Результат удаления.
+        """
+        chunk_size = chunk_size or self.DELETE_CHUNK_SIZE
+        result = BulkDeleteResult()
+        while True:
+            deleted = await self.__delete_chunk(
+                Reminder.uuid.in_(select(Reminder.uuid).limit(chunk_size).scalar_subquery()), result
+            )
+            if deleted is None:
+                result.complete = False
+                break
+            result.deleted.extend(deleted)
+            if len(deleted) < chunk_size:
+                break
+        return result
+
+    async def __delete_chunk(self, condition: ColumnElement[bool], result: BulkDeleteResult) -> Sequence[Row] | None:
+        """
+        Удаление пачки. Напоминания удаляются в незавершённой транзакции postgres, затем тела - в mongodb.
+            Если mongodb вернула ошибку, транзакция postgres откатывается и напоминания остаются. ``delete_many``
+            мог успеть удалить часть тел: они пересчитываются, и напоминания без тел учитываются в ``orphaned``.
+            Если ошибка возникла при commit после удаления тел, без тел остаются все напоминания пачки.
+
+        :param condition: Условие удаления напоминаний.
+        :param result: Результат удаления, в котором учитываются напоминания без тел.
+
+        :return: Строки (uuid, mongo_uuid) удалённых напоминаний или None при ошибке.
+        """
+        deleted = None
+        async with self.postgres_rep.session() as ses:  # type: AsyncSession
+            rows = await self.postgres_rep.delete_returning(ses, condition)
+            body_ids = [ObjectId(row.mongo_uuid) for row in rows]
+            if body_ids:
+                try:
+                    await self.mongo_rep.delete_objects(body_ids)
+                except PyMongoError as e:
+                    await ses.rollback()
+                    result.orphaned += await self.__count_deleted_bodies(body_ids)
+                    logger.error("Тела уведомлений не удалены, удаление напоминаний отменено: %r", e)
+                    return None
+            try:
+                await ses.commit()
+            except SQLAlchemyError as e:
+                await ses.rollback()
+                result.orphaned += len(body_ids)
+                logger.error("Напоминания не удалены, их тела уже удалены из mongodb: %r", e)
+                return None
+            deleted = rows
+        return deleted
+
+    async def __count_deleted_bodies(self, body_ids: list[ObjectId]) -> int:
+        """
+        Количество тел, удалённых прерванным ``delete_many``.
+
+        :param body_ids: ID тел пачки.
+
+        :return: Количество удалённых тел (все тела пачки, если mongodb недоступна).
+        """
+        try:
+            return len(body_ids) - await self.mongo_rep.motor.count_documents({"_id": {"$in": body_ids}})
+        except PyMongoError:
+            return len(body_ids)
+
+    async def search_by_name(
+            self, phrase: str, limit: int = 50, prefix: bool | None = None
+    ) -> list[FullDBObjectNotification]:
+        """
+        Поиск уведомлений по имени напоминания с сохранением ранжирования postgres.
+
+        :param phrase: Фраза для поиска.
+        :param limit: Максимальное количество результатов.
+        :param prefix: Искать по началу имени.
+
+        :return: Найденные уведомления (напоминание и тело).
+        """
+        reminders = await self.postgres_rep.search_by_name(phrase, limit=limit, prefix=prefix)
+        if not reminders:
+            return []
+        mongo_bodies = {
+            mongo_body.notify["_id"]: mongo_body
+            for mongo_body in await self.mongo_rep.get_by_ids([ObjectId(rem.mongo_uuid) for rem in reminders])
+        }
+        return [
+            self._full_notification(postgres_notify=rem, mongo_notify=mongo_bodies[ObjectId(rem.mongo_uuid)])
+            for rem in reminders if ObjectId(rem.mongo_uuid) in mongo_bodies
+        ]
+
+    async def get_by_filters(
+            self, filters: dict[InstrumentedAttribute[str], str],
+            chunk_size: int | None = None, fields: Sequence[str] | None = BODY_FIELDS,
+    ) -> list[FullDBObjectNotification]:
+        """
+        Поиск уведомлений по фильтрам напоминаний (см. ``stream_by_filters``).
+
+        :param filters: Фильтры (столбец - подстрока).
+        :param chunk_size: Размер пачки.
+        :param fields: Поля тела уведомления (None - все поля).
+
+        :return: Найденные уведомления (напоминание и тело).
+        """
+        full_notifications = []
+        async for chunk in self.stream_by_filters(filters, chunk_size=chunk_size, fields=fields):
+            full_notifications.extend(chunk)
+        return full_notifications
+
+    async def stream_by_filters(
+            self, filters: dict[InstrumentedAttribute[str], str],
+            chunk_size: int | None = None, fields: Sequence[str] | None = BODY_FIELDS,
+    ) -> AsyncIterator[list[FullDBObjectNotification]]:
+        """
+        Потоковое соединение напоминаний postgres с телами уведомлений mongodb пачками.
+            Запрос тел очередной пачки в mongodb выполняется параллельно с чтением следующей пачки из postgres.
+
+        :param filters: Фильтры (столбец - подстрока).
+        :param chunk_size: Размер пачки (по умолчанию ``JOIN_CHUNK_SIZE``).
+        :param fields: Поля тела уведомления (None - все поля).
+
+        :return: Асинхронный генератор пачек уведомлений (напоминание и тело).
+        """
+        projection = {field: True for field in fields} if fields is not None else None
+        pending_chunk: io.Task | None = None
+        try:
+            async for reminders in self.postgres_rep.stream_by_filter(
+                    filters, batch_size=chunk_size or self.JOIN_CHUNK_SIZE
+            ):
+                next_chunk = io.create_task(self.__join_chunk(reminders, projection))
+                if pending_chunk is not None:
+                    yield await pending_chunk
+                pending_chunk = next_chunk
+            if pending_chunk is not None:
+                yield await pending_chunk
+                pending_chunk = None
+        finally:
+            if pending_chunk is not None:
+                pending_chunk.cancel()
+
+    async def __join_chunk(
+            self, reminders: Sequence[Reminder], projection: dict[str, bool] | None
+    ) -> list[FullDBObjectNotification]:
+        """
+        Соединение пачки напоминаний с телами уведомлений.
+
+        :param reminders: Напоминания.
+        :param projection: Проекция тела уведомления.
+
+        :return: Уведомления, для которых найдено тело.
+        """
+        postgres_notification = {ObjectId(rem.mongo_uuid): rem for rem in reminders}
+        mongo_bodies = await self.mongo_rep.get_by_ids(list(postgres_notification.keys()), fields=projection)
+        return [
+            self._full_notification(
+                postgres_notify=postgres_notification[mongo_body.notify["_id"]],
+                mongo_notify=mongo_body,
+            )
+            for mongo_body in mongo_bodies
+        ]
@@ -0,0 +1,247 @@
+import asyncio as io
+import logging
+import os.path
+import time
+from collections import OrderedDict
+from typing import Iterable
+
+from bson import ObjectId, encode, json_util
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo.errors import OperationFailure, PyMongoError
+
+from database.database import DataBasesSessionsManager
+from property.patterns import Singleton
+from property.settings import DataBaseSettings, SettingsSnapshot
+
+logger = logging.getLogger(__name__)
+
+type MongoDocument = dict
+
+
+class NotificationBodyCache(Singleton):
+    """
+    LRU кэш тел уведомлений (документов `LA.Notifications`) в памяти процесса.
+        Размер ограничен количеством документов (``max_items``) и суммарным размером в BSON (``max_bytes``),
+        при переполнении вытесняются давно не использованные документы.
+        При работающем change stream записи не устаревают (``ttl`` = None),
+        для standalone mongodb записи живут ``ttl`` секунд.
+    """
+
+    def __init__(self) -> None:
+        if hasattr(self, "_bodies"):
+            return
+        settings = DataBaseSettings()
+        self.ttl: float | None = settings.cache_ttl_mongo
+        self.max_items: int = settings.cache_size_mongo
+        self.max_bytes: int = settings.cache_max_bytes_mongo
+        self.version: int = 0
+        self.size_bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self._bodies: OrderedDict[ObjectId, tuple[float, int, MongoDocument]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._bodies)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Счётчики кэша: попадания, промахи, вытеснения, количество документов и их размер в байтах."""
+        return {
+            "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+            "items": len(self._bodies), "bytes": self.size_bytes,
+        }
+
+    def get_many(self, ids: Iterable[ObjectId]) -> tuple[dict[ObjectId, MongoDocument], list[ObjectId]]:
+        """
+        Поиск документов в кэше. Найденные документы становятся последними в очереди на вытеснение.
+
+        :param ids: ID документов.
+
+        :return: Найденные документы и ID отсутствующих в кэше.
+        """
+        found, missing = {}, []
+        expire_time = time.monotonic() - self.ttl if self.ttl is not None else None
+        for _id in ids:
+            cached = self._bodies.get(_id)
+            if cached is not None and expire_time is not None and cached[0] < expire_time:
+                self.__pop(_id)
+                cached = None
+            if cached is None:
+                missing.append(_id)
+            else:
+                self._bodies.move_to_end(_id)
+                found[_id] = cached[2]
+        self.hits += len(found)
+        self.misses += len(missing)
+        return found, missing
+
+    def put_many(self, documents: Iterable[MongoDocument], version: int | None = None) -> None:
+        """
+        Добавление прочитанных из бд документов.
+
+        :param documents: Документы с полем ``_id``.
+        :param version: Версия кэша на момент начала чтения. Если с тех пор пришли изменения, документы не кэшируются.
+
+        :return: None.
+        """
+        if version is not None and version != self.version:
+            return
+        now = time.monotonic()
+        for document in documents:
+            size = len(encode(document))
+            if size > self.max_bytes:
+                continue
+            self.__pop(document["_id"])
+            self._bodies[document["_id"]] = (now, size, document)
+            self.size_bytes += size
+        while self._bodies and (len(self._bodies) > self.max_items or self.size_bytes > self.max_bytes):
+            _, (_, size, _) = self._bodies.popitem(last=False)
+            self.size_bytes -= size
+            self.evictions += 1
+
+    def invalidate(self, _id: ObjectId) -> None:
+        """Удаление документа из кэша."""
+        self.version += 1
+        self.__pop(_id)
+
+    def invalidate_many(self, ids: Iterable[ObjectId]) -> None:
+        """Удаление документов из кэша."""
+        self.version += 1
+        for _id in ids:
+            self.__pop(_id)
+
+    def clear(self) -> None:
+        """Очистка кэша."""
+        self.version += 1
+        self._bodies.clear()
+        self.size_bytes = 0
+
+    def __pop(self, _id: ObjectId) -> None:
+        cached = self._bodies.pop(_id, None)
+        if cached is not None:
+            self.size_bytes -= cached[1]
+
+
+class NotificationsChangeWatcher:
+    """
+    Поддержание согласованности ``NotificationBodyCache`` через change stream коллекции `LA.Notifications`.
+        Resume token сохраняется в файл, чтобы после перезапуска не пропустить изменения.
+        Change streams доступны только в replica set/sharded кластере, для standalone используется TTL кэша.
+    """
+    RESUME_TOKEN_FILE: str = ".notifications_resume_token"
+    SAVE_TOKEN_EVERY: float = 5
+    MAX_AWAIT_TIME_MS: int = 5000
+    RECONNECT_DELAY: tuple[float, float] = (1, 60)
+
+    def __init__(self, collection: AsyncIOMotorCollection | None = None, cache: NotificationBodyCache | None = None):
+        """
+        :param collection: Коллекция для отслеживания (по умолчанию `LA.Notifications`).
+        :param cache: Кэш тел уведомлений.
+        """
+        self._own_collection = collection is None
+        self.collection = collection or DataBasesSessionsManager.get_mongo_db_motor()
+        self.cache = cache or NotificationBodyCache()
+        self.token_path = os.path.join(DataBaseSettings().app_dir, self.RESUME_TOKEN_FILE)
+        self._ttl = self.cache.ttl
+        self._stopped = False
+        self._reconnect = False
+
+    async def is_standalone(self) -> bool:
+        """Проверка, что mongodb запущена без replica set (change streams недоступны)."""
+        hello = await self.collection.database.client.admin.command("hello")
+        return "setName" not in hello and hello.get("msg") != "isdbgrid"
+
+    async def run(self) -> None:
+        """Отслеживание изменений с переподключением. Для standalone mongodb сразу завершается."""
+        delay = self.RECONNECT_DELAY[0]
+        while not self._stopped:
+            if self._reconnect:
+                self._reconnect = False
+                self.collection = DataBasesSessionsManager.get_mongo_db_motor()
+                self.cache.clear()
+            try:
+                if await self.is_standalone():
+                    logger.info("Mongodb запущена без replica set: кэш тел уведомлений работает по TTL.")
+                    return
+                await self.__watch()
+                delay = self.RECONNECT_DELAY[0]
+            except PyMongoError as e:
+                self.cache.ttl = self._ttl
+                if self._own_collection:
+                    self.collection = DataBasesSessionsManager.get_mongo_db_motor()
+                logger.warning(
+                    "Change stream %s прерван: %r. Повтор через %s сек.", self.collection.full_name, e, delay
+                )
+                await io.sleep(delay)
+                delay = min(delay * 2, self.RECONNECT_DELAY[1])
+
+    def stop(self) -> None:
+        """Остановка отслеживания после следующего события."""
+        self._stopped = True
+
+    def on_settings_changed(self, old: SettingsSnapshot | None, new: SettingsSnapshot) -> None:
+        """Переподключение к новому серверу mongodb (подписчик ``Settings.subscribe``) после следующего события."""
+        if self._own_collection and new.changed(old, "DB", *DataBasesSessionsManager.MONGO_OPTIONS):
+            self._reconnect = True
+
+    async def __watch(self) -> None:
+        resume_token = self.__load_token()
+        try:
+            stream = self.collection.watch(
+                resume_after=resume_token, full_document="updateLookup", max_await_time_ms=self.MAX_AWAIT_TIME_MS,
+            )
+            async with stream:
+                await self.__consume(stream, resume_from_token=resume_token is not None)
+        except OperationFailure:
+            if resume_token is None:
+                raise
+            self.__save_token(None)
+            self.cache.clear()
+            stream = self.collection.watch(full_document="updateLookup", max_await_time_ms=self.MAX_AWAIT_TIME_MS)
+            async with stream:
+                await self.__consume(stream, resume_from_token=False)
+
+    async def __consume(self, stream, resume_from_token: bool) -> None:
+        if not resume_from_token:
+            self.cache.clear()
+        self.cache.ttl = None
+        saved_at = time.monotonic()
+        while not self._stopped and not self._reconnect and stream.alive:
+            change = await stream.try_next()
+            if change is not None:
+                self.__apply(change)
+            if time.monotonic() - saved_at > self.SAVE_TOKEN_EVERY and stream.resume_token:
+                self.__save_token(stream.resume_token)
+                saved_at = time.monotonic()
+        if stream.resume_token:
+            self.__save_token(stream.resume_token)
+
+    def __apply(self, change: dict) -> None:
+        """
+        Применение события change stream к кэшу.
+
+        :param change: Событие change stream.
+
+        :return: None.
+        """
+        operation = change["operationType"]
+        if operation in ("drop", "rename", "dropDatabase", "invalidate"):
+            self.cache.clear()
+            return
+        _id = change.get("documentKey", {}).get("_id")
+        if _id is None:
+            return
+        self.cache.invalidate(_id)
+        if operation in ("insert", "replace", "update") and change.get("fullDocument"):
+            self.cache.put_many((change["fullDocument"],))
+
+    def __load_token(self) -> dict | None:
+        if not os.path.exists(self.token_path):
+            return None
+        with open(self.token_path) as token_file:
+            return json_util.loads(token_file.read()) or None
+
+    def __save_token(self, token: dict | None) -> None:
+        with open(self.token_path, "w") as token_file:
+            token_file.write(json_util.dumps(token))
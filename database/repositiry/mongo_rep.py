@@ -1,14 +1,18 @@
+from typing import AsyncIterator
+
 from bson import ObjectId
-from pymongo.results import DeleteResult
+from pymongo.results import DeleteResult, InsertManyResult
 
 from database.database import DataBasesSessionsManager
 from database.dto.dto_mongo import GetNotification, CreateNotification, MongoTypes
 from database.repositiry.base import BaseRepository
+from database.repositiry.mongo_cache import NotificationBodyCache
 
 
 class NotificationsRepository(BaseRepository):
     def __init__(self) -> None:
         self.motor = DataBasesSessionsManager.get_mongo_db_motor()
+        self.cache = NotificationBodyCache()
 
     async def get_by_filter(self, filters: GetNotification | dict[str, MongoTypes] | None = None,
                             fields: dict[str, bool] = None, length: None | int = None) -> list[GetNotification]:
@@ -24,11 +28,77 @@ class NotificationsRepository(BaseRepository):
             await self.motor.find(filters, fields).to_list(length=length)
         ]
 
-    async def get_by_id(self, _id: ObjectId) -> dict:
-        return await self.motor.find_one({"_id": _id})
+    async def stream_by_filter(
+            self, filters: GetNotification | dict[str, MongoTypes] | None = None,
+            fields: dict[str, bool] | None = None, batch_size: int | None = None,
+            sort: list[tuple[str, int]] | None = None,
+    ) -> AsyncIterator[list[GetNotification]]:
+        """
+        Потоковое чтение тел уведомлений пачками (размер пачки курсора совпадает с ``batch_size``).
+
+        :param filters: Фильтр поиска.
+        :param fields: Проекция.
+        :param batch_size: Размер пачки (по умолчанию ``STREAM_BATCH_SIZE``).
+        :param sort: Сортировка [(поле, направление)].
+
+        :return: Асинхронный генератор пачек тел уведомлений.
+        """
+        batch_size = batch_size or self.STREAM_BATCH_SIZE
+        if filters is None:
+            filters = {}
+        if isinstance(filters, GetNotification):
+            filters = filters.to_dict()
+        cursor = self.motor.find(filters, fields).batch_size(batch_size)
+        if sort:
+            cursor = cursor.sort(sort)
+
+        batch = []
+        async for mongo_obj in cursor:
+            batch.append(GetNotification(mongo_obj))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+    async def get_by_ids(self, ids: list[ObjectId], fields: dict[str, bool] | None = None) -> list[GetNotification]:
+        """
+        Получение тел уведомлений по ID через кэш. Из бд запрашиваются только отсутствующие в кэше документы.
+
+        :param ids: ID документов.
+        :param fields: Проекция для отсутствующих в кэше документов (такие документы не кэшируются,
+            из кэша возвращаются полные документы).
+
+        :return: Найденные тела уведомлений в порядке ``ids``.
+        """
+        found, missing = self.cache.get_many(ids)
+        if missing:
+            cache_version = self.cache.version
+            documents = await self.motor.find({"_id": {"$in": missing}}, fields).to_list(length=None)
+            if fields is None:
+                self.cache.put_many(documents, version=cache_version)
+            found |= {document["_id"]: document for document in documents}
+        return [GetNotification(found[_id]) for _id in ids if _id in found]
+
+    async def get_by_id(self, _id: ObjectId) -> GetNotification | None:
+        """
+        Получение тела уведомления по ID через кэш.
+
+        :param _id: ID документа.
+
+        :return: Тело уведомления или None.
+        """
+        found = await self.get_by_ids([_id])
+        return found[0] if found else None
 
-    async def create_objects(self, new_objects: list[CreateNotification]):
-        return await self.motor.insert_many([new_object.__dict__() for new_object in new_objects])
+    async def create_objects(self, new_objects: list[CreateNotification], ordered: bool = True) -> InsertManyResult:
+        documents = [new_object.__dict__() for new_object in new_objects]
+        insert_result = await self.motor.insert_many(documents, ordered=ordered)
+        self.cache.put_many(documents)
+        return insert_result
 
     async def delete_objects(self, del_object_list: list[ObjectId]) -> DeleteResult:
-        return await self.motor.delete_many({"_id": {"$in": del_object_list}})
+        try:
+            return await self.motor.delete_many({"_id": {"$in": del_object_list}})
+        finally:
+            self.cache.invalidate_many(del_object_list)
@@ -1,21 +1,25 @@
 import uuid
 from abc import ABC, abstractmethod
-from typing import Sequence, Type, Any
+from datetime import date, datetime
+from typing import Sequence, Type, Any, AsyncIterator
 
-from sqlalchemy import select
+from sqlalchemy import select, update, insert, delete, Row, func, or_, any_, bindparam, Select, ColumnElement
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import InstrumentedAttribute
 from typing_extensions import TypeVar
 
-from database.dto.dto import Reminder, Base
+from database.dto.dto import Reminder, Base, Repeat
 from database.repositiry.base import BaseRepository
 from exceptions.app import ValidationException
+from property.helpers import escape_like
 
 BASE_CLS = TypeVar("BASE_CLS", bound=Type[Base])
 CLS = TypeVar("CLS", bound=Type[Base] | InstrumentedAttribute[str])
 
 
 class BasePostgresRepository(BaseRepository, ABC):
+    PREFIX_SEARCH_LEN: int = 3
 
     @abstractmethod
     async def get_by_filter_by(self, stmt: CLS, **stmt_filter_by) -> Sequence[CLS]:
@@ -24,6 +28,35 @@ class BasePostgresRepository(BaseRepository, ABC):
             stmt = stmt.filter_by(**stmt_filter_by)
         return await self.do_solo_session_execute(stmt)
 
+    async def search(
+            self, column: InstrumentedAttribute[str], phrase: str, limit: int = 50, prefix: bool | None = None
+    ) -> Sequence[Base]:
+        """
+        Поиск строк таблицы по текстовому столбцу (индексы из `docker-init-db/postgres/7.search-indexes.sql`).
+            Подстрока/похожесть - GIN (pg_trgm), результаты отсортированы по убыванию ``similarity``.
+            Префикс - B-tree по ``lower(column)``, результаты отсортированы по алфавиту.
+
+        :param column: Столбец для поиска.
+        :param phrase: Фраза для поиска.
+        :param limit: Максимальное количество результатов.
+        :param prefix: Искать по началу строки. По умолчанию - для фраз короче ``PREFIX_SEARCH_LEN`` символов,
+            по которым триграммный индекс неэффективен.
+
+        :return: Модели таблицы столбца ``column``.
+        """
+        phrase = phrase.strip()
+        if prefix is None:
+            prefix = len(phrase) < self.PREFIX_SEARCH_LEN
+        pattern = escape_like(phrase)
+        stmt = select(column.class_)
+        if prefix:
+            stmt = stmt.where(func.lower(column).like(f"{pattern.lower()}%", escape="\\")).order_by(func.lower(column))
+        else:
+            stmt = stmt.where(
+                or_(column.ilike(f"%{pattern}%", escape="\\"), column.op("%")(phrase))
+            ).order_by(func.similarity(column, phrase).desc(), column)
+        return await self.do_solo_session_execute(stmt.limit(limit))
+
 
 class ReminderRepository(BasePostgresRepository):
 
@@ -50,25 +83,175 @@ class ReminderRepository(BasePostgresRepository):
             stmt = select(stmt)
         return await self.do_solo_session_execute(stmt=stmt)
 
+    async def search_by_name(self, phrase: str, limit: int = 50, prefix: bool | None = None) -> Sequence[Reminder]:
+        """
+        Поиск напоминаний по имени.
+
+        :param phrase: Фраза для поиска.
+        :param limit: Максимальное количество результатов.
+        :param prefix: Искать по началу имени (см. ``search``).
+
+        :return: Напоминания, наиболее похожие на ``phrase``.
+        """
+        return await self.search(Reminder.name, phrase, limit=limit, prefix=prefix)
+
+    @staticmethod
+    def __due_between_stmt(start: datetime | None = None, end: datetime | None = None) -> Select:
+        stmt = select(
+            Reminder.uuid, Reminder.mongo_uuid, Reminder.fire_at, Repeat.name, Repeat.count,
+        ).outerjoin(Repeat, Reminder.repeat_id == Repeat.id).where(Reminder.status.is_(False))
+        if start is not None:
+            stmt = stmt.where(Reminder.fire_at >= start)
+        if end is not None:
+            stmt = stmt.where(Reminder.fire_at < end)
+        return stmt.order_by(Reminder.fire_at)
+
+    async def get_due_between(
+            self, start: datetime | None = None, end: datetime | None = None, limit: int | None = None
+    ) -> Sequence[Row]:
+        """
+        Невыполненные напоминания со временем исполнения в ``[start, end)``.
+            Запрос использует частичный индекс ``reminder_fire_at_pending_idx``.
+
+        :param start: Начало интервала (None - без ограничения).
+        :param end: Конец интервала (None - без ограничения).
+        :param limit: Максимальное количество строк.
+
+        :return: Строки (uuid, mongo_uuid, fire_at, repeat.name, repeat.count), отсортированные по ``fire_at``.
+        """
+        return await self.do_session_execute(self.__due_between_stmt(start, end).limit(limit))
+
+    async def stream_due_between(
+            self, start: datetime | None = None, end: datetime | None = None, batch_size: int | None = None
+    ) -> AsyncIterator[Sequence[Row]]:
+        """
+        Потоковый вариант ``get_due_between``.
+
+        :param start: Начало интервала (None - без ограничения).
+        :param end: Конец интервала (None - без ограничения).
+        :param batch_size: Размер пачки.
+
+        :return: Асинхронный генератор пачек строк (uuid, mongo_uuid, fire_at, repeat.name, repeat.count).
+        """
+        async for partition in self.stream_session_execute(self.__due_between_stmt(start, end), batch_size):
+            yield partition
+
+    async def get_overdue(self, now: datetime | None = None, limit: int | None = None) -> Sequence[Row]:
+        """
+        Невыполненные напоминания, время исполнения которых уже прошло.
+
+        :param now: Текущее время (по умолчанию ``datetime.now()``).
+        :param limit: Максимальное количество строк.
+
+        :return: Строки (uuid, mongo_uuid, fire_at, repeat.name, repeat.count), отсортированные по ``fire_at``.
+        """
+        return await self.get_due_between(end=now or datetime.now(), limit=limit)
+
+    async def set_status(self, reminder_uuids: list[uuid.UUID], status: bool = True) -> None:
+        """
+        Изменение статуса выполнения напоминаний одним запросом.
+
+        :param reminder_uuids: ID напоминаний.
+        :param status: Новый статус.
+
+        :return: None.
+        """
+        async with self.session() as ses:  # type: AsyncSession
+            await ses.execute(update(Reminder).where(Reminder.uuid.in_(reminder_uuids)).values(status=status))
+            await ses.commit()
+
+    async def set_target_data(self, target_data: dict[uuid.UUID, date]) -> None:
+        """
+        Перенос дат исполнения напоминаний (bulk update по первичному ключу).
+
+        :param target_data: ID напоминания - новая дата исполнения.
+
+        :return: None.
+        """
+        async with self.session() as ses:  # type: AsyncSession
+            await ses.execute(
+                update(Reminder),
+                [{"uuid": reminder_uuid, "target_data": data} for reminder_uuid, data in target_data.items()],
+            )
+            await ses.commit()
+
+    async def stream_by_filter(
+            self,
+            stmt_filter: dict[InstrumentedAttribute[str], str] = None,
+            batch_size: int | None = None,
+            order_by: InstrumentedAttribute[Any] | None = None,
+    ) -> AsyncIterator[Sequence[Reminder]]:
+        """
+        Потоковый вариант ``get_by_filter``.
+
+        :param stmt_filter: Фильтры (столбец - подстрока).
+        :param batch_size: Размер пачки.
+        :param order_by: Столбец сортировки.
+
+        :return: Асинхронный генератор пачек напоминаний.
+        """
+        stmt = select(Reminder)
+        if stmt_filter:
+            stmt = stmt.filter(*(key.ilike(f"%{value}%") for key, value in stmt_filter.items()))
+        if order_by is not None:
+            stmt = stmt.order_by(order_by)
+        async for partition in self.stream_solo_session_execute(stmt, batch_size):
+            yield partition
+
     async def create_objects(self, new_object: list[Reminder]):
         async with self.session() as ses:  # type: AsyncSession
             ses.add_all(new_object)
             await ses.commit()
 
-    async def delete_objects(self, delete_obj: list[Reminder.uuid], return_ses: bool = False) -> bool | AsyncSession:
+    async def insert_many(self, rows: list[dict[str, Any]]) -> int | None:
+        """
+        Многострочная вставка напоминаний одним выражением (без создания ORM объектов).
+
+        :param rows: Значения столбцов напоминаний (у всех строк одинаковый набор ключей).
+
+        :return: Количество вставленных строк или None при ошибке.
+        """
         async with self.session() as ses:  # type: AsyncSession
-            if all((isinstance(rem, uuid.UUID) for rem in delete_obj)):
-                stmt = select(Reminder).where(Reminder.uuid.in_(delete_obj))
-                results = await self.do_solo_session_execute(stmt)
-            else:
-                raise ValidationException("Передан неверный аргумент `delete_obj`!")
-
-            if results:
-                for res in results:
-                    await ses.delete(res)
-                if not return_ses:
-                    await ses.commit()
-                else:
-                    return ses
-
-            return True if results else False
+            await ses.execute(insert(Reminder), rows)
+            await ses.commit()
+            return len(rows)
+
+    @staticmethod
+    def uuids_condition(uuids: Sequence[uuid.UUID]) -> ColumnElement[bool]:
+        """
+        Условие ``uuid = ANY(:uuids)``: один параметр-массив вместо списка IN, план запроса не зависит от размера.
+
+        :param uuids: ID напоминаний.
+
+        :return: Условие для WHERE.
+        """
+        return Reminder.uuid == any_(bindparam("uuids", list(uuids), type_=ARRAY(Reminder.uuid.type)))
+
+    @staticmethod
+    async def delete_returning(ses: AsyncSession, condition: ColumnElement[bool]) -> Sequence[Row]:
+        """
+        Удаление напоминаний одним выражением ``DELETE ... RETURNING`` в открытой сессии (без commit).
+
+        :param ses: Сессия.
+        :param condition: Условие удаления.
+
+        :return: Строки (uuid, mongo_uuid) удалённых напоминаний.
+        """
+        stmt = delete(Reminder).where(condition).returning(Reminder.uuid, Reminder.mongo_uuid)
+        results = await ses.execute(stmt.execution_options(synchronize_session=False))
+        return results.all()
+
+    async def delete_objects(self, delete_obj: list[uuid.UUID]) -> int | None:
+        """
+        Удаление напоминаний по ID (только postgres, тела уведомлений см. ``MixedRepository.delete_by_uuids``).
+
+        :param delete_obj: ID напоминаний.
+
+        :return: Количество удалённых напоминаний или None при ошибке.
+        """
+        if not all(isinstance(rem, uuid.UUID) for rem in delete_obj):
+            raise ValidationException("Передан неверный аргумент `delete_obj`!")
+        async with self.session() as ses:  # type: AsyncSession
+            deleted = await self.delete_returning(ses, self.uuids_condition(delete_obj))
+            await ses.commit()
+            return len(deleted)
@@ -0,0 +1,110 @@
+import asyncio as io
+import logging
+import time
+from typing import Iterable, Sequence, Type
+
+from database.dto.dto import Base, Category, Repeat, Urgency
+from database.repositiry.postgres_rep import ReminderRepository
+from property.patterns import Singleton
+from property.settings import DataBaseSettings
+
+logger = logging.getLogger(__name__)
+
+type ReferenceTable = Type[Category] | Type[Urgency] | Type[Repeat]
+
+
+class ReferenceDataCache(Singleton):
+    """
+    Кэш справочников postgres (`category`, `urgency`, `repeat`) в памяти процесса.
+        Таблица загружается целиком при первом обращении и обновляется по истечении ``ttl`` секунд
+        или после ``invalidate``. Если обновить таблицу не удалось, отдаются прежние строки.
+    """
+    TABLES: tuple[ReferenceTable, ...] = (Category, Urgency, Repeat)
+
+    def __init__(self) -> None:
+        if hasattr(self, "_tables"):
+            return
+        self.ttl: float = DataBaseSettings().cache_ttl_reference
+        self.hits: int = 0
+        self.misses: int = 0
+        self._tables: dict[ReferenceTable, tuple[float, tuple[Base, ...]]] = {}
+        self._locks: dict[ReferenceTable, io.Lock] = {table: io.Lock() for table in self.TABLES}
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Счётчики обращений к кэшу: попадания, промахи и количество загруженных таблиц."""
+        return {"hits": self.hits, "misses": self.misses, "tables": len(self._tables)}
+
+    def is_fresh(self, table: ReferenceTable) -> bool:
+        """Таблица загружена и не устарела."""
+        cached = self._tables.get(table)
+        return cached is not None and time.monotonic() - cached[0] < self.ttl
+
+    async def get(self, table: ReferenceTable) -> tuple[Base, ...]:
+        """
+        Строки справочника.
+
+        :param table: Модель справочника из ``TABLES``.
+
+        :return: Все строки таблицы.
+        """
+        if self.is_fresh(table):
+            self.hits += 1
+            return self._tables[table][1]
+        self.misses += 1
+        async with self._locks[table]:
+            if not self.is_fresh(table):
+                await self.__load(table)
+        if table not in self._tables:
+            raise ConnectionError(f"Не удалось загрузить справочник {table.__tablename__} из postgres!")
+        return self._tables[table][1]
+
+    async def categories(self) -> tuple[Category, ...]:
+        return await self.get(Category)
+
+    async def urgencies(self) -> tuple[Urgency, ...]:
+        return await self.get(Urgency)
+
+    async def repeats(self) -> tuple[Repeat, ...]:
+        return await self.get(Repeat)
+
+    async def get_by_name(self, table: ReferenceTable, name: str) -> Base | None:
+        """
+        Поиск строки справочника по имени.
+
+        :param table: Модель справочника.
+        :param name: Значение столбца `name`.
+
+        :return: Строка справочника или None.
+        """
+        return next((row for row in await self.get(table) if row.name == name), None)
+
+    async def warm_up(self, tables: Iterable[ReferenceTable] | None = None) -> None:
+        """
+        Загрузка справочников параллельно (при старте приложения).
+
+        :param tables: Справочники (по умолчанию все ``TABLES``).
+
+        :return: None.
+        """
+        await io.gather(*(self.get(table) for table in tables or self.TABLES), return_exceptions=True)
+
+    def invalidate(self, tables: Iterable[ReferenceTable] | None = None) -> None:
+        """
+        Сброс справочников: следующее обращение загрузит их заново.
+
+        :param tables: Справочники (по умолчанию все).
+
+        :return: None.
+        """
+        for table in tables or self.TABLES:
+            cached = self._tables.get(table)
+            if cached is not None:
+                self._tables[table] = (float("-inf"), cached[1])
+
+    async def __load(self, table: ReferenceTable) -> None:
+        rows: Sequence[Base] | None = await ReminderRepository().get_by_filter_by(stmt=table)
+        if rows is None:
+            logger.warning("Не удалось обновить справочник %s, используются прежние данные.", table.__tablename__)
+            return
+        self._tables[table] = (time.monotonic(), tuple(rows))
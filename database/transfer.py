@@ -0,0 +1,311 @@
+import asyncio as io
+import csv
+import json
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, time as dt_time
+from typing import Any, Iterator, TextIO
+
+from pymongo.errors import BulkWriteError
+
+from database.dto.dto import Category, Reminder, Repeat, Urgency
+from database.dto.dto_mongo import CreateNotification, GetNotification, SetNotificationDTO
+from database.repositiry.base import FullDBObjectNotification
+from database.repositiry.mixed_rep import MixedRepository
+from database.repositiry.mongo_rep import NotificationsRepository
+from database.repositiry.postgres_rep import ReminderRepository
+from database.repositiry.reference_cache import ReferenceDataCache, ReferenceTable
+from exceptions.app import ValidationException
+from property.constants import TRANSFER_FORMATS
+
+type TransferRecord = dict[str, Any]
+type ImportRow = tuple[dict[str, Any], CreateNotification]
+
+
+@dataclass
+class TransferStats:
+    """Итоги импорта/экспорта."""
+    operation: str
+    total: int = 0
+    done: int = 0
+    rejected: int = 0
+    errors: list[str] = field(default_factory=list)
+    started: float = field(default_factory=time.perf_counter)
+    finished: float | None = None
+
+    MAX_ERRORS = 20
+
+    @property
+    def elapsed(self) -> float:
+        return (self.finished or time.perf_counter()) - self.started
+
+    @property
+    def rate(self) -> float:
+        """Записей в секунду."""
+        return self.done / self.elapsed if self.elapsed else 0.0
+
+    def reject(self, count: int, msg: str) -> None:
+        self.rejected += count
+        if len(self.errors) < self.MAX_ERRORS:
+            self.errors.append(msg)
+
+    def __str__(self) -> str:
+        report = (
+            f"{self.operation}: {self.done} из {self.total} записей за {round(self.elapsed, 3)} сек "
+            f"({round(self.rate)} зап/сек), отклонено {self.rejected}."
+        )
+        return "\n".join((report, *self.errors))
+
+
+class ReminderTransfer:
+    """
+    Потоковый импорт/экспорт напоминаний вместе с телами уведомлений.
+        Запись - напоминание postgres со справочниками по имени (переносимо между бд) и тело уведомления mongodb.
+        JSONL: {"name", "target_data", "target_time", "status", "urgency", "repeat", "category", "create_data",
+        "body": {"title", "description", "action", ...}}. CSV: те же поля напоминания, поля тела ``BODY_CSV_FIELDS``,
+        `action` через "|", остальные поля тела - JSON в столбце `extra`.
+    """
+    FORMATS: tuple[str, ...] = TRANSFER_FORMATS
+    REMINDER_FIELDS: tuple[str, ...] = (
+        "name", "target_data", "target_time", "status", "urgency", "repeat", "category", "create_data",
+    )
+    BODY_CSV_FIELDS: tuple[str, ...] = ("title", "description", "action")
+    CSV_EXTRA_FIELD: str = "extra"
+    ACTION_SEPARATOR: str = "|"
+    REFERENCES: dict[str, tuple[str, ReferenceTable]] = {
+        "urgency": ("urgency_id", Urgency),
+        "repeat": ("repeat_id", Repeat),
+        "category": ("category_id", Category),
+    }
+    BATCH_SIZE: int = 1000
+    CONCURRENCY: int = 4
+
+    def __init__(self, batch_size: int | None = None, concurrency: int | None = None) -> None:
+        """
+        :param batch_size: Количество записей в одной вставке/пачке чтения.
+        :param concurrency: Количество одновременно записываемых пачек при импорте.
+        """
+        self.batch_size = batch_size or self.BATCH_SIZE
+        self.concurrency = concurrency or self.CONCURRENCY
+        self.reminder_rep = ReminderRepository()
+        self.mongo_rep = NotificationsRepository()
+        self._ids_by_name: dict[ReferenceTable, dict[str, int]] = {}
+        self._names_by_id: dict[ReferenceTable, dict[int, str]] = {}
+
+    @classmethod
+    def detect_format(cls, path: str, fmt: str | None = None) -> str:
+        """
+        Формат файла: явно заданный или по расширению (по умолчанию jsonl).
+
+        :param path: Путь к файлу ("-" - stdin/stdout).
+        :param fmt: Явно заданный формат.
+
+        :return: Формат из ``FORMATS``.
+        """
+        fmt = fmt or ("csv" if path.lower().endswith(".csv") else "jsonl")
+        if fmt not in cls.FORMATS:
+            raise ValidationException(f"Неизвестный формат <{fmt}>! Доступные форматы [{", ".join(cls.FORMATS)}]")
+        return fmt
+
+    async def export_file(self, path: str, fmt: str | None = None) -> TransferStats:
+        """
+        Экспорт всех напоминаний с телами уведомлений.
+
+        :param path: Путь к файлу ("-" - stdout).
+        :param fmt: Формат (см. ``detect_format``).
+
+        :return: Итоги экспорта.
+        """
+        fmt = self.detect_format(path, fmt)
+        await self.__load_references()
+        stats = TransferStats(operation="Экспорт")
+        with self.__open(path, "w") as output:
+            writer = self.__csv_writer(output) if fmt == "csv" else None
+            async for chunk in MixedRepository().stream_by_filters({}, chunk_size=self.batch_size, fields=None):
+                for full_notification in chunk:
+                    record = self.__to_record(full_notification)
+                    if writer is not None:
+                        writer.writerow(self.__to_csv_row(record))
+                    else:
+                        output.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+                stats.total += len(chunk)
+                stats.done += len(chunk)
+        stats.finished = time.perf_counter()
+        return stats
+
+    async def import_file(self, path: str, fmt: str | None = None) -> TransferStats:
+        """
+        Импорт напоминаний с телами уведомлений пачками по ``batch_size``.
+            Тела вставляются в mongodb без упорядочивания (ошибка одного документа не прерывает пачку),
+            напоминания - многострочной вставкой в postgres. Если пачку не удалось вставить в postgres,
+            её тела удаляются из mongodb.
+
+        :param path: Путь к файлу ("-" - stdin).
+        :param fmt: Формат (см. ``detect_format``).
+
+        :return: Итоги импорта.
+        """
+        fmt = self.detect_format(path, fmt)
+        await self.__load_references()
+        stats = TransferStats(operation="Импорт")
+        slots = io.Semaphore(self.concurrency)
+        with self.__open(path, "r") as source:
+            async with io.TaskGroup() as group:
+                batch: list[ImportRow] = []
+                for line_no, record in self.__read(source, fmt):
+                    stats.total += 1
+                    try:
+                        batch.append(self.__from_record(record))
+                    except (ValidationException, ValueError, TypeError, KeyError) as e:
+                        stats.reject(1, f"Запись {line_no}: {e}")
+                    if len(batch) >= self.batch_size:
+                        await slots.acquire()
+                        group.create_task(self.__import_batch(batch, stats)).add_done_callback(
+                            lambda _: slots.release()
+                        )
+                        batch = []
+                if batch:
+                    group.create_task(self.__import_batch(batch, stats))
+        stats.finished = time.perf_counter()
+        return stats
+
+    async def __import_batch(self, batch: list[ImportRow], stats: TransferStats) -> None:
+        notifications = [notification for _, notification in batch]
+        failed_indexes = set()
+        try:
+            await self.mongo_rep.create_objects(notifications, ordered=False)
+        except BulkWriteError as e:
+            failed_indexes = {error["index"] for error in e.details.get("writeErrors", ())}
+            stats.reject(len(failed_indexes), f"Mongodb: {e.details.get("writeErrors", [{}])[0].get("errmsg")}")
+
+        rows, inserted_ids = [], []
+        for index, (row, notification) in enumerate(batch):
+            if index in failed_indexes:
+                continue
+            inserted_ids.append(notification.notify["_id"])
+            rows.append(row | {"mongo_uuid": str(notification.notify["_id"])})
+        if not rows:
+            return
+        if await self.reminder_rep.insert_many(rows) is None:
+            await self.mongo_rep.delete_objects(inserted_ids)
+            stats.reject(len(rows), f"Postgres: пачка из {len(rows)} напоминаний не вставлена.")
+            return
+        stats.done += len(rows)
+
+    async def __load_references(self) -> None:
+        cache = ReferenceDataCache()
+        for _, table in self.REFERENCES.values():
+            rows = await cache.get(table)
+            self._ids_by_name[table] = {row.name: row.id for row in rows}
+            self._names_by_id[table] = {row.id: row.name for row in rows}
+
+    def __from_record(self, record: TransferRecord) -> ImportRow:
+        """
+        Проверка записи и преобразование в строку postgres и тело уведомления.
+
+        :param record: Запись файла.
+
+        :return: Значения столбцов напоминания (без `mongo_uuid`) и тело уведомления.
+        """
+        if not isinstance(record, dict):
+            raise ValidationException("Некорректная запись!")
+        if not record.get("name"):
+            raise ValidationException("Не указано имя напоминания `name`!")
+        notification = CreateNotification(SetNotificationDTO(**record["body"]))
+        row = {
+            "name": record["name"],
+            "target_data": date.fromisoformat(record["target_data"]),
+            "target_time": dt_time.fromisoformat(record["target_time"]),
+            "status": self.__to_bool(record.get("status")),
+            "create_data": date.fromisoformat(record["create_data"]) if record.get("create_data") else date.today(),
+        }
+        for key, (column, table) in self.REFERENCES.items():
+            name = record.get(key)
+            if not name:
+                default = Reminder.__table__.c[column].default
+                row[column] = default.arg if default is not None else None
+            elif name in self._ids_by_name[table]:
+                row[column] = self._ids_by_name[table][name]
+            else:
+                raise ValidationException(f"Значение <{name}> отсутствует в справочнике {table.__tablename__}!")
+        return row, notification
+
+    def __to_record(self, full_notification: FullDBObjectNotification) -> TransferRecord:
+        reminder: Reminder = full_notification.postgres_notify
+        mongo_notify: GetNotification = full_notification.mongo_notify
+        body = {key: value for key, value in mongo_notify if key not in ("_id", mongo_notify.EXTRA_ARGS)}
+        body |= mongo_notify.notify.get(mongo_notify.EXTRA_ARGS) or {}
+        record = {
+            "name": reminder.name,
+            "target_data": reminder.target_data.isoformat(),
+            "target_time": reminder.target_time.isoformat(),
+            "status": reminder.status,
+            "create_data": reminder.create_data.isoformat() if reminder.create_data else None,
+        }
+        for key, (column, table) in self.REFERENCES.items():
+            record[key] = self._names_by_id[table].get(getattr(reminder, column))
+        return record | {"body": body}
+
+    def __to_csv_row(self, record: TransferRecord) -> dict[str, Any]:
+        body = dict(record["body"])
+        row = {key: record[key] for key in self.REMINDER_FIELDS}
+        row |= {key: body.pop(key, "") for key in self.BODY_CSV_FIELDS}
+        row["action"] = self.ACTION_SEPARATOR.join(row["action"] or ())
+        row[self.CSV_EXTRA_FIELD] = json.dumps(body, ensure_ascii=False, default=str) if body else ""
+        return row
+
+    def __from_csv_row(self, row: dict[str, str]) -> TransferRecord:
+        record: TransferRecord = {key: row.get(key) or None for key in self.REMINDER_FIELDS}
+        body = {key: row[key] for key in self.BODY_CSV_FIELDS if row.get(key)}
+        if "action" in body:
+            body["action"] = body["action"].split(self.ACTION_SEPARATOR)
+        if row.get(self.CSV_EXTRA_FIELD):
+            body |= json.loads(row[self.CSV_EXTRA_FIELD])
+        return record | {"body": body}
+
+    def __csv_writer(self, output: TextIO) -> csv.DictWriter:
+        writer = csv.DictWriter(output, fieldnames=(*self.REMINDER_FIELDS, *self.BODY_CSV_FIELDS, self.CSV_EXTRA_FIELD))
+        writer.writeheader()
+        return writer
+
+    def __read(self, source: TextIO, fmt: str) -> Iterator[tuple[int, TransferRecord]]:
+        """
+        Ленивое чтение записей файла.
+
+        :param source: Открытый файл.
+        :param fmt: Формат файла.
+
+        :return: Генератор (номер строки, запись). Для нечитаемых строк запись - None.
+        """
+        if fmt == "csv":
+            reader = csv.DictReader(source)
+            for row in reader:
+                try:
+                    yield reader.line_num, self.__from_csv_row(row)
+                except ValueError:
+                    yield reader.line_num, None
+            return
+        for line_no, line in enumerate(source, 1):
+            if not line.strip():
+                continue
+            try:
+                yield line_no, json.loads(line)
+            except json.JSONDecodeError:
+                yield line_no, None
+
+    @staticmethod
+    def __to_bool(value: Any) -> bool:
+        if isinstance(value, str):
+            return value.strip().lower() in ("1", "true", "t", "yes", "y")
+        return bool(value)
+
+    @staticmethod
+    @contextmanager
+    def __open(path: str, mode: str) -> Iterator[TextIO]:
+        if path == "-":
+            yield sys.stdin if mode == "r" else sys.stdout
+            return
+        with open(path, mode, encoding="utf-8", newline="" if path.lower().endswith(".csv") else None) as file:
+            yield file
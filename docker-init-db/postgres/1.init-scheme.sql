@@ -57,6 +57,7 @@ CREATE TABLE public.reminder (
 	create_data DATE DEFAULT CURRENT_DATE,
     target_data DATE NOT NULL,
     target_time TIME NOT NULL,
+    fire_at TIMESTAMP GENERATED ALWAYS AS (target_data + target_time) STORED,
 	status boolean DEFAULT FALSE NOT NULL,
 	mongo_uuid VARCHAR(24) NOT NULL UNIQUE,
 	urgency_id INT NOT NULL,
@@ -68,12 +69,15 @@ CREATE TABLE public.reminder (
 );
 COMMENT ON TABLE public.reminder IS 'Напоминания пользователя.';
 
+CREATE INDEX reminder_fire_at_pending_idx ON public.reminder (fire_at) WHERE status = false;
+
 -- reminder`s column comments
 COMMENT ON COLUMN public.reminder."uuid" IS 'ID уведомления.';
 COMMENT ON COLUMN public.reminder.name IS 'Имя уведомления.';
 COMMENT ON COLUMN public.reminder.create_data IS 'Дата создания уведомления.';
 COMMENT ON COLUMN public.reminder.target_data IS 'Дата исполнения уведомления.';
 COMMENT ON COLUMN public.reminder.target_time IS 'Время исполнения уведомления.';
+COMMENT ON COLUMN public.reminder.fire_at IS 'Дата и время исполнения уведомления (target_data + target_time).';
 COMMENT ON COLUMN public.reminder.status IS 'Статус выполнения.';
 COMMENT ON COLUMN public.reminder.mongo_uuid IS 'Ссылка на тело уведомления.';
 COMMENT ON COLUMN public.reminder.urgency_id IS 'ID уровня важности уведомления.';
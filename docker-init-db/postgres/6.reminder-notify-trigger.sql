@@ -0,0 +1,32 @@
+--- Reminder changes notifications (LISTEN reminder_changes)
+CREATE OR REPLACE FUNCTION public.reminder_notify() RETURNS TRIGGER AS $$
+DECLARE
+	rec public.reminder%ROWTYPE;
+	repeat_rec RECORD;
+BEGIN
+	IF TG_OP = 'DELETE' THEN
+		rec := OLD;
+	ELSE
+		rec := NEW;
+	END IF;
+
+	SELECT "name", "count" INTO repeat_rec FROM public.repeat WHERE id = rec.repeat_id;
+
+	PERFORM pg_notify('reminder_changes', json_build_object(
+		'uuid', rec."uuid",
+		'op', TG_OP,
+		'fire_at', rec.fire_at,
+		'status', rec.status,
+		'mongo_uuid', rec.mongo_uuid,
+		'repeat_name', repeat_rec."name",
+		'repeat_count', repeat_rec."count"
+	)::text);
+	RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+COMMENT ON FUNCTION public.reminder_notify() IS 'Отправка изменений напоминаний в канал reminder_changes.';
+
+DROP TRIGGER IF EXISTS reminder_notify_trigger ON public.reminder;
+CREATE TRIGGER reminder_notify_trigger
+	AFTER INSERT OR UPDATE OR DELETE ON public.reminder
+	FOR EACH ROW EXECUTE FUNCTION public.reminder_notify();
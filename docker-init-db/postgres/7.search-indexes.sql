@@ -0,0 +1,12 @@
+--- Substring/similarity search indexes (pg_trgm)
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
+CREATE INDEX IF NOT EXISTS reminder_name_trgm_idx ON public.reminder USING gin ("name" gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS reminder_name_prefix_idx ON public.reminder (lower("name") text_pattern_ops);
+COMMENT ON INDEX public.reminder_name_trgm_idx IS 'Поиск напоминаний по подстроке и похожести имени.';
+COMMENT ON INDEX public.reminder_name_prefix_idx IS 'Поиск напоминаний по началу имени.';
+
+CREATE INDEX IF NOT EXISTS category_name_trgm_idx ON public.category USING gin ("name" gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS category_name_prefix_idx ON public.category (lower("name") text_pattern_ops);
+COMMENT ON INDEX public.category_name_trgm_idx IS 'Поиск категорий по подстроке и похожести имени.';
+COMMENT ON INDEX public.category_name_prefix_idx IS 'Поиск категорий по началу имени.';
@@ -0,0 +1,3 @@
+--- Byte-order index on mongo_uuid for the Postgres/Mongo consistency scan (same order as ObjectId)
+CREATE INDEX IF NOT EXISTS reminder_mongo_uuid_c_idx ON public.reminder (mongo_uuid COLLATE "C", "uuid");
+COMMENT ON INDEX public.reminder_mongo_uuid_c_idx IS 'Сверка напоминаний с телами уведомлений mongodb в порядке ObjectId.';
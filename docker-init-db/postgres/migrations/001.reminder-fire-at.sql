@@ -0,0 +1,6 @@
+--- Migration for databases created before `fire_at` was added to 1.init-scheme.sql
+ALTER TABLE public.reminder
+	ADD COLUMN IF NOT EXISTS fire_at TIMESTAMP GENERATED ALWAYS AS (target_data + target_time) STORED;
+COMMENT ON COLUMN public.reminder.fire_at IS 'Дата и время исполнения уведомления (target_data + target_time).';
+
+CREATE INDEX IF NOT EXISTS reminder_fire_at_pending_idx ON public.reminder (fire_at) WHERE status = false;
@@ -21,3 +21,10 @@ class AbortZenityInsert(ZenityBaseException):
     def __init__(self, msg: str = "") -> None:
         self.msg = msg
         super().__init__(self.NAME_EXCEPTION + self.msg)
+
+
+class UnsupportedDialogArgs(ZenityBaseException):
+    """Аргументы окна не поддерживаются процессом окон tkinter: окно показывается через zenity."""
+
+    def __init__(self, msg: str) -> None:
+        super().__init__(msg)
@@ -1,32 +1,60 @@
 # !/usr/bin/python3
-import asyncio as io
+from __future__ import annotations
+
 import time
-from datetime import datetime
-from functools import partial
-from queue import Queue
-from typing import Callable, Coroutine
-
-from bson import ObjectId
-from pynput.keyboard import Key, GlobalHotKeys, KeyCode
-from sqlalchemy import Sequence
-from sqlalchemy.orm import InstrumentedAttribute
-from typing_extensions import TypeVar
-
-from database.dto.dto import Category, Reminder
-from database.dto.dto_mongo import BaseNotification, CreateNotification, SetNotificationDTO
-from database.repositiry.base import FullDBObjectNotification
-from database.repositiry.mixed_rep import MixedRepository
-from database.repositiry.mongo_rep import NotificationsRepository
-from database.repositiry.postgres_rep import ReminderRepository
-from exceptions.zenity import AbortZenityInsert
-from notification.base import ShellExec, ProcessResult
-from notification.notify import Notify
-from notification.zenity import Zenity, FormsValues, FormsValue
-from property.constants import INFO, ZENITY_FORMS_FIELDS, ZENITY, EXCEPTIONS, NotifyUrgency
-from property.helpers import cust_join, get_hotkey, get_key_dict_by_value
-from property.settings import Settings
-
-Q = TypeVar("Q", bound=bool)
+
+IMPORT_STARTED = time.perf_counter()
+
+import argparse  # noqa: E402
+import asyncio as io  # noqa: E402
+import logging  # noqa: E402
+from datetime import datetime  # noqa: E402
+from functools import cached_property  # noqa: E402
+from typing import TYPE_CHECKING, Callable, Coroutine  # noqa: E402
+
+from pynput.keyboard import Key, KeyCode  # noqa: E402
+
+from exceptions.zenity import AbortZenityInsert  # noqa: E402
+from notification.base import ShellExec, ProcessResult  # noqa: E402
+from property.constants import (  # noqa: E402
+    AppMenuAction, INFO, ZENITY_FORMS_FIELDS, ZENITY, EXCEPTIONS, NOTIFICATIONS, TRANSFER_FORMATS, NotifyUrgency,
+)
+from property.helpers import cust_join, get_hotkey, get_key_dict_by_value  # noqa: E402
+from property.settings import DataBaseSettings, Settings, SettingsSnapshot  # noqa: E402
+from property.startup import StartupProfile, lazy_import, load_module  # noqa: E402
+from scheduler.dispatch import NotificationDispatcher  # noqa: E402
+from scheduler.hotkeys import HotkeyPipeline, PrewarmHotKeys  # noqa: E402
+from scheduler.session import WorkSessionTracker  # noqa: E402
+from scheduler.scheduler import ReminderScheduler, ScheduledReminder  # noqa: E402
+
+if TYPE_CHECKING:
+    from sqlalchemy import Sequence
+    from sqlalchemy.orm import InstrumentedAttribute
+
+# Тяжёлые подсистемы (SQLAlchemy, motor, asyncpg, dbus-next), а также окна, логирование и наблюдение за настройками
+# загружаются при первом обращении - после запуска прослушивания горячих клавиш.
+bson = lazy_import("bson")
+databases = lazy_import("database.database")
+dto = lazy_import("database.dto.dto")
+dto_mongo = lazy_import("database.dto.dto_mongo")
+rep_base = lazy_import("database.repositiry.base")
+mixed_rep = lazy_import("database.repositiry.mixed_rep")
+mongo_cache = lazy_import("database.repositiry.mongo_cache")
+mongo_rep = lazy_import("database.repositiry.mongo_rep")
+postgres_rep = lazy_import("database.repositiry.postgres_rep")
+reference_cache = lazy_import("database.repositiry.reference_cache")
+db_reconcile = lazy_import("database.reconcile")
+db_transfer = lazy_import("database.transfer")
+dbus_notify = lazy_import("notification.dbus_notify")
+changes_listener = lazy_import("scheduler.listener")
+zenity = lazy_import("notification.zenity")
+tk_dialog = lazy_import("notification.tk_dialog")
+app_logging = lazy_import("property.logger")
+settings_watcher = lazy_import("property.settings_watcher")
+STARTUP_MODULES = (databases, mixed_rep, mongo_cache, reference_cache, changes_listener, dbus_notify)
+IMPORTS_DONE = time.perf_counter()
+
+logger = logging.getLogger(__name__)
 
 
 class App:
@@ -35,6 +63,12 @@ class App:
         "show": "show",
         "remind": "remind",
     }
+    PREFETCH_HORIZON: float = 24 * 60 * 60
+    SCHEDULER_HORIZON: float = 7 * 24 * 60 * 60
+    SEARCH_LIMIT: int = 50
+    SUMMARY_LINES: int = 10
+    HOTKEY_DEBOUNCE: float = 0.5
+    PREWARM_INTERVAL: float = 60
 
     def __init__(self) -> None:
         self.settings: Settings = Settings()
@@ -45,64 +79,189 @@ class App:
             "show": self.show_notifies,
             "show_filter": ...,
             "delete": self.delete_notify,
+            "del_all": self.delete_all_notify,
         }
+        self.scheduler = ReminderScheduler(
+            dispatch=self.dispatch_reminders, loader=self.load_reminders, horizon=self.SCHEDULER_HORIZON
+        )
+        self.dispatcher = NotificationDispatcher(
+            handlers={
+                self.ACTIONS["open"]: self.__open_urls,
+                self.ACTIONS["show"]: self.__show_notices,
+                self.ACTIONS["remind"]: self.__remind_notices,
+            },
+            window=self.settings.dispatch_window,
+            rate=self.settings.dispatch_rate,
+            burst=self.settings.dispatch_burst,
+        )
+        self.hotkeys = HotkeyPipeline(
+            handler=self.open_menu, prewarm=self.prewarm_menu,
+            debounce=self.HOTKEY_DEBOUNCE, prewarm_interval=self.PREWARM_INTERVAL,
+        )
+        self.session_tracker = WorkSessionTracker(
+            on_break=self.__remind_break,
+            break_time=lambda: self.settings.break_remind,
+            idle=lambda: self.settings.break_idle,
+        )
+        self.__prefetch_task: io.Task | None = None
 
-    @staticmethod
-    async def __create_new_notify(new_notify_value: FullDBObjectNotification) -> None:
+    @cached_property
+    def scheduler_listener(self) -> changes_listener.ReminderChangesListener:
+        """Слушатель изменений таблицы `reminder` (asyncpg загружается при первом обращении)."""
+        return changes_listener.ReminderChangesListener(self.scheduler)
+
+    @cached_property
+    def reference_cache(self) -> reference_cache.ReferenceDataCache:
+        """Кэш справочников postgres (SQLAlchemy загружается при первом обращении)."""
+        return reference_cache.ReferenceDataCache()
+
+    def on_settings_changed(self, old: SettingsSnapshot | None, new: SettingsSnapshot) -> None:
+        """
+        Применение новых настроек без перезапуска (подписчик ``Settings.subscribe``).
+
+        :param old: Предыдущий снимок настроек.
+        :param new: Новый снимок настроек.
+
+        :return: None.
+        """
+        if new.changed(old, "APP", "DISPATCH_WINDOW", "DISPATCH_RATE", "DISPATCH_BURST"):
+            self.dispatcher.configure(
+                window=self.settings.dispatch_window,
+                rate=self.settings.dispatch_rate,
+                burst=self.settings.dispatch_burst,
+            )
+        if new.changed(old, "DB", "DB_CACHE_TTL_REFERENCE"):
+            self.reference_cache.ttl = DataBaseSettings().cache_ttl_reference
+        if new.changed(old, "DB", *databases.DataBasesSessionsManager.POSTGRES_OPTIONS):
+            self.reference_cache.invalidate()
+
+    async def __create_new_notify(self, new_notify_value: rep_base.FullDBObjectNotification) -> None:
         new_notify = []
-        create_new_obj = Notify(
+        create_new_obj = dbus_notify.DBusNotify(
             title="Создано новое уведомление!",
             text=f"Уведомление: `{new_notify_value.postgres_notify.name}` было успешно создано.",
             urgency=NotifyUrgency.LOW,
         )
 
         try:
-            new_notify = await NotificationsRepository().create_objects([new_notify_value.mongo_notify])
+            new_notify = await mongo_rep.NotificationsRepository().create_objects([new_notify_value.mongo_notify])
             new_notify_value.postgres_notify.mongo_uuid = str(new_notify.inserted_ids[0])
-            new_notify_post = io.create_task(ReminderRepository().create_objects([new_notify_value.postgres_notify]))
+            new_notify_post = io.create_task(
+                postgres_rep.ReminderRepository().create_objects([new_notify_value.postgres_notify])
+            )
             new_notify_post.add_done_callback(
                 lambda _: io.create_task(create_new_obj.do_notify(communicate=False, ignore_error=True))
             )
-        except BaseNotification:  # type: ignore
+            new_notify_post.add_done_callback(lambda _: self.__schedule_reminder(new_notify_value.postgres_notify))
+        except dto_mongo.BaseNotification:  # type: ignore
             if new_notify:
-                deleted_object = io.create_task(NotificationsRepository().delete_objects(new_notify))
-                _print = partial(print, f"Удаление {new_notify} прервано!")
-                deleted_object.add_done_callback(_print)
+                deleted_object = io.create_task(
+                    mongo_rep.NotificationsRepository().delete_objects(new_notify.inserted_ids)
+                )
+                deleted_object.add_done_callback(lambda _: logger.warning("Удаление %s прервано!", new_notify))
+
+    def __schedule_reminder(self, reminder: dto.Reminder) -> None:
+        """Добавление созданного напоминания в расписание."""
+        if reminder.uuid is None:
+            return
+        self.scheduler.add(ScheduledReminder.from_row(
+            reminder.uuid, reminder.mongo_uuid, datetime.combine(reminder.target_data, reminder.target_time)
+        ))
+
+    async def load_reminders(self, until: datetime | None = None) -> list[ScheduledReminder | None]:
+        """
+        Загрузка просроченных и предстоящих (до ``until``) напоминаний для планировщика и прогрев кэша тел ближайших.
+
+        :param until: Горизонт загрузки расписания.
+
+        :return: Записи расписания. Если чтение прервалось, ошибка передаётся дальше и расписание не заменяется.
+        """
+        now = datetime.now()
+        overdue_reminders = await postgres_rep.ReminderRepository().get_overdue(now=now)
+        if overdue_reminders is None:
+            raise ConnectionError("Не удалось загрузить напоминания из postgres!")
+        reminders = [ScheduledReminder.from_row(*row) for row in overdue_reminders]
+        async for partition in postgres_rep.ReminderRepository().stream_due_between(start=now, end=until):
+            reminders.extend(ScheduledReminder.from_row(*row) for row in partition)
+
+        prefetch_deadline = time.time() + self.PREFETCH_HORIZON
+        prefetch_ids = [
+            bson.ObjectId(reminder.mongo_uuid) for reminder in reminders
+            if reminder is not None and reminder.fire_ts < prefetch_deadline
+        ]
+        if prefetch_ids:
+            self.__prefetch_task = io.create_task(self.__prefetch_bodies(prefetch_ids))
+        return reminders
 
     @staticmethod
-    async def _create_menu_queue(str_keys: str) -> tuple[Queue[Q], GlobalHotKeys]:
-        """Создание очереди на открытие меню.
+    async def __prefetch_bodies(mongo_uuids: list[bson.ObjectId], chunk_size: int = 1000) -> None:
+        """Загрузка тел уведомлений в кэш пачками по ``chunk_size``."""
+        notifications_repository = mongo_rep.NotificationsRepository()
+        for chunk_start in range(0, len(mongo_uuids), chunk_size):
+            await notifications_repository.get_by_ids(mongo_uuids[chunk_start:chunk_start + chunk_size])
+
+    async def dispatch_reminders(self, reminders: list[ScheduledReminder]) -> None:
+        """
+        Исполнение сработавших напоминаний: получение тел уведомлений и запуск их действий.
+
+        :param reminders: Сработавшие записи расписания.
+
+        :return: None.
+        """
+        mongo_bodies = await mongo_rep.NotificationsRepository().get_by_ids(
+            [bson.ObjectId(reminder.mongo_uuid) for reminder in reminders]
+        )
+        await self.do_notify_tasks([
+            mongo_body.notify.get(dto_mongo.BaseNotification.EXTRA_ARGS, {}) | mongo_body.notify
+            for mongo_body in mongo_bodies
+        ])
+        await self.__complete_reminders(reminders)
+
+    async def __complete_reminders(self, reminders: list[ScheduledReminder]) -> None:
+        """
+        Отметка выполнения сработавших напоминаний.
+            Повторяющиеся напоминания переносятся на следующий период, ``on_start`` не изменяются.
+
+        :param reminders: Сработавшие записи расписания.
+
+        :return: None.
+        """
+        done_reminders, repeated_reminders = [], {}
+        for reminder in reminders:
+            if reminder.on_start:
+                continue
+            next_fire_at = reminder.next_fire_at()
+            if next_fire_at is None:
+                done_reminders.append(reminder.uuid)
+            else:
+                repeated_reminders[reminder.uuid] = next_fire_at.date()
+                self.scheduler.add(reminder.reschedule(next_fire_at))
+
+        reminder_repository = postgres_rep.ReminderRepository()
+        if done_reminders:
+            await reminder_repository.set_status(done_reminders)
+        if repeated_reminders:
+            await reminder_repository.set_target_data(repeated_reminders)
+
+    def _create_hotkey_listener(self, str_keys: str) -> PrewarmHotKeys:
+        """Создание слушателя горячих клавиш открытия меню.
 
         :param str_keys: Строка с сочетанием горячих клавиш в читаемом формате для `pynput`.
 
-        :return: Очередь с флагами на открытие меню приложения.
+        :return: Запущенный слушатель: нажатия передаются в ``self.hotkeys``.
         """
-        queue: Queue[Q] = io.Queue()
-        current_loop = io.get_running_loop()
         cancel_hot_key = (Key.ctrl, Key.alt, KeyCode.from_char("l"), Key.esc,)
-        str_cancel_hot_key = get_hotkey(cancel_hot_key)
-
-        def throw_flag_queue(str_hotkey: str, flag: bool = True, ):
-            print(f"Была нажата комбинация [{str_hotkey}]!")
-            if flag is False:
-                print(f"Прослушивание {str_keys} остановлено!")
-            current_loop.call_soon_threadsafe(queue.put_nowait, flag)
-
-        hot_kay_listener = GlobalHotKeys({
-            str_keys: partial(throw_flag_queue, str_keys, True),
-            f"{str_cancel_hot_key}": partial(throw_flag_queue, f"{str_cancel_hot_key}", False),
-        })
+        hot_kay_listener = self.hotkeys.listener(str_keys, get_hotkey(cancel_hot_key))
         hot_kay_listener.start()
-        print(f"Начал слушать [{str_keys}]")
 
-        return queue, hot_kay_listener
+        return hot_kay_listener
 
     @staticmethod
     async def get_data_in_loop(
-            zenity_forms: Zenity,
-            get_field: FormsValues,
+            zenity_forms: zenity.Zenity,
+            get_field: zenity.FormsValues,
             forms_text: str = ""
-    ) -> dict[FormsValue, str] | None:
+    ) -> dict[zenity.FormsValue, str] | None:
         """Запрос формы с полями для ввода данных от пользователя `Zenity`.
 
         :param zenity_forms: Объект `Zenity` с указанными параметрами окна.
@@ -115,17 +274,19 @@ class App:
         """
 
         new_entry_values = {entry: "" for entry in get_field}
+        forms_window = {"title": zenity_forms.title, "width": zenity_forms.width, "height": zenity_forms.height}
         get_new_data_flag = True
         while get_new_data_flag:
-            zenity_forms = Zenity(title=zenity_forms.title, width=zenity_forms.width, height=zenity_forms.height)
-            zenity_forms.throw_forms_args(
+            forms_template = zenity.Zenity.template(
+                "forms",
+                forms_window,
                 req_entry=tuple(
                     ZENITY_FORMS_FIELDS[field] if ZENITY_FORMS_FIELDS.get(field) else field for field in get_field
                 ),
-                text=forms_text
+                text=forms_text,
             )
 
-            get_zen_data = await zenity_forms.do_notify()
+            get_zen_data = await zenity.Zenity.from_template(forms_template).do_notify()
 
             if get_zen_data.code != 0:
                 raise AbortZenityInsert
@@ -140,9 +301,11 @@ class App:
                     empty_fields += (get_field[value_index],)
 
             if get_new_data_flag:
-                z = Zenity(title=EXCEPTIONS["zen_input_field"], timeout=2)
-                z.throw_error_args(
-                    error_msg=f"Не были введены или введены неверно следующие поля:\n{cust_join(
+                z = zenity.Zenity.from_template(
+                    zenity.Zenity.template(
+                        "error", {"title": EXCEPTIONS["zen_input_field"], "timeout": 2, "width": 300}
+                    ),
+                    text=f"Не были введены или введены неверно следующие поля:\n{cust_join(
                         [
                             f"{i}. <b>{ZENITY_FORMS_FIELDS[field].capitalize()}</b>"
                             if ZENITY_FORMS_FIELDS.get(field) else
@@ -164,7 +327,7 @@ class App:
             except ValueError:
                 field = "Время" if get_time else "Дата"
                 _data = await self.get_data_in_loop(
-                    Zenity(EXCEPTIONS["zen_input_field"]),
+                    zenity.Zenity(EXCEPTIONS["zen_input_field"]),
                     get_field=(field,),
                     forms_text=ZENITY["data"]["data"].format(accept_format=_format)
                     if get_time else ZENITY["data"]["time"].format(_format),
@@ -176,7 +339,7 @@ class App:
         return _data.time() if get_time else _data.date()
 
     async def _validate_new_notify(self, new_task_notify: io.Task,
-                                   req_entry: dict[str, str]) -> FullDBObjectNotification:
+                                   req_entry: dict[str, str]) -> rep_base.FullDBObjectNotification:
 
         new_notification_result: ProcessResult = await new_task_notify
 
@@ -198,7 +361,7 @@ class App:
 
         if empty_req_entry:
             new_field_value = await self.get_data_in_loop(
-                Zenity(title="Обязательные поля были не введены!"),
+                zenity.Zenity(title="Обязательные поля были не введены!"),
                 empty_req_entry
             )
             if new_field_value is None:
@@ -207,7 +370,7 @@ class App:
 
         if self.ACTIONS["open"] in new_notification_value["action"]:
             new_notification_value |= {"extra_args": await self.get_data_in_loop(
-                Zenity(
+                zenity.Zenity(
                     title=ZENITY["url"]["title"],
                     width=400,
                     height=125,
@@ -215,7 +378,7 @@ class App:
                 ("url",),
                 forms_text=ZENITY["url"]["forms_text"],
             )}
-        new_reminder = Reminder()
+        new_reminder = dto.Reminder()
         for field_name, field_value in new_notification_value.copy().items():
             if field_name == "name":
                 new_reminder.name = field_value
@@ -227,17 +390,20 @@ class App:
                 continue
             del new_notification_value[field_name]
 
-        return FullDBObjectNotification(new_reminder, CreateNotification(SetNotificationDTO(**new_notification_value)))
+        return rep_base.FullDBObjectNotification(
+            new_reminder, dto_mongo.CreateNotification(dto_mongo.SetNotificationDTO(**new_notification_value))
+        )
 
     async def create_new_notify(self) -> None:
-        notify_category = await ReminderRepository().get_by_filter_by(stmt=Category)
-        new_zen_notify = Zenity(title="Создание нового уведомления", ok_label="Создать")
+        notify_category = await self.reference_cache.categories()
         req_entry = {ZENITY_FORMS_FIELDS["name"]: "", ZENITY_FORMS_FIELDS["title"]: ""}
-        new_zen_notify.throw_forms_args(
+        new_zen_template = zenity.Zenity.template(
+            "forms",
+            {"title": "Создание нового уведомления", "ok_label": "Создать"},
             req_entry=tuple(key for key in req_entry.keys()),
             entry=(ZENITY_FORMS_FIELDS["description"],),
             combos=({
-                ZENITY_FORMS_FIELDS["action"].capitalize(): BaseNotification.AVAILABLE_ACTION,
+                ZENITY_FORMS_FIELDS["action"].capitalize(): dto_mongo.BaseNotification.AVAILABLE_ACTION,
             }),
             selection={
                 ZENITY_FORMS_FIELDS["category"].capitalize(): [category.name for category in notify_category]
@@ -247,30 +413,30 @@ class App:
         )
 
         new_mongo_notify = await self._validate_new_notify(
-            new_task_notify=io.create_task(new_zen_notify.do_notify()),
+            new_task_notify=io.create_task(zenity.Zenity.from_template(new_zen_template).do_notify()),
             req_entry=req_entry,
         )
 
         await self.__create_new_notify(new_mongo_notify)
 
     async def delete_notify(self) -> None:
-        choose_notify = Zenity(title="Поиск уведомлений")
+        choose_notify = zenity.Zenity(title="Поиск уведомлений")
         choose_notify.throw_question_args(text="Совершить поиск по параметрам уведомления?")
         all_notify = await choose_notify.do_notify()
 
         if all_notify.code:
-            reminder_list = await MixedRepository().get_by_filters({})
+            reminder_list = await mixed_rep.MixedRepository().get_by_filters({})
         else:
             notify_name = await self.get_data_in_loop(
-                zenity_forms=Zenity("Поиск уведомления"),
+                zenity_forms=zenity.Zenity("Поиск уведомления"),
                 get_field=(ZENITY_FORMS_FIELDS["name"],),
                 forms_text="Выберите фразу для поиска уведомления по имени."
             )
-            reminder_list = await MixedRepository().get_by_filters({
-                Reminder.name: notify_name[ZENITY_FORMS_FIELDS["name"]]
-            })
+            reminder_list = await mixed_rep.MixedRepository().search_by_name(
+                notify_name[ZENITY_FORMS_FIELDS["name"]], limit=self.SEARCH_LIMIT
+            )
             if not reminder_list:
-                no_data = Zenity("Поиск уведомления", timeout=5)
+                no_data = zenity.Zenity("Поиск уведомления", timeout=5)
                 no_data.throw_info_args(
                     f"Не было найдено уведомлений по паттерну {notify_name[ZENITY_FORMS_FIELDS["name"]]}"
                 )
@@ -278,42 +444,63 @@ class App:
                 return
         # await self.show_notifies(reminder_list)
 
+    async def delete_all_notify(self) -> None:
+        """Удаление всех напоминаний и их уведомлений (после подтверждения)."""
+        confirm = zenity.Zenity(title="Удаление всех напоминаний", ok_label=AppMenuAction.conform.capitalize())
+        confirm.throw_question_args(text="Удалить все напоминания? Действие нельзя отменить.")
+        if (await confirm.do_notify()).code:
+            raise AbortZenityInsert
+
+        delete_result = await mixed_rep.MixedRepository().delete_all()
+        for reminder_uuid in delete_result.uuids:
+            self.scheduler.cancel(reminder_uuid)
+
+        text = f"Удалено напоминаний: {len(delete_result.deleted)}."
+        if not delete_result.complete:
+            text += " Удаление прервано ошибкой бд!"
+        if delete_result.orphaned:
+            text += f" Напоминаний без тел уведомлений: {delete_result.orphaned}."
+        deleted_notify = dbus_notify.DBusNotify(
+            title="Удаление напоминаний",
+            text=text,
+            urgency=NotifyUrgency.LOW if delete_result.complete else NotifyUrgency.CRIT,
+        )
+        await deleted_notify.do_notify(communicate=False, ignore_error=True)
+
     async def get_chosen_notify(
             self,
-            zenity_window: Zenity | None = None,
-            chosen_objects: Sequence[Reminder] | None = None,
+            zenity_window: zenity.Zenity | None = None,
+            chosen_objects: Sequence[dto.Reminder] | None = None,
             show_fields: dict[InstrumentedAttribute[str], str] | None = None,
             **zenity_list_args,
-    ) -> tuple[FullDBObjectNotification]:
+    ) -> tuple[rep_base.FullDBObjectNotification]:
         if show_fields is None:
             show_fields = {
-                Reminder.mongo_uuid: "🚩",
-                Reminder.name: "Название",
-                Reminder.target_data: "📆",
-                Reminder.target_time: "⏰",
-                Reminder.status: "✅",
+                dto.Reminder.mongo_uuid: "🚩",
+                dto.Reminder.name: "Название",
+                dto.Reminder.target_data: "📆",
+                dto.Reminder.target_time: "⏰",
+                dto.Reminder.status: "✅",
             }
         if zenity_window is None:
-            zenity_window = Zenity(
+            zenity_window = zenity.Zenity(
                 title="Список напоминаний",
                 ok_label="Просмотреть выбранное",
                 width=1000,
                 height=500,
             )
         if chosen_objects is None:
-            chosen_objects = await ReminderRepository().get_by_filter_by()
+            chosen_objects = await postgres_rep.ReminderRepository().get_by_filter_by()
         if not zenity_list_args:
             zenity_list_args = {"radiolist": True, "return_column_number": 1}
 
-        columns = {window_name: tuple() for window_name in show_fields.values()}
+        columns = zenity.ZenityListBuilder(show_fields.values())
 
         full_notifies = {}
         for reminder in chosen_objects:
-            mongo_uuid = ObjectId(reminder.mongo_uuid)
-            full_notifies[mongo_uuid] = FullDBObjectNotification(reminder, mongo_notify=None)
-
-            for notification_attr, window_attr_name in show_fields.items():
-                columns[window_attr_name] += (str(reminder.__getattribute__(notification_attr.key)),)
+            mongo_uuid = bson.ObjectId(reminder.mongo_uuid)
+            full_notifies[mongo_uuid] = rep_base.FullDBObjectNotification(reminder, mongo_notify=None)
+            columns.add_row(*(reminder.__getattribute__(notification_attr.key) for notification_attr in show_fields))
 
         zenity_window.throw_list_args(
             columns=columns,
@@ -330,14 +517,14 @@ class App:
 
         i = 0
         rem_mongo_uuids = []
-        column_counter = len(columns) - 1
-        column_names = tuple(columns.keys())
+        column_counter = len(columns.column_names) - 1
+        column_names = columns.column_names
         for index, notify_value in enumerate(mongo_uuids):
             if "return_column_number" in zenity_list_args:
                 return_index = zenity_list_args["return_column_number"]
                 if return_index == index:
                     notification_attr = get_key_dict_by_value(show_fields, column_names[return_index])
-                    if notification_attr is Reminder.mongo_uuid:
+                    if notification_attr is dto.Reminder.mongo_uuid:
                         pass
                     break
                 continue
@@ -347,7 +534,9 @@ class App:
             else:
                 i += 1
         if "return_column_number" not in zenity_list_args:
-            notifications = await NotificationsRepository().get_by_filter(filters={"_id": {"$in": rem_mongo_uuids}})
+            notifications = await mongo_rep.NotificationsRepository().get_by_ids(
+                list(map(bson.ObjectId, rem_mongo_uuids))
+            )
 
         rem_mongo_uuids = ()
         for notify in notifications:
@@ -358,85 +547,146 @@ class App:
 
         return rem_mongo_uuids
 
-    async def show_notifies(self, list_rem: Sequence[Reminder] = None) -> None:
+    async def show_notifies(self, list_rem: Sequence[dto.Reminder] = None) -> None:
         await self.get_chosen_notify(radiolist=True)
 
         if list_rem is None:
-            list_rem = await ReminderRepository().get_by_filter_by()
+            list_rem = await postgres_rep.ReminderRepository().get_by_filter_by()
 
-        columns = {name: tuple() for name in ("🚩", "name", "📆", "⏰", "✅")}
+        columns = zenity.ZenityListBuilder(("🚩", "name", "📆", "⏰", "✅"))
 
         for reminder in list_rem:
-            columns["🚩"] += (str(reminder.mongo_uuid),)
-            columns["name"] += (str(reminder.name),)
-            columns["📆"] += (str(reminder.target_data),)
-            columns["⏰"] += (str(reminder.target_time),)
-            columns["✅"] += (str(reminder.status),)
+            columns.add_row(
+                reminder.mongo_uuid, reminder.name, reminder.target_data, reminder.target_time, reminder.status
+            )
 
-        list_zen_notify = Zenity(
+        list_zen_notify = zenity.Zenity(
             title="Список напоминаний",
             ok_label="Просмотреть выбранное",
             width=1000,
             height=500,
         )
 
-        list_zen_notify.throw_list_args(columns=columns.copy(), return_column_number=1, radiolist=True)
+        list_zen_notify.throw_list_args(columns=columns, return_column_number=1, radiolist=True)
         notify_action = await list_zen_notify.do_notify()
 
         if notify_action.code == 1 and not notify_action.out:
             return
 
-        mongo_bodies = await NotificationsRepository().get_by_filter(
-            filters={
-                "_id": {
-                    "$in": list((map(ObjectId, notify_action.out.split('|'))))
-                }
-            }
+        mongo_bodies = await mongo_rep.NotificationsRepository().get_by_ids(
+            list(map(bson.ObjectId, notify_action.out.split("|")))
         )
-        mongo_zen_body = Zenity("Список уведомлений")
+        mongo_zen_body = zenity.Zenity("Список уведомлений")
         mongo_zen_body.throw_info_args(mongo_bodies[0]["description"])
         io.create_task(mongo_zen_body.do_notify())
-        print(mongo_bodies)
+        logger.debug("Тела уведомлений: %s", mongo_bodies)
 
     async def show_menu_notify(self) -> None:
-        """Показать уведомление.
+        """Показать меню. С настройкой ``MENU_CONFIRM`` перед меню показывается вопрос.
 
         :return: None
         """
-        notify = Zenity(title=str(self.settings.app_name), timeout=15)
-        notify.throw_question_args(text="Открыть меню редактора напоминаний?")
-        menu_result: ProcessResult = await notify.do_notify(communicate=True)
-
-        if menu_result.code == 0:
-            z = Zenity(title=self.settings.app_name, width=960, height=540)
-            z.throw_list_args(
-                text="Выберите действие из списка",
-                columns=ZENITY["menu"]["column_list"],
-                radiolist=True,
-                return_column_number=1,
-            )
+        if self.settings.menu_confirm:
+            notify = zenity.Zenity.from_template(zenity.Zenity.template(
+                "question", {"title": str(self.settings.app_name), "timeout": 15},
+                text="Открыть меню редактора напоминаний?",
+            ))
+            menu_result: ProcessResult = await notify.do_notify(communicate=True, on_spawn=self.hotkeys.visible)
+            if menu_result.code != 0:
+                return
+
+        z = zenity.Zenity.from_template(zenity.Zenity.template(
+            "list",
+            {"title": self.settings.app_name, "width": 960, "height": 540},
+            text="Выберите действие из списка",
+            columns=ZENITY["menu"]["column_list"],
+            radiolist=True,
+            return_column_number=1,
+        ))
+        menu_action = await z.do_notify(communicate=True, ignore_error=True, on_spawn=self.hotkeys.visible)
+        while not menu_action.out:
+            if menu_action.code == 1:
+                raise AbortZenityInsert
             menu_action = await z.do_notify(communicate=True, ignore_error=True)
-            while not menu_action.out:
-                if menu_action.code == 1:
-                    raise AbortZenityInsert
-                menu_action = await z.do_notify(communicate=True, ignore_error=True)
-            if not self.menu_action.get(menu_action.out):
-                raise NotImplementedError(f"Не создано действие меню для {menu_action.out}")
-            await self.menu_action[menu_action.out]()
-
-    async def do_notify_tasks(self, notices: list[dict]):
-        for nf in notices:
-            for action in nf["action"]:
-                if action == self.ACTIONS["open"]:
-                    io.create_task(self.shell.open_browser_url(url=nf["url"]))
+        if not self.menu_action.get(menu_action.out):
+            raise NotImplementedError(f"Не создано действие меню для {menu_action.out}")
+        await self.menu_action[menu_action.out]()
 
-                if action == self.ACTIONS["show"]:
-                    zen_msg = Zenity(title=nf["title"], timeout=10)
-                    zen_msg.throw_info_args(text=nf.get("description") or "<3")
-                    io.create_task(zen_msg.do_notify(communicate=True))
+    async def open_menu(self) -> None:
+        """
+        Открытие меню по горячим клавишам: отмена ввода не считается ошибкой,
+            ошибка запроса к postgres закрывает меню, но не останавливает прослушивание горячих клавиш.
+        """
+        from sqlalchemy.exc import SQLAlchemyError  # Загружен вместе с бд, импорт main.py его не подтягивает.
 
-                if action == self.ACTIONS["remind"]:
-                    pass
+        try:
+            await self.show_menu_notify()
+        except AbortZenityInsert:
+            if self.settings.debug:
+                logger.debug(AbortZenityInsert.__name__)
+        except SQLAlchemyError as e:
+            logger.exception("Меню закрыто из-за ошибки postgres: %r", e)
+
+    async def prewarm_menu(self) -> None:
+        """
+        Подготовка к открытию меню при нажатии первого модификатора горячих клавиш:
+            соединения бд, справочники и (для ``DIALOG_BACKEND=tk``) процесс окон.
+
+        :return: None.
+        """
+        preparations = [databases.DataBasesSessionsManager.warm_up(), self.reference_cache.warm_up()]
+        if self.settings.dialog_backend == zenity.Zenity.TK_BACKEND:
+            preparations.append(tk_dialog.TkDialogClient().start())
+        for error in await io.gather(*preparations, return_exceptions=True):
+            if isinstance(error, Exception):
+                logger.warning("Подготовка к открытию меню не выполнена: %r", error)
+
+    async def do_notify_tasks(self, notices: list[dict]) -> None:
+        """
+        Передача сработавших уведомлений диспетчеру: уведомления, сработавшие в пределах окна объединения,
+            показываются одним окном/уведомлением, а ссылки открываются одним запуском браузера.
+
+        :param notices: Тела уведомлений.
+
+        :return: None.
+        """
+        self.dispatcher.submit(notices)
+
+    async def __open_urls(self, notices: list[dict]) -> None:
+        await self.shell.open_browser_urls(nf["url"] for nf in notices if nf.get("url"))
+
+    async def __show_notices(self, notices: list[dict]) -> None:
+        if len(notices) == 1:
+            zen_msg = zenity.Zenity(title=notices[0]["title"], timeout=10)
+            zen_msg.throw_info_args(text=notices[0].get("description") or "<3")
+            await zen_msg.do_notify(communicate=True, ignore_error=True)
+            return
+
+        columns = zenity.ZenityListBuilder(("Заголовок", "Описание"))
+        for nf in notices:
+            columns.add_row(nf["title"], (nf.get("description") or "").replace("\n", " "))
+        zen_list = zenity.Zenity(title=NOTIFICATIONS["summary_title"].format(len(notices)), width=800, height=400)
+        zen_list.throw_list_args(columns=columns, return_column_number=1)
+        await zen_list.do_notify(communicate=True, ignore_error=True)
+
+    async def __remind_notices(self, notices: list[dict]) -> None:
+        if len(notices) == 1:
+            title, text = notices[0]["title"], notices[0].get("description") or ""
+        else:
+            title = NOTIFICATIONS["summary_title"].format(len(notices))
+            text = "\n".join(f"• {nf["title"]}" for nf in notices[:self.SUMMARY_LINES])
+            if len(notices) > self.SUMMARY_LINES:
+                text += "\n" + NOTIFICATIONS["summary_more"].format(len(notices) - self.SUMMARY_LINES)
+        remind_msg = dbus_notify.DBusNotify(title=title, text=text, urgency=NotifyUrgency.NORMAL)
+        await remind_msg.do_notify(communicate=False, ignore_error=True)
+
+    async def __remind_break(self, active_minutes: int, worked_hours: float) -> None:
+        break_msg = dbus_notify.DBusNotify(
+            title=self.settings.app_name,
+            text=NOTIFICATIONS["time_break"].format(active_minutes, worked_hours),
+            urgency=NotifyUrgency.NORMAL,
+        )
+        await break_msg.do_notify(communicate=False, ignore_error=True)
 
     async def catch_menu_trigger(
             self, hotkey: tuple[Key | str, ...] = (Key.ctrl, Key.alt, KeyCode.from_char("l"), KeyCode.from_char("a"))
@@ -447,51 +697,168 @@ class App:
 
         :return: None
         """
-        queue, listener = await self._create_menu_queue(get_hotkey(hotkey))
-
-        print(f"Статус потока - {listener.is_alive()}")
-        while listener.is_alive():
-
-            flag = await queue.get()
-            if flag:
-                try:
-                    await self.show_menu_notify()
-                except AbortZenityInsert:
-                    if self.settings.debug:
-                        print(AbortZenityInsert.__name__)
-                except Exception as e:
-                    raise e
-                finally:
-                    while not queue.empty():
-                        queue.get_nowait()
-                        queue.task_done()
-            elif not flag:
-                listener.stop()
-        else:
-            print("Не должен тут быть!")
-        return
-
-
-async def main(app: App = App()) -> None:
-    """Старт приложения."""
+        listener = self._create_hotkey_listener(get_hotkey(hotkey))
+        await io.sleep(0)  # Логирование запускается в main сразу после слушателя.
+        logger.info("Начал слушать [%s]", get_hotkey(hotkey))
+        logger.debug("Статус потока - %s", listener.is_alive())
+        try:
+            await self.hotkeys.run()
+        finally:
+            listener.stop()
+            logger.info("Прослушивание %s остановлено!", get_hotkey(hotkey))
+            logger.info("Горячие клавиши: %s", self.hotkeys.stats.summary())
+
+
+async def main(app: App | None = None, profile: StartupProfile | None = None) -> None:
+    """
+    Старт приложения. Первым запускается прослушивание горячих клавиш, затем загружаются логирование, подсистемы бд,
+        планировщик и фоновые задачи. Нажатия, пришедшие во время загрузки, обрабатываются после неё.
+
+    :param app: Приложение (по умолчанию создаётся).
+    :param profile: Замер фаз запуска.
+
+    :return: None.
+    """
+    profile = profile or StartupProfile()
+    app = app or App()
+    profile.mark("инициализация App")
     task = io.create_task(app.catch_menu_trigger())
     task.set_name(f"{app.catch_menu_trigger.__name__}")
-    print(f"Создание задачи <{task.get_name()}>")
+    logger.debug("Создание задачи <%s>", task.get_name())
+    await io.sleep(0)
+    profile.mark("прослушивание горячих клавиш")
+    app_logging.AppLogger().start()
+    profile.mark("логирование")
+    watcher = settings_watcher.SettingsWatcher()
+    await watcher.start()
+
+    for module in STARTUP_MODULES:
+        load_module(module)
+        await io.sleep(0)
+    profile.mark("импорт бд, asyncpg, dbus-next")
+
+    warm_up_task = io.create_task(app.reference_cache.warm_up())
+    warm_up_task.set_name(f"{app.reference_cache.warm_up.__qualname__}")
+    await app.scheduler.start(load=False)
+    listener_task = io.create_task(app.scheduler_listener.run())
+    listener_task.set_name(f"{app.scheduler_listener.run.__qualname__}")
+    notifications_watcher = mongo_cache.NotificationsChangeWatcher()
+    watcher_task = io.create_task(notifications_watcher.run())
+    watcher_task.set_name(f"{notifications_watcher.run.__qualname__}")
+    app.session_tracker.start()
+    session_task = io.create_task(app.session_tracker.run())
+    session_task.set_name(f"{app.session_tracker.run.__qualname__}")
+    unsubscribe = [
+        Settings.subscribe(subscriber) for subscriber in (
+            databases.DataBasesSessionsManager.on_settings_changed,
+            app.scheduler_listener.on_settings_changed,
+            notifications_watcher.on_settings_changed,
+            app.on_settings_changed,
+            app_logging.AppLogger().on_settings_changed,
+        )
+    ]
+    reconcile_task = None
+    if DataBaseSettings().reconcile_interval:
+        scanner = db_reconcile.ConsistencyScanner(repair=DataBaseSettings().reconcile_repair)
+        reconcile_task = io.create_task(scanner.run_periodic(DataBaseSettings().reconcile_interval))
+        reconcile_task.set_name(f"{scanner.run_periodic.__qualname__}")
+    profile.mark("запуск фоновых задач")
+    profile.report()
     while not task.done():
-        await io.sleep(5, print("Спал 5 секунд!"))
+        await io.sleep(5)
+        logger.debug("Спал 5 секунд!")
+    watcher.stop()
+    for unsubscribe_settings in unsubscribe:
+        unsubscribe_settings()
+    app.session_tracker.stop()
+    session_task.cancel()
+    app.scheduler.stop()
+    app.dispatcher.stop()
+    await app.scheduler_listener.stop()
+    listener_task.cancel()
+    notifications_watcher.stop()
+    watcher_task.cancel()
+    if reconcile_task is not None:
+        reconcile_task.cancel()
+    dbus_notify.NotificationsBus().disconnect()
     # await app.delete_notify()
 
 
+async def transfer(args: argparse.Namespace) -> None:
+    """Импорт/экспорт напоминаний (подкоманды `import`/`export`)."""
+    reminder_transfer = db_transfer.ReminderTransfer(batch_size=args.batch_size, concurrency=args.concurrency)
+    if args.command == "import":
+        stats = await reminder_transfer.import_file(args.path, fmt=args.format)
+    else:
+        stats = await reminder_transfer.export_file(args.path, fmt=args.format)
+    print(stats)
+
+
+async def reconcile(args: argparse.Namespace) -> None:
+    """Сверка postgres и mongodb (подкоманда `reconcile`)."""
+    scanner = db_reconcile.ConsistencyScanner(
+        repair=args.repair, grace=args.grace, rate=args.rate, batch_size=args.batch_size, progress=print,
+    )
+    print(await scanner.scan())
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    """Разбор аргументов командной строки. Без подкоманды запускается приложение."""
+    parser = argparse.ArgumentParser(description=Settings().app_name)
+    parser.add_argument(
+        "--startup-profile", action="store_true", help="Вывести длительность фаз запуска (импорт, инициализация).",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    reconcile_parser = subparsers.add_parser(
+        "reconcile", help="Поиск напоминаний без тел уведомлений и тел без напоминаний."
+    )
+    reconcile_parser.add_argument("--repair", action="store_true", help="Удалить найденные записи.")
+    reconcile_parser.add_argument("--grace", type=float, default=None, help="Пропускать тела моложе (секунды).")
+    reconcile_parser.add_argument(
+        "--rate", type=float, default=None,
+        help="Записей в секунду (0 - без ограничения, по умолчанию RECONCILE_RATE).",
+    )
+    reconcile_parser.add_argument("-b", "--batch-size", type=int, default=None, help="Размер пачки чтения.")
+    for command, help_text in (
+            ("import", "Импорт напоминаний с телами уведомлений из файла."),
+            ("export", "Экспорт напоминаний с телами уведомлений в файл."),
+    ):
+        subparser = subparsers.add_parser(command, help=help_text)
+        subparser.add_argument("path", help="Путь к файлу (\"-\" - stdin/stdout).")
+        subparser.add_argument(
+            "-f", "--format", choices=TRANSFER_FORMATS, default=None,
+            help="Формат файла (по умолчанию - по расширению, иначе jsonl).",
+        )
+        subparser.add_argument("-b", "--batch-size", type=int, default=None, help="Размер пачки.")
+        subparser.add_argument("-c", "--concurrency", type=int, default=None, help="Одновременно записываемых пачек.")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
+    startup_profile = StartupProfile(started=IMPORT_STARTED)
+    startup_profile.mark("импорт main.py", at=IMPORTS_DONE)
+    cli_args = parse_args()
+    startup_profile.enabled = cli_args.startup_profile
+    startup_profile.mark("разбор аргументов")
     time_start = time.time()
+    if cli_args.command is not None:
+        app_logging.AppLogger().start()
     loop = io.new_event_loop()
     try:
-        loop.run_until_complete(main())
+        if cli_args.command is None:
+            loop.run_until_complete(main(profile=startup_profile))
+        elif cli_args.command == "reconcile":
+            loop.run_until_complete(reconcile(cli_args))
+        else:
+            loop.run_until_complete(transfer(cli_args))
     except KeyboardInterrupt:
         pass
     finally:
+        loop.run_until_complete(databases.DataBasesSessionsManager.dispose())
+        loop.close()
         time_end = time.time()
         print(INFO["end_info"].format(
             time_min=round((time_end - time_start) / 60, 2),
             time_sec=round(time_end - time_start, 3)
         ))
+        app_logging.AppLogger().stop()
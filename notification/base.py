@@ -1,13 +1,19 @@
 import asyncio as io
+import logging
+import time
 from abc import ABC, abstractmethod
-from dataclasses import dataclass
+from collections import OrderedDict, deque
+from collections.abc import Callable, Iterable
+from contextlib import suppress
+from dataclasses import dataclass, field
 from subprocess import SubprocessError
+from typing import ClassVar
 
 from property.constants import EXCEPTIONS
-from property.helpers import cust_join
+from property.helpers import cust_join, percentiles
 from property.settings import Settings
 
-type processes_dict = dict[str, ProcessBody]
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -25,54 +31,290 @@ class ProcessResult:
 class ProcessBody:
     """Дата класс результатов исполняемых процессов."""
     process: io.subprocess.Process
-    result: ProcessResult = ProcessResult
+    result: ProcessResult = field(default_factory=ProcessResult)
+    cmd: tuple[str, ...] = ()
+    queued: float = 0.0
+    spawned: float = 0.0
+    finished: float | None = None
+    interactive: bool = False
+
+
+@dataclass(slots=True)
+class ProcessStats:
+    """Статистика подпроцессов ``ShellExec``: счётчики и последние ``LATENCY_SAMPLES`` задержек (секунды)."""
+    started: int = 0
+    finished: int = 0
+    running: int = 0
+    waiting: int = 0
+    timeouts: int = 0
+    killed: int = 0
+    detached: int = 0
+    spawn_errors: int = 0
+    wait_latency: deque[float] = field(default_factory=lambda: deque(maxlen=ProcessStats.LATENCY_SAMPLES))
+    spawn_latency: deque[float] = field(default_factory=lambda: deque(maxlen=ProcessStats.LATENCY_SAMPLES))
+    exec_latency: deque[float] = field(default_factory=lambda: deque(maxlen=ProcessStats.LATENCY_SAMPLES))
+
+    LATENCY_SAMPLES: ClassVar[int] = 256
+
+    def summary(self) -> dict[str, int | dict[str, float]]:
+        """
+        Сводка статистики.
+
+        :return: Счётчики и перцентили задержек: ожидания слота (wait), запуска процесса (spawn), исполнения (exec).
+        """
+        return {
+            "started": self.started, "finished": self.finished, "running": self.running, "waiting": self.waiting,
+            "timeouts": self.timeouts, "killed": self.killed, "detached": self.detached,
+            "spawn_errors": self.spawn_errors,
+            "wait": percentiles(self.wait_latency),
+            "spawn": percentiles(self.spawn_latency),
+            "exec": percentiles(self.exec_latency),
+        }
 
 
 class ShellExec:
+    """
+    Запуск подпроцессов. Одновременно выполняется не более ``MAX_PROCESSES`` процессов (остальные ждут слот),
+        результаты хранятся для последних ``HISTORY_SIZE`` задач.
+        Окна, ответа которых ждут без ``timeout`` (zenity, кнопки notify-send), открыты, пока их не закроет
+        пользователь, поэтому занимают отдельные ``MAX_DIALOGS`` слотов и не блокируют остальные процессы.
+    """
     RESULT = ProcessBody
     GNOME_BROWSER = "gnome-www-browser"
-    PROCESSES_RESULT: processes_dict = {}
+    PROCESSES_RESULT: OrderedDict[str, ProcessBody] = OrderedDict()
+    STATS: ProcessStats = ProcessStats()
+    STDIN_CHUNK_SIZE: int = 64 * 1024
+    MAX_PROCESSES: int = 8
+    MAX_DIALOGS: int = 16
+    HISTORY_SIZE: int = 64
+    KILL_TIMEOUT: float = 2
+    DETACH_TIMEOUT: float = 30
+    _SEMAPHORE: io.Semaphore | None = None
+    _DIALOG_SEMAPHORE: io.Semaphore | None = None
+    _REAPERS: set[io.Task] = set()
+
+    @classmethod
+    def semaphore(cls, interactive: bool = False) -> io.Semaphore:
+        """
+        Общий для всех наследников семафор запущенных процессов.
+
+        :param interactive: Семафор окон, ожидающих пользователя (``MAX_DIALOGS``), иначе - ``MAX_PROCESSES``.
+
+        :return: Семафор.
+        """
+        if interactive:
+            if ShellExec._DIALOG_SEMAPHORE is None:
+                ShellExec._DIALOG_SEMAPHORE = io.Semaphore(cls.MAX_DIALOGS)
+            return ShellExec._DIALOG_SEMAPHORE
+        if ShellExec._SEMAPHORE is None:
+            ShellExec._SEMAPHORE = io.Semaphore(cls.MAX_PROCESSES)
+        return ShellExec._SEMAPHORE
 
     async def exec_subprocess(
-            self, cmd: list[str], tsk: io.Task | None = None, interplay: bool = False, ignore_error: bool = False
+            self, cmd: list[str], tsk: io.Task | str | None = None, interplay: bool = False,
+            ignore_error: bool = False, stdin: Iterable[str] | None = None, timeout: float | None = None,
+            on_spawn: Callable[[ProcessBody], None] | None = None,
     ) -> ProcessResult:
         """
         Исполняет выражение CMD.
 
         :param cmd: Выражение для исполнения.
-        :param tsk: Задача для выполнения cmd.
+        :param tsk: Задача (или её имя) для выполнения cmd.
         :param interplay: Необходимость ожидания ответа терминала.
         :param ignore_error: Необходимость игнорировать ошибки от терминала (только с interplay).
+        :param stdin: Строки для передачи в stdin процесса (читаются лениво, по строке на элемент).
+        :param timeout: С interplay - время, после которого процесс завершается принудительно.
+            Без interplay - время, после которого процесс перестаёт занимать слот (по умолчанию ``DETACH_TIMEOUT``).
+        :param on_spawn: Обработчик, вызываемый сразу после запуска процесса (ошибки обработчика логируются).
 
         :return: Код ответа терминала, Текстовый отвела, Сообщение об ошибке.
         """
-        tsk_name = io.current_task().get_name() if not tsk else tsk.get_name()
+        if isinstance(tsk, str):
+            tsk_name = tsk
+        else:
+            tsk_name = (tsk or io.current_task()).get_name()
+
+        interactive = interplay and timeout is None
+        semaphore = self.semaphore(interactive)
+        queued = time.monotonic()
+        self.STATS.waiting += 1
+        try:
+            await semaphore.acquire()
+        finally:
+            self.STATS.waiting -= 1
+        spawn_start = time.monotonic()
+        try:
+            process = await io.create_subprocess_exec(
+                *cmd,
+                stdin=None if stdin is None else io.subprocess.PIPE,
+                stdout=None if not interplay else io.subprocess.PIPE,
+                stderr=None if not interplay else io.subprocess.PIPE,
+            )
+        except BaseException:
+            self.STATS.spawn_errors += 1
+            semaphore.release()
+            raise
 
-        process = await io.create_subprocess_exec(
-            *cmd,
-            stdout=None if not interplay else io.subprocess.PIPE,
-            stderr=None if not interplay else io.subprocess.PIPE,
+        process_body = self.RESULT(
+            process, cmd=tuple(cmd), queued=queued, spawned=time.monotonic(), interactive=interactive
         )
+        self.__remember(tsk_name, process_body)
+        self.STATS.started += 1
+        self.STATS.running += 1
+        self.STATS.wait_latency.append(spawn_start - queued)
+        self.STATS.spawn_latency.append(process_body.spawned - spawn_start)
+        if on_spawn is not None:
+            try:
+                on_spawn(process_body)
+            except Exception as e:  # Процесс уже занимает слот: ошибка обработчика не должна его потерять.
+                logger.error("Ошибка обработчика запуска %s: %r", cust_join(cmd, ' '), e, exc_info=e)
 
-        self.PROCESSES_RESULT[tsk_name] = self.RESULT(process)
-        current_task_result = self.PROCESSES_RESULT[tsk_name].result
+        if not interplay:
+            reaper = io.create_task(self.__reap(process_body, stdin, timeout or self.DETACH_TIMEOUT))
+            self._REAPERS.add(reaper)
+            reaper.add_done_callback(self._REAPERS.discard)
+            return process_body.result
 
-        if interplay:
-            await process.wait()
-            out, err = await process.communicate()
+        current_task_result = process_body.result
+        try:
+            out, err = await io.wait_for(self.__communicate(process, stdin), timeout)
+        except TimeoutError:
+            await self.__kill(process)
+            self.STATS.timeouts += 1
+            current_task_result.code = process.returncode
+            current_task_result.error = EXCEPTIONS["timeout"].format(timeout, expr=cust_join(cmd))
+            if not ignore_error:
+                raise SubprocessError(current_task_result.error)
+            return current_task_result
+        except io.CancelledError:
+            await self.__kill(process)
+            raise
+        finally:
+            self.__finish(process_body)
 
-            current_task_result.out, current_task_result.error = out.decode().rstrip("\n"), err.decode()
-            self.PROCESSES_RESULT[tsk_name].result.code = process.returncode
+        current_task_result.out, current_task_result.error = out.decode().rstrip("\n"), err.decode()
+        current_task_result.code = process.returncode
 
-            if current_task_result.error and not ignore_error:
-                raise SubprocessError(EXCEPTIONS["communicate"].format(err, expr=cust_join(cmd)))
+        if current_task_result.error and not ignore_error:
+            raise SubprocessError(EXCEPTIONS["communicate"].format(err, expr=cust_join(cmd)))
 
-            print(tsk_name, ">>>", self.PROCESSES_RESULT[tsk_name].process)
+        logger.debug("%s >>> %s", tsk_name, process)
 
         return current_task_result
 
+    def __remember(self, tsk_name: str, process_body: ProcessBody) -> None:
+        """Сохранение результата задачи с вытеснением самых старых сверх ``HISTORY_SIZE``."""
+        self.PROCESSES_RESULT[tsk_name] = process_body
+        self.PROCESSES_RESULT.move_to_end(tsk_name)
+        while len(self.PROCESSES_RESULT) > self.HISTORY_SIZE:
+            self.PROCESSES_RESULT.popitem(last=False)
+
+    def __finish(self, process_body: ProcessBody) -> None:
+        """Освобождение слота процесса и учёт времени исполнения."""
+        process_body.finished = time.monotonic()
+        self.STATS.running -= 1
+        self.STATS.finished += 1
+        self.STATS.exec_latency.append(process_body.finished - process_body.spawned)
+        self.semaphore(process_body.interactive).release()
+
+    async def __reap(self, process_body: ProcessBody, stdin: Iterable[str] | None, detach_timeout: float) -> None:
+        """
+        Ожидание завершения процесса, запущенного без interplay. Если процесс работает дольше ``detach_timeout``
+            (например, первый запуск браузера), он остаётся работать, но перестаёт занимать слот.
+
+        :param process_body: Процесс.
+        :param stdin: Строки для передачи в stdin.
+        :param detach_timeout: Время ожидания (секунды).
+
+        :return: None.
+        """
+        try:
+            await io.wait_for(self.__communicate(process_body.process, stdin), detach_timeout)
+            process_body.result.code = process_body.process.returncode
+        except TimeoutError:
+            self.STATS.detached += 1
+        except Exception as e:
+            logger.error("Ошибка ожидания подпроцесса %s: %r", cust_join(process_body.cmd, ' '), e)
+        finally:
+            self.__finish(process_body)
+
+    async def __communicate(
+            self, process: io.subprocess.Process, stdin: Iterable[str] | None
+    ) -> tuple[bytes | None, bytes | None]:
+        """
+        Чтение stdout/stderr до конца и ожидание завершения процесса (без взаимной блокировки на заполненном pipe).
+
+        :param process: Процесс.
+        :param stdin: Строки для передачи в stdin.
+
+        :return: stdout, stderr (None, если поток не перехвачен).
+        """
+        if stdin is None:
+            return await process.communicate()
+        _, out, err = await io.gather(
+            self.__feed_stdin(process, stdin), self.__read(process.stdout), self.__read(process.stderr)
+        )
+        await process.wait()
+        return out, err
+
+    @staticmethod
+    async def __read(stream: io.StreamReader | None) -> bytes | None:
+        return await stream.read() if stream is not None else None
+
+    async def __kill(self, process: io.subprocess.Process) -> None:
+        """Остановка процесса: SIGTERM, через ``KILL_TIMEOUT`` секунд - SIGKILL."""
+        if process.returncode is not None:
+            return
+        with suppress(ProcessLookupError):
+            process.terminate()
+        try:
+            await io.wait_for(process.wait(), self.KILL_TIMEOUT)
+        except TimeoutError:
+            with suppress(ProcessLookupError):
+                process.kill()
+            await process.wait()
+        self.STATS.killed += 1
+
+    async def __feed_stdin(self, process: io.subprocess.Process, lines: Iterable[str]) -> None:
+        """
+        Передача строк в stdin процесса блоками по ``STDIN_CHUNK_SIZE`` байт без накопления всего ввода в памяти.
+
+        :param process: Процесс с stdin=PIPE.
+        :param lines: Строки для передачи.
+
+        :return: None.
+        """
+        chunk, chunk_size = [], 0
+        try:
+            for line in lines:
+                chunk.append(line)
+                chunk_size += len(line) + 1
+                if chunk_size >= self.STDIN_CHUNK_SIZE:
+                    process.stdin.write(("\n".join(chunk) + "\n").encode())
+                    await process.stdin.drain()
+                    chunk, chunk_size = [], 0
+            if chunk:
+                process.stdin.write(("\n".join(chunk) + "\n").encode())
+                await process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            process.stdin.close()
+
     async def open_browser_url(self, url: str):
-        io.create_task(self.exec_subprocess(cmd=[self.GNOME_BROWSER, "--new-window", url]))
+        await self.open_browser_urls((url,))
+
+    async def open_browser_urls(self, urls: Iterable[str]) -> None:
+        """
+        Открытие ссылок одним запуском браузера (вкладками одного нового окна).
+
+        :param urls: Ссылки.
+
+        :return: None.
+        """
+        urls = list(dict.fromkeys(urls))
+        if urls:
+            io.create_task(self.exec_subprocess(cmd=[self.GNOME_BROWSER, "--new-window", *urls]))
 
 
 class BaseNotify(ABC, ShellExec):
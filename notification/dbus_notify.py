@@ -0,0 +1,270 @@
+import asyncio as io
+import logging
+import time
+from collections import OrderedDict
+
+from notification.base import ProcessResult
+from notification.notify import Notify
+from property.constants import NotifyUrgency
+from property.patterns import Singleton
+
+try:
+    from dbus_next import BusType, Message, MessageType, Variant
+    from dbus_next.aio import MessageBus
+except ImportError:  # dbus-next не установлен: используется notify-send.
+    MessageBus = None
+
+logger = logging.getLogger(__name__)
+
+
+class NotificationsBus(Singleton):
+    """
+    Общее для процесса соединение с session bus для вызова `org.freedesktop.Notifications` без запуска notify-send.
+        При недоступности шины повторное подключение выполняется не чаще раза в ``RETRY_DELAY`` секунд.
+        При обрыве соединения ожидания кнопок (``wait_action``) завершаются так же, как при закрытии уведомления.
+    """
+    BUS_NAME: str = "org.freedesktop.Notifications"
+    OBJECT_PATH: str = "/org/freedesktop/Notifications"
+    INTERFACE: str = "org.freedesktop.Notifications"
+    MATCH_RULE: str = f"type='signal',interface='{INTERFACE}'"
+    RETRY_DELAY: float = 30
+    EARLY_RESULTS_SIZE: int = 256
+    MAX_IN_FLIGHT: int = 32
+
+    def __init__(self) -> None:
+        if hasattr(self, "_bus"):
+            return
+        self._bus: MessageBus | None = None
+        self._lock: io.Lock | None = None
+        self._in_flight: io.Semaphore | None = None
+        self._retry_at: float = 0.0
+        self._waiters: dict[int, io.Future] = {}
+        self._early_results: OrderedDict[int, str | None] = OrderedDict()
+        self._tasks: set[io.Task] = set()
+
+    @property
+    def connected(self) -> bool:
+        return self._bus is not None and self._bus.connected
+
+    async def connect(self) -> bool:
+        """
+        Подключение к session bus (один раз на процесс).
+
+        :return: Доступна ли шина.
+        """
+        if self.connected:
+            return True
+        if self._bus is not None:
+            self.__on_disconnect(self._bus)
+        if MessageBus is None or time.monotonic() < self._retry_at:
+            return False
+        if self._lock is None:
+            self._lock = io.Lock()
+        async with self._lock:
+            if self.connected:
+                return True
+            try:
+                bus = await MessageBus(bus_type=BusType.SESSION).connect()
+                bus.add_message_handler(self.__on_signal)
+                await self.__call(bus, "org.freedesktop.DBus", "/org/freedesktop/DBus", "org.freedesktop.DBus",
+                                  "AddMatch", "s", [self.MATCH_RULE])
+            except Exception as e:
+                self._retry_at = time.monotonic() + self.RETRY_DELAY
+                logger.warning("Session bus недоступна, уведомления через notify-send: %r", e)
+                return False
+            self._bus = bus
+            self._in_flight = io.Semaphore(self.MAX_IN_FLIGHT)
+            self.keep_task(io.create_task(self.__watch_disconnect(bus)))
+            return True
+
+    async def notify(
+            self, app_name: str, summary: str, body: str = "", urgency: int = 1,
+            actions: list[tuple[str, str]] | None = None, replaces_id: int = 0, expire_timeout: int = -1,
+    ) -> int:
+        """
+        Вызов `Notify`.
+
+        :param app_name: Имя приложения.
+        :param summary: Заголовок.
+        :param body: Текст.
+        :param urgency: Уровень важности (0 - low, 1 - normal, 2 - critical).
+        :param actions: Кнопки [(ключ действия, подпись)].
+        :param replaces_id: ID заменяемого уведомления (0 - новое).
+        :param expire_timeout: Время отображения (мс), -1 - по умолчанию сервера.
+
+        :return: ID уведомления.
+        """
+        flat_actions = [item for action in actions or () for item in action]
+        async with self._in_flight:  # Ограничение очереди записи в сокет шины при всплеске уведомлений.
+            reply = await self.__call(
+                self._bus, self.BUS_NAME, self.OBJECT_PATH, self.INTERFACE, "Notify", "susssasa{sv}i",
+                [app_name, replaces_id, "", summary, body, flat_actions, {"urgency": Variant("y", urgency)},
+                 expire_timeout],
+            )
+        return reply.body[0]
+
+    async def close_notification(self, notification_id: int) -> None:
+        """Закрытие уведомления (`CloseNotification`)."""
+        await self.__call(
+            self._bus, self.BUS_NAME, self.OBJECT_PATH, self.INTERFACE, "CloseNotification", "u", [notification_id]
+        )
+
+    async def wait_action(self, notification_id: int) -> str | None:
+        """
+        Ожидание нажатия кнопки или закрытия уведомления.
+
+        :param notification_id: ID уведомления.
+
+        :return: Ключ нажатого действия или None, если уведомление закрыто без действия.
+        """
+        if notification_id in self._early_results:
+            return self._early_results.pop(notification_id)
+        waiter = self._waiters.get(notification_id)
+        if waiter is None:
+            waiter = self._waiters[notification_id] = io.get_running_loop().create_future()
+        try:
+            return await waiter
+        finally:
+            self._waiters.pop(notification_id, None)
+
+    def keep_task(self, task: io.Task) -> None:
+        """Хранение ссылки на фоновую отправку до её завершения."""
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def disconnect(self) -> None:
+        """Закрытие соединения с шиной."""
+        if self._bus is not None:
+            self._bus.disconnect()
+            self._bus = None
+        self.__release_waiters()
+
+    async def __watch_disconnect(self, bus: MessageBus) -> None:
+        """Ожидание обрыва соединения ``bus``."""
+        try:
+            await bus.wait_for_disconnect()
+        except Exception as e:
+            logger.warning("Соединение с session bus разорвано: %r", e)
+        self.__on_disconnect(bus)
+
+    def __on_disconnect(self, bus: MessageBus) -> None:
+        """Обрыв соединения: ответы на ожидания по нему уже не придут, следующий вызов подключится заново."""
+        if self._bus is not bus:
+            return
+        self._bus = None
+        self.__release_waiters()
+
+    def __release_waiters(self) -> None:
+        """Завершение ожиданий кнопок (как закрытие уведомления без действия) и сброс ранних сигналов."""
+        for waiter in self._waiters.values():
+            if not waiter.done():
+                waiter.set_result(None)
+        self._waiters.clear()
+        self._early_results.clear()
+
+    def __on_signal(self, message: Message) -> None:
+        if message.message_type != MessageType.SIGNAL or message.interface != self.INTERFACE:
+            return
+        if message.member == "ActionInvoked":
+            result = message.body[1]
+        elif message.member == "NotificationClosed":
+            result = None
+        else:
+            return
+        waiter = self._waiters.get(message.body[0])
+        if waiter is None:
+            # Сигнал пришёл раньше, чем начато ожидание.
+            self._early_results.setdefault(message.body[0], result)
+            while len(self._early_results) > self.EARLY_RESULTS_SIZE:
+                self._early_results.popitem(last=False)
+        elif not waiter.done():
+            waiter.set_result(result)
+
+    @staticmethod
+    async def __call(
+            bus: MessageBus, destination: str, path: str, interface: str, member: str, signature: str, body: list
+    ) -> Message:
+        reply = await bus.call(Message(
+            destination=destination, path=path, interface=interface, member=member, signature=signature, body=body,
+        ))
+        if reply.message_type == MessageType.ERROR:
+            raise ConnectionError(f"{interface}.{member}: {reply.error_name} {reply.body}")
+        return reply
+
+
+class DBusNotify(Notify):
+    """
+    Уведомление через общее соединение с session bus. Если шина или dbus-next недоступны - через notify-send.
+        Результат совпадает по форме с ``Notify.do_notify``: ``out`` - ID уведомления,
+        а с ``communicate`` и кнопками - ключ нажатой кнопки.
+    """
+    URGENCY_LEVELS: dict[NotifyUrgency, int] = {NotifyUrgency.LOW: 0, NotifyUrgency.NORMAL: 1, NotifyUrgency.CRIT: 2}
+
+    def __init__(
+            self, title: str, text: str, urgency: NotifyUrgency = NotifyUrgency.LOW,
+            replaces_id: int = 0, expire_timeout: int = -1,
+    ) -> None:
+        """
+        :param title: Заголовок.
+        :param text: Текст.
+        :param urgency: Уровень важности.
+        :param replaces_id: ID заменяемого уведомления.
+        :param expire_timeout: Время отображения (мс), -1 - по умолчанию сервера.
+        """
+        super().__init__(title, text, urgency)
+        self.replaces_id = replaces_id
+        self.expire_timeout = expire_timeout
+        self.actions: list[tuple[str, str]] = []
+        self.notification_id: int | None = None
+        self.bus = NotificationsBus()
+        self._sending: io.Task | None = None
+
+    def throw_extra_buttons(self, buttons: tuple[tuple[int, str], ...]) -> None:
+        super().throw_extra_buttons(buttons)
+        self.actions.extend((str(btn[0]), btn[1]) for btn in buttons)
+
+    async def do_notify(self, task_name: None | str = None, command: None | list[str] = None,
+                        communicate: bool = False, ignore_error: bool = True) -> ProcessResult:
+        """
+        Показ уведомления. Без ``communicate`` вызов отправляется в фоне и метод возвращается сразу
+            (как notify-send без ожидания), ID уведомления доступен после ``close``/``wait_sent``.
+
+        :return: С ``communicate`` - ID уведомления, а при наличии кнопок - ключ нажатой кнопки.
+        """
+        if command is not None or not await self.bus.connect():
+            return await super().do_notify(task_name, command, communicate, ignore_error)
+        if not communicate:
+            self._sending = io.create_task(self.__send(task_name, communicate, ignore_error))
+            self.bus.keep_task(self._sending)
+            return ProcessResult(code=0, error="")
+        result = await self.__send(task_name, communicate, ignore_error)
+        if self.actions and self.notification_id is not None:
+            result.out = await self.bus.wait_action(self.notification_id)
+        return result
+
+    async def wait_sent(self) -> int | None:
+        """Ожидание отправки фонового уведомления. :return: ID уведомления."""
+        if self._sending is not None:
+            await self._sending
+        return self.notification_id
+
+    async def __send(self, task_name: None | str, communicate: bool, ignore_error: bool) -> ProcessResult:
+        """Вызов `Notify`. При ошибке - notify-send с тем же ``communicate`` (ключ кнопки или вывод notify-send)."""
+        try:
+            self.notification_id = await self.bus.notify(
+                app_name=self.APP_NAME, summary=self.title, body=self.text,
+                urgency=self.URGENCY_LEVELS.get(self.urgency, 1), actions=self.actions,
+                replaces_id=self.replaces_id, expire_timeout=self.expire_timeout,
+            )
+        except Exception as e:
+            logger.error("Ошибка вызова %s.Notify: %r", NotificationsBus.INTERFACE, e)
+            self.notification_id = None
+            return await super().do_notify(task_name, None, communicate, ignore_error)
+        self.replaces_id = self.notification_id
+        return ProcessResult(code=0, out=self.notification_id, error="")
+
+    async def close(self) -> None:
+        """Закрытие показанного уведомления."""
+        await self.wait_sent()
+        if self.notification_id is not None and self.bus.connected:
+            await self.bus.close_notification(self.notification_id)
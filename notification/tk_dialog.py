@@ -0,0 +1,148 @@
+import asyncio as io
+import itertools
+import json
+import logging
+import os
+import sys
+import time
+from typing import Callable
+
+from exceptions.zenity import UnsupportedDialogArgs
+from notification.base import ProcessResult
+from property.patterns import Singleton
+
+logger = logging.getLogger(__name__)
+
+
+class TkDialogClient(Singleton):
+    """
+    Клиент постоянного процесса окон ``notification.tk_server``: окна zenity показываются без запуска процесса
+        на каждое окно. Процесс запускается при первом окне и перезапускается, если завершился.
+        При ошибке запуска повторная попытка выполняется не чаще раза в ``RETRY_DELAY`` секунд.
+    """
+    SERVER_MODULE: str = "notification.tk_server"
+    PROJECT_DIR: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    RETRY_DELAY: float = 30
+
+    def __init__(self) -> None:
+        if hasattr(self, "_process"):
+            return
+        self._process: io.subprocess.Process | None = None
+        self._reader: io.Task | None = None
+        self._lock: io.Lock | None = None
+        self._retry_at: float = 0.0
+        self._ids = itertools.count(1)
+        self._waiters: dict[int, io.Future] = {}
+
+    @property
+    def running(self) -> bool:
+        return self._process is not None and self._process.returncode is None
+
+    async def start(self) -> None:
+        """
+        Запуск процесса окон (если он ещё не запущен).
+
+        :raise ConnectionError: Процесс не удалось запустить.
+
+        :return: None.
+        """
+        if self.running:
+            return
+        if time.monotonic() < self._retry_at:
+            raise ConnectionError("Процесс окон tkinter недоступен.")
+        if self._lock is None:
+            self._lock = io.Lock()
+        async with self._lock:
+            if self.running:
+                return
+            try:
+                self._process = await io.create_subprocess_exec(
+                    sys.executable, "-m", self.SERVER_MODULE,
+                    stdin=io.subprocess.PIPE, stdout=io.subprocess.PIPE, cwd=self.PROJECT_DIR,
+                )
+            except OSError as e:
+                self._retry_at = time.monotonic() + self.RETRY_DELAY
+                raise ConnectionError(f"Не удалось запустить процесс окон tkinter: {e!r}") from e
+            self._reader = io.create_task(self.__read_responses(self._process))
+            self._reader.set_name(f"{self.__class__.__name__}.read_responses")
+
+    async def run(self, argv: list[str], stdin: list[str] | None = None,
+                  on_sent: Callable[[], None] | None = None) -> ProcessResult:
+        """
+        Показ окна.
+
+        :param argv: Команда zenity (как её собирает ``Zenity``).
+        :param stdin: Ячейки таблицы ``--list`` для stdin.
+        :param on_sent: Обработчик, вызываемый после передачи окна процессу окон.
+
+        :raise ConnectionError: Процесс окон недоступен или завершился, не ответив.
+        :raise UnsupportedDialogArgs: Окно с такими аргументами не поддерживается.
+
+        :return: Код ответа и вывод в том же виде, что у zenity.
+        """
+        await self.start()
+        request_id = next(self._ids)
+        waiter = self._waiters[request_id] = io.get_running_loop().create_future()
+        try:
+            await self.__send({"id": request_id, "argv": argv, "stdin": stdin})
+            if on_sent is not None:
+                on_sent()
+            response = await waiter
+        except io.CancelledError:
+            if self.running:
+                await self.__send({"id": request_id, "cancel": True})
+            raise
+        finally:
+            self._waiters.pop(request_id, None)
+        if response["code"] is None:
+            raise UnsupportedDialogArgs(response["error"])
+        return ProcessResult(code=response["code"], out=response["out"], error=response["error"])
+
+    async def stop(self) -> None:
+        """Завершение процесса окон: открытые окна закрываются."""
+        if not self.running:
+            return
+        self._process.stdin.close()
+        try:
+            await io.wait_for(self._process.wait(), 2)
+        except TimeoutError:
+            self._process.kill()
+            await self._process.wait()
+
+    async def __send(self, message: dict) -> None:
+        try:
+            self._process.stdin.write((json.dumps(message, ensure_ascii=False) + "\n").encode())
+            await self._process.stdin.drain()
+        except (BrokenPipeError, ConnectionResetError) as e:
+            raise ConnectionError(f"Процесс окон tkinter завершился: {e!r}") from e
+
+    async def __read_responses(self, process: io.subprocess.Process) -> None:
+        """
+        Разбор ответов процесса окон. Строки, которые не являются ответом, пропускаются.
+            Если разбор прервался ошибкой, процесс завершается. При завершении процесса ожидающие окна
+            получают ``ConnectionError``.
+        """
+        try:
+            async for line in process.stdout:
+                try:
+                    response = json.loads(line)
+                    waiter = self._waiters.get(response["id"])
+                except (ValueError, KeyError, TypeError):
+                    logger.warning("Процесс окон tkinter: пропущена строка вывода %r", line[:200])
+                    continue
+                if waiter is not None and not waiter.done():
+                    waiter.set_result(response)
+        except Exception as e:
+            logger.error("Ошибка чтения ответов процесса окон tkinter, процесс будет завершён: %r", e)
+            if process.returncode is None:
+                process.kill()
+            raise
+        finally:
+            await process.wait()
+            if process.returncode:
+                self._retry_at = time.monotonic() + self.RETRY_DELAY
+            for waiter in self._waiters.values():
+                if not waiter.done():
+                    waiter.set_exception(
+                        ConnectionError(f"Процесс окон tkinter завершился с кодом {process.returncode}.")
+                    )
@@ -0,0 +1,268 @@
+"""
+Постоянный процесс окон на tkinter вместо запуска zenity на каждое окно.
+
+Протокол - JSON по строке на сообщение:
+    stdin:  ``{"id": 1, "argv": ["zenity", "--question", ...], "stdin": [ячейки таблицы] | null}``,
+            ``{"id": 1, "cancel": true}`` - закрыть окно запроса;
+    stdout: ``{"id": 1, "code": 0, "out": "...", "error": ""}``.
+Запрос - команда zenity в том виде, в котором её собирает ``Zenity``, ответ совпадает с выводом zenity
+(код выхода и stdout). Если в команде есть неподдерживаемый аргумент, возвращается ``code: null``,
+и клиент показывает окно через zenity.
+
+Запуск: ``python -m notification.tk_server`` (из корня проекта).
+"""
+import json
+import os
+import re
+import sys
+import tkinter as tk
+from dataclasses import dataclass, field
+from datetime import date
+from tkinter import ttk
+
+ZENITY_OK = 0
+ZENITY_CANCEL = 1
+ZENITY_TIMEOUT = 5
+SEPARATOR = "|"
+MODES = ("info", "question", "error", "forms", "list", "entry")
+MARKUP = re.compile(r"<[^>]+>")
+
+
+@dataclass(slots=True)
+class DialogSpec:
+    """Разобранная команда zenity."""
+    mode: str = ""
+    title: str = ""
+    text: str = ""
+    ok_label: str = "OK"
+    cancel_label: str = "Отмена"
+    extra_buttons: list[str] = field(default_factory=list)
+    width: int | None = None
+    height: int | None = None
+    timeout: int | None = None
+    fields: list[tuple[str, str, list[str]]] = field(default_factory=list)
+    date_format: str = "%Y-%m-%d"
+    columns: list[str] = field(default_factory=list)
+    values: list[str] = field(default_factory=list)
+    checklist: bool = False
+    radiolist: bool = False
+    print_column: str = "1"
+    hide_text: bool = False
+
+
+def parse_argv(argv: list[str], stdin: list[str] | None = None) -> DialogSpec:
+    """
+    Разбор команды zenity.
+
+    :param argv: Команда (первый элемент - имя утилиты).
+    :param stdin: Ячейки таблицы ``--list``, переданные через stdin.
+
+    :raise ValueError: Неподдерживаемый аргумент.
+
+    :return: Параметры окна.
+    """
+    spec = DialogSpec()
+    for arg in argv[1:]:
+        if not arg:
+            continue
+        if not arg.startswith("--"):
+            spec.values.append(arg)
+            continue
+        name, _, value = arg[2:].partition("=")
+        match name:
+            case mode if mode in MODES:
+                spec.mode = mode
+            case "title":
+                spec.title = value
+            case "text":
+                spec.text = MARKUP.sub("", value)
+            case "ok-label":
+                spec.ok_label = value
+            case "cancel-label":
+                spec.cancel_label = value
+            case "extra-button":
+                spec.extra_buttons.append(value)
+            case "width" | "height" | "timeout":
+                setattr(spec, name, int(value))
+            case "add-entry" | "add-password" | "add-calendar" | "add-combo" | "add-list":
+                spec.fields.append((name.removeprefix("add-"), value, []))
+            case "combo-values" | "list-values":
+                spec.fields[-1][2].extend(value.split(SEPARATOR))
+            case "forms-date-format":
+                spec.date_format = value
+            case "column":
+                spec.columns.append(value)
+            case "checklist" | "radiolist":
+                setattr(spec, name, True)
+            case "print-column":
+                spec.print_column = value
+            case "hide-text":
+                spec.hide_text = True
+            case "entry-text":
+                if value:
+                    spec.values.append(value)
+            case "editable" | "icon":
+                pass
+            case _:
+                raise ValueError(f"Неподдерживаемый аргумент zenity: --{name}")
+    if not spec.mode:
+        raise ValueError("Не указан режим окна zenity.")
+    if stdin:
+        spec.values.extend(stdin)
+    return spec
+
+
+class DialogServer:
+    """Окна запросов - ``Toplevel`` одного скрытого корневого окна, запросы читаются из stdin без потоков."""
+
+    def __init__(self) -> None:
+        self.root = tk.Tk()
+        self.root.withdraw()
+        self.windows: dict[int, tk.Toplevel] = {}
+        self._buffer = b""
+        self.root.createfilehandler(sys.stdin.fileno(), tk.READABLE, self.__on_stdin)
+
+    def run(self) -> None:
+        self.root.mainloop()
+
+    def __on_stdin(self, fd: int, _mask: int) -> None:
+        chunk = os.read(fd, 65536)
+        if not chunk:
+            self.root.quit()
+            return
+        *lines, self._buffer = (self._buffer + chunk).split(b"\n")
+        for line in lines:
+            if line.strip():
+                self.__handle(json.loads(line))
+
+    def __handle(self, request: dict) -> None:
+        request_id = request["id"]
+        if request.get("cancel"):
+            window = self.windows.get(request_id)
+            if window is not None:
+                self.__finish(request_id, ZENITY_CANCEL, "")
+            return
+        try:
+            spec = parse_argv(request["argv"], request.get("stdin"))
+        except (ValueError, IndexError) as e:
+            self.__reply(request_id, None, "", str(e))
+            return
+        self.__show(request_id, spec)
+
+    def __show(self, request_id: int, spec: DialogSpec) -> None:
+        window = tk.Toplevel(self.root)
+        self.windows[request_id] = window
+        window.title(spec.title)
+        if spec.width or spec.height:
+            window.geometry(f"{spec.width or 400}x{spec.height or 150}")
+        window.protocol("WM_DELETE_WINDOW", lambda: self.__finish(request_id, ZENITY_CANCEL, ""))
+        if spec.text:
+            ttk.Label(window, text=spec.text, wraplength=(spec.width or 400) - 20).pack(padx=10, pady=10, anchor="w")
+
+        body = ttk.Frame(window)
+        body.pack(fill="both", expand=True, padx=10)
+        collect = {
+            "forms": self.__forms, "list": self.__list, "entry": self.__entry,
+        }.get(spec.mode, lambda *_: lambda: "")(body, spec)
+
+        buttons = ttk.Frame(window)
+        buttons.pack(fill="x", padx=10, pady=10)
+        ttk.Button(
+            buttons, text=spec.ok_label, command=lambda: self.__finish(request_id, ZENITY_OK, collect())
+        ).pack(side="right")
+        if spec.mode not in ("info", "error"):
+            ttk.Button(
+                buttons, text=spec.cancel_label, command=lambda: self.__finish(request_id, ZENITY_CANCEL, "")
+            ).pack(side="right", padx=5)
+        for label in spec.extra_buttons:
+            ttk.Button(
+                buttons, text=label, command=lambda label=label: self.__finish(request_id, ZENITY_CANCEL, label)
+            ).pack(side="left")
+        if spec.timeout:
+            window.after(spec.timeout * 1000, lambda: self.__finish(request_id, ZENITY_TIMEOUT, ""))
+        window.lift()
+        window.focus_force()
+
+    @staticmethod
+    def __forms(body: ttk.Frame, spec: DialogSpec):
+        getters = []
+        for row, (kind, label, values) in enumerate(spec.fields):
+            ttk.Label(body, text=label).grid(row=row, column=0, sticky="w", pady=2)
+            if kind == "combo":
+                widget = ttk.Combobox(body, values=values, state="readonly")
+                if values:
+                    widget.current(0)
+                getters.append(widget.get)
+            elif kind == "list":
+                widget = tk.Listbox(body, height=min(len(values), 5) or 1, exportselection=False)
+                widget.insert("end", *values)
+                getters.append(lambda widget=widget: SEPARATOR.join(widget.get(i) for i in widget.curselection()))
+            else:
+                widget = ttk.Entry(body, show="*" if kind == "password" else "")
+                if kind == "calendar":
+                    widget.insert(0, date.today().strftime(spec.date_format))
+                getters.append(widget.get)
+            widget.grid(row=row, column=1, sticky="ew", pady=2)
+        body.columnconfigure(1, weight=1)
+        return lambda: SEPARATOR.join(getter() for getter in getters)
+
+    @staticmethod
+    def __list(body: ttk.Frame, spec: DialogSpec):
+        column_count = len(spec.columns) or 1
+        rows = [spec.values[i:i + column_count] for i in range(0, len(spec.values), column_count)]
+        # Первый столбец --checklist/--radiolist - переключатель, в окне он заменяется выделением строки.
+        shown = range(1 if spec.checklist or spec.radiolist else 0, column_count)
+        tree = ttk.Treeview(
+            body, columns=[str(i) for i in shown], show="headings",
+            selectmode="extended" if spec.checklist else "browse",
+        )
+        for i in shown:
+            tree.heading(str(i), text=spec.columns[i] if i < len(spec.columns) else "")
+        for index, row in enumerate(rows):
+            tree.insert("", "end", iid=str(index), values=[row[i] if i < len(row) else "" for i in shown])
+        scroll = ttk.Scrollbar(body, orient="vertical", command=tree.yview)
+        tree.configure(yscrollcommand=scroll.set)
+        tree.pack(side="left", fill="both", expand=True)
+        scroll.pack(side="right", fill="y")
+
+        def collect() -> str:
+            selected = [rows[int(iid)] for iid in tree.selection()]
+            if spec.print_column.upper() == "ALL":
+                return SEPARATOR.join(SEPARATOR.join(row) for row in selected)
+            column = int(spec.print_column) - 1
+            return SEPARATOR.join(row[column] for row in selected if column < len(row))
+
+        return collect
+
+    @staticmethod
+    def __entry(body: ttk.Frame, spec: DialogSpec):
+        if len(spec.values) > 1:
+            widget = ttk.Combobox(body, values=spec.values)
+            widget.current(0)
+        else:
+            widget = ttk.Entry(body, show="*" if spec.hide_text else "")
+            if spec.values:
+                widget.insert(0, spec.values[0])
+        widget.pack(fill="x")
+        widget.focus_set()
+        return widget.get
+
+    def __finish(self, request_id: int, code: int, out: str) -> None:
+        window = self.windows.pop(request_id, None)
+        if window is None:
+            return
+        window.destroy()
+        self.__reply(request_id, code, out)
+
+    @staticmethod
+    def __reply(request_id: int, code: int | None, out: str, error: str = "") -> None:
+        sys.stdout.write(json.dumps({"id": request_id, "code": code, "out": out, "error": error}) + "\n")
+        sys.stdout.flush()
+
+
+def main() -> None:
+    DialogServer().run()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,18 +1,24 @@
 from __future__ import annotations
 
 import asyncio as io
-from collections.abc import Callable
+import logging
+from collections import OrderedDict
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
 from functools import wraps
-from typing import Any
+from typing import Any, ClassVar
 
 from typing_extensions import TypeVar
 
 from exceptions.app import ApplicationException
-from exceptions.zenity import ArgsException
+from exceptions.zenity import ArgsException, UnsupportedDialogArgs
 from notification.base import BaseNotify, ProcessResult
+from notification.tk_dialog import TkDialogClient
 from property.constants import EXCEPTIONS, ZENITY
 from property.helpers import cust_join
 
+logger = logging.getLogger(__name__)
+
 T = TypeVar("T", bound=tuple)
 
 type FormsValue = str
@@ -20,11 +26,109 @@ type FormsValues = tuple[FormsValue, ...]
 type FormsFields = dict[str, FormsValues]
 
 
+class ZenityListBuilder:
+    """
+    Построитель таблицы для ``Zenity.throw_list_args``.
+        Строки добавляются за O(1), столбцы и поток ячеек строятся за O(rows).
+    """
+
+    def __init__(self, column_names: Iterable[str]) -> None:
+        """
+        :param column_names: Названия столбцов таблицы.
+        """
+        self.column_names: tuple[str, ...] = tuple(column_names)
+        self._rows: list[tuple[str, ...]] = []
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    @classmethod
+    def from_columns(cls, columns: FormsFields) -> ZenityListBuilder:
+        """
+        Создание построителя из таблицы формата ``{столбец: значения}``.
+
+        :param columns: Тело таблицы.
+
+        :return: Построитель таблицы.
+        """
+        builder = cls(columns)
+        builder._rows = list(zip(*columns.values()))
+        return builder
+
+    def add_row(self, *values: Any) -> None:
+        """
+        Добавление строки таблицы.
+
+        :param values: Значения ячеек (по одному на столбец).
+
+        :return: None.
+        """
+        if len(values) != len(self.column_names):
+            raise ArgsException(args=("columns",), msg=ZENITY["len_columns"])
+        self._rows.append(tuple(str(value) for value in values))
+
+    @property
+    def columns(self) -> FormsFields:
+        """Таблица в формате ``{столбец: значения}``."""
+        if not self._rows:
+            return {column_name: () for column_name in self.column_names}
+        return dict(zip(self.column_names, zip(*self._rows)))
+
+    def cells(self) -> Iterator[str]:
+        """Ячейки таблицы построчно (порядок аргументов/строк stdin zenity ``--list``)."""
+        for row in self._rows:
+            yield from row
+
+
+def _freeze(value: Any) -> Any:
+    """Приведение параметров окна к hashable виду для ключа кэша шаблонов (порядок словарей сохраняется)."""
+    if isinstance(value, dict):
+        return tuple((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+@dataclass(frozen=True, slots=True)
+class ZenityTemplate:
+    """
+    Скомпилированное окно zenity: неизменяемый префикс argv (утилита, режим, общие аргументы и аргументы режима)
+        и ячейки таблицы для stdin. При каждом показе к копии префикса добавляются только переменные аргументы.
+    """
+    argv: tuple[str, ...]
+    mode: str
+    stdin_cells: tuple[str, ...] | None = None
+
+    def render(self, **variable: Any) -> list[str]:
+        """
+        Сборка команды.
+
+        :param variable: Переменные аргументы из ``Zenity.ZENITY_ARGS`` (например ``text``, ``timeout``).
+
+        :return: Новый список аргументов команды.
+        """
+        argv = list(self.argv)
+        for kwarg, value in variable.items():
+            command = Zenity.ZENITY_ARGS.get(kwarg)
+            if not command:
+                raise AttributeError(EXCEPTIONS["zen_atr"].format(kwarg))
+            zen_cmd = command(value)
+            if isinstance(zen_cmd, str):
+                argv.append(zen_cmd)
+            else:
+                argv.extend(zen_cmd)
+        return argv
+
+
 class Zenity(BaseNotify):
     """Класс для реализации команд Zenity и простых уведомлений в терминале."""
     FORMS_FIELDS_NAME: dict[int, str] = {1: "combo", 2: "list"}
     _method_count_param = None
     ZENITY_CMD = "zenity"
+    LIST_STDIN_CELLS: int = 1000
+    TK_BACKEND: str = "tk"
     ZENITY_ARGS: dict[str, Callable] = {
         "text": lambda x: f"--text={x}",
         "title": lambda x: f"--title={x}",
@@ -42,6 +146,9 @@ class Zenity(BaseNotify):
         "calender": lambda cal_name: f"--add-calendar={cal_name}",
     }
 
+    TEMPLATE_CACHE_SIZE: int = 128
+    _TEMPLATES: ClassVar[OrderedDict[tuple, ZenityTemplate]] = OrderedDict()
+
     def __init__(self, title: str = None, extra_button: tuple[str, ...] | list[str] | set[str] | None = None,
                  ok_label: str = "ОК", cancel_label: str = "Отмена", width: int = None, height: int = None,
                  timeout: int = None) -> None:
@@ -68,6 +175,8 @@ class Zenity(BaseNotify):
         self.timeout = timeout
         self._method_count_param: dict[str, bool] = {}
         self.req_forms_fields: None | tuple[str, ...] = None
+        self._stdin_list: ZenityListBuilder | None = None
+        self._stdin_cells: tuple[str, ...] | None = None
 
         self._throw_general_args(
             zen_params={
@@ -104,6 +213,59 @@ class Zenity(BaseNotify):
 
         return wrapper
 
+    @classmethod
+    def template(cls, mode: str, general: dict[str, Any] | None = None, **mode_args: Any) -> ZenityTemplate:
+        """
+        Шаблон окна, скомпилированный один раз на набор параметров (кэш на ``TEMPLATE_CACHE_SIZE`` шаблонов).
+
+        :param mode: Режим окна (``info``, ``question``, ``error``, ``forms``, ``list``, ``entry``).
+        :param general: Общие параметры окна (аргументы ``Zenity.__init__``).
+        :param mode_args: Неизменные аргументы метода ``throw_<mode>_args``.
+            Если не переданы, в шаблон попадает только флаг режима, а текст передаётся в ``render``.
+
+        :return: Шаблон окна.
+        """
+        key = (cls, mode, _freeze(general), _freeze(mode_args))
+        template = cls._TEMPLATES.get(key)
+        if template is not None:
+            cls._TEMPLATES.move_to_end(key)
+            return template
+
+        zenity = cls(**(general or {}))
+        if mode_args:
+            getattr(zenity, f"throw_{mode}_args")(**mode_args)
+        else:
+            zenity._expression.insert(1, f"--{mode}")
+        template = ZenityTemplate(
+            argv=tuple(zenity._expression),
+            mode=mode,
+            stdin_cells=tuple(zenity.__stdin_cells()) if zenity._stdin_list is not None else None,
+        )
+        cls._TEMPLATES[key] = template
+        while len(cls._TEMPLATES) > cls.TEMPLATE_CACHE_SIZE:
+            cls._TEMPLATES.popitem(last=False)
+        return template
+
+    @classmethod
+    def from_template(cls, template: ZenityTemplate, **variable: Any) -> Zenity:
+        """
+        Окно по шаблону.
+
+        :param template: Шаблон окна (``Zenity.template``).
+        :param variable: Переменные аргументы (см. ``ZenityTemplate.render``).
+
+        :return: Окно, готовое к ``do_notify``. Методы ``throw_*_args`` для него уже недоступны.
+        """
+        zenity = cls.__new__(cls)
+        BaseNotify.__init__(zenity, cls.ZENITY_CMD)
+        zenity.title = zenity.width = zenity.height = zenity.timeout = None
+        zenity._method_count_param = {f"throw_{template.mode}_args": True}
+        zenity.req_forms_fields = None
+        zenity._stdin_list = None
+        zenity._stdin_cells = template.stdin_cells
+        zenity._expression = template.render(**variable)
+        return zenity
+
     @staticmethod
     def __validate_list_columns(columns: FormsFields) -> bool:
         if len(set(map(len, columns.values()))) > 1:
@@ -135,8 +297,7 @@ class Zenity(BaseNotify):
 
         :return None.
         """
-        insert_index = 1
-
+        general_args = []
         for kwarg in zen_params:
             command = self.ZENITY_ARGS.get(kwarg)
             if not command:
@@ -145,10 +306,12 @@ class Zenity(BaseNotify):
                 if zen_params[kwarg]:
                     zen_cmd = command(zen_params[kwarg])
                     if isinstance(zen_params[kwarg], (list, set, tuple)):
-                        for cmd in zen_cmd:
-                            self._expression.insert(insert_index, cmd)
+                        general_args.extend(zen_cmd)
                     else:
-                        self._expression.insert(insert_index, zen_cmd)
+                        general_args.append(zen_cmd)
+        # Общие аргументы - сразу после утилиты (и режима, если он уже задан) одной вставкой.
+        insert_index = 2 if self._method_count_param else 1
+        self._expression[insert_index:insert_index] = general_args
 
     def throw_icon(self, icon: str, do_global: bool = False) -> None:
         if do_global:
@@ -213,8 +376,9 @@ class Zenity(BaseNotify):
             self._expression.append(f"--forms-date-format={calender_format}")
 
     @__check_zen_param
-    def throw_list_args(self, columns: FormsFields, return_column_number: int = 0, checklist: bool = False,
-                        radiolist: bool = False, edit: bool = False, text: str = '') -> None:
+    def throw_list_args(self, columns: FormsFields | ZenityListBuilder, return_column_number: int = 0,
+                        checklist: bool = False, radiolist: bool = False, edit: bool = False, text: str = '',
+                        stdin: bool | None = None) -> None:
         """
 
         :param columns: Тело таблицы.
@@ -222,13 +386,19 @@ class Zenity(BaseNotify):
         :param checklist: Возможность выбрать все строки.
         :param radiolist: Возможность выбрать только одну строку.
         :param edit: Возможность редактировать поля таблицы.
+        :param stdin: Передавать ячейки через stdin, а не аргументами командной строки (не упираясь в ``ARG_MAX``).
+            По умолчанию - для таблиц более ``LIST_STDIN_CELLS`` ячеек.
 
         :return: Столбец таблицы под номером указанном в ``return_column_number`` или `все` столбцы выбранных строк(и).
         """
-
-        columns_values = tuple(columns.values())
-        table_column_count = len(columns_values[0])
-        row_count = len(columns_values)
+        if isinstance(columns, ZenityListBuilder):
+            builder = columns
+        else:
+            assert self.__validate_list_columns(columns), ZENITY["len_columns"]
+            builder = ZenityListBuilder.from_columns(columns)
+
+        row_count = len(builder.column_names)
+        table_column_count = len(builder)
         if radiolist and checklist:
             raise ArgsException(args=("checklist", "radiolist"))
         elif (checklist and row_count <= 1) or (radiolist and row_count <= 1):
@@ -245,8 +415,6 @@ class Zenity(BaseNotify):
                 ),
                 args=("columns",))
 
-        assert self.__validate_list_columns(columns), ZENITY["len_columns"]
-
         return_column_number = "ALL" if return_column_number <= 0 else str(return_column_number)
 
         expr = []
@@ -259,15 +427,14 @@ class Zenity(BaseNotify):
         self._expression.extend(expr)
         del expr
 
-        self._expression.extend([f"--column={column}" for column in columns])
+        self._expression.extend([f"--column={column}" for column in builder.column_names])
 
-        index = 0
-        while table_column_count:
-            for column in columns_values:
-                value = column[index]
-                self._expression.append(value)
-            index += 1
-            table_column_count -= 1
+        if stdin is None:
+            stdin = table_column_count * row_count > self.LIST_STDIN_CELLS
+        if stdin:
+            self._stdin_list = builder
+        else:
+            self._expression.extend(builder.cells())
         self._expression.append(self.ZENITY_ARGS["text"](text))
 
     @__check_zen_param
@@ -308,10 +475,31 @@ class Zenity(BaseNotify):
         self._expression.append(self.ZENITY_ARGS["text"](error_msg))
 
     async def do_notify(self, task_name: None | str = None, command: list[str] | None = None,
-                        communicate: bool = True, ignore_error: bool = False) -> ProcessResult:
+                        communicate: bool = True, ignore_error: bool = False,
+                        on_spawn: Callable[[], None] | None = None) -> ProcessResult:
+        """
+        Показ окна. С ``communicate`` и настройкой ``DIALOG_BACKEND=tk`` окно показывает постоянный процесс окон
+            на tkinter (``TkDialogClient``), а если он недоступен или не поддерживает аргументы окна - zenity.
+
+        :param on_spawn: Обработчик, вызываемый сразу после запуска zenity (передачи окна процессу окон).
+        """
+        use_stdin = not command and (self._stdin_list is not None or self._stdin_cells is not None)
+        if communicate and self.settings.dialog_backend == self.TK_BACKEND:
+            try:
+                return await TkDialogClient().run(
+                    command or self._expression, list(self.__stdin_cells()) if use_stdin else None, on_sent=on_spawn,
+                )
+            except (ConnectionError, UnsupportedDialogArgs) as e:
+                logger.info("Окно будет показано через zenity: %s", e)
         return await self.exec_subprocess(
             tsk=task_name if task_name else io.current_task(),
             cmd=command or self._expression,
             interplay=communicate,
             ignore_error=ignore_error,
+            stdin=self.__stdin_cells() if use_stdin else None,
+            on_spawn=(lambda _process_body: on_spawn()) if on_spawn is not None else None,
         )
+
+    def __stdin_cells(self) -> Iterator[str]:
+        cells = self._stdin_cells if self._stdin_list is None else self._stdin_list.cells()
+        return (cell.replace("\n", " ") for cell in cells)
@@ -11,13 +11,17 @@ class AppMenuAction(BaseEnum):
     conform: str = "подтвердить"
 
 
+TRANSFER_FORMATS: tuple[str, ...] = ("jsonl", "csv")  # Форматы файлов импорта/экспорта напоминаний.
 NOTIFICATIONS: dict[str, str] = {
-    "time_break": "Пора сделать перерыв для глаз!\nПрошло ({0}) мин. Время рабочей сессии (~{1} час.)"
+    "time_break": "Пора сделать перерыв для глаз!\nПрошло ({0}) мин. Время рабочей сессии (~{1} час.)",
+    "summary_title": "Напоминаний: {0}",
+    "summary_more": "…и ещё {0}",
 }
 EXCEPTIONS: dict[str, str] = {  # Ошибки.
     "wrong_expr": "Неверная формулировка выражения для выполнения!",
     "zen_atr": "Передан неверный атрибут ({0}) для исполнения Zenity!",
     "communicate": "Ошибка при выполнении подпроцесса <{0}>!\n Выражение для исполнения <[{expr}]>",
+    "timeout": "Подпроцесс не завершился за {0} сек. и был остановлен!\n Выражение для исполнения <[{expr}]>",
     "level_urg": "Указан неверный уровень отображения уведомления Notify - <{0}>. Доступные уровни <[{1}]>!",
     "zen_info": "Переданный неверный аргумент(ы) Zenity! Аргументы: <[{}]>!",
     "settings_file_exist": "Файл с настройками <{file_name}> был перемещён/удалён/переименован! "
@@ -49,19 +53,22 @@ ZENITY = {  # Поля и др. константы окон Zenity.
                 AppMenuAction.create.name,
                 AppMenuAction.show.name,
                 AppMenuAction.update.name,
-                AppMenuAction.delete.name
+                AppMenuAction.delete.name,
+                AppMenuAction.del_all.name,
             ),
             "Действие": (
                 AppMenuAction.create.capitalize(),
                 AppMenuAction.show.capitalize(),
                 AppMenuAction.update.capitalize(),
                 AppMenuAction.delete.capitalize(),
+                AppMenuAction.del_all.capitalize(),
             ),
             "Описание": (
                 "Создание нового напоминания",
                 "Просмотр всех созданных напоминаний",
                 "Обновление ваших напоминаний",
-                "Удаление уведомлений по фильтру и т.д."
+                "Удаление уведомлений по фильтру и т.д.",
+                "Удаление всех напоминаний и их уведомлений",
             ),
         }
     },
@@ -1,5 +1,6 @@
+import math
 from datetime import datetime, timedelta
-from typing import Any, Sequence
+from typing import Any, Iterable, Sequence
 
 from pynput.keyboard import Key, KeyCode
 from typing_extensions import TypeVar
@@ -15,6 +16,36 @@ def cust_join(iter_object: Sequence[str], separation: str = ", ") -> str | None:
     return f"{separation}".join(iter_object)
 
 
+def escape_like(value: str, escape: str = "\\") -> str:
+    """
+    Экранирование спецсимволов шаблона LIKE/ILIKE (``%``, ``_`` и символа экранирования).
+
+    :param value: Строка для поиска.
+    :param escape: Символ экранирования.
+
+    :return: Строка, которая в шаблоне совпадает только сама с собой.
+    """
+    return value.replace(escape, escape * 2).replace("%", f"{escape}%").replace("_", f"{escape}_")
+
+
+def percentiles(samples: Iterable[float], quantiles: Sequence[int] = (50, 95, 99)) -> dict[str, float]:
+    """
+    Перцентили выборки (метод ближайшего ранга).
+
+    :param samples: Значения.
+    :param quantiles: Перцентили (0-100).
+
+    :return: {"p50": .., "p95": ..}, для пустой выборки - пустой словарь.
+    """
+    ordered = sorted(samples)
+    if not ordered:
+        return {}
+    return {
+        f"p{quantile}": ordered[min(len(ordered) - 1, max(0, math.ceil(quantile / 100 * len(ordered)) - 1))]
+        for quantile in quantiles
+    }
+
+
 def is_iterable(obj: Any) -> bool:
     try:
         iter(obj)
@@ -0,0 +1,250 @@
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+import time
+from datetime import datetime
+
+from property.patterns import Singleton
+from property.settings import Settings, SettingsSnapshot
+
+
+class JsonFormatter(logging.Formatter):
+    """Запись лога - одна строка JSON: время, уровень, модуль, сообщение, задача asyncio и исключение."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "taskName", None):
+            entry["task"] = record.taskName
+        if record.threadName != "MainThread":
+            entry["thread"] = record.threadName
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class RotatingJsonFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Файл лога с ротацией по размеру (``maxBytes``) и по времени (``interval`` секунд).
+        Записи пишутся пачкой (``write_batch``) с одним ``flush`` на пачку.
+    """
+
+    def __init__(self, filename: str, max_bytes: int = 0, backup_count: int = 0, interval: float = 0) -> None:
+        """
+        :param filename: Путь к файлу.
+        :param max_bytes: Размер файла для ротации, 0 - без ротации по размеру.
+        :param backup_count: Количество хранимых старых файлов, 0 - без ротации.
+        :param interval: Период ротации (секунды), 0 - без ротации по времени.
+        """
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8", delay=True)
+        self.setFormatter(JsonFormatter())
+        self.interval = interval
+        self.rollover_at = time.time() + interval if interval else None
+
+    def write_batch(self, records: list[logging.LogRecord]) -> None:
+        """
+        Запись пачки записей (записи ниже уровня обработчика пропускаются).
+
+        :param records: Записи лога.
+
+        :return: None.
+        """
+        lines = [self.format(record) + self.terminator for record in records if record.levelno >= self.level]
+        if not lines:
+            return
+        with self.lock:
+            try:
+                for line in lines:
+                    if self.__should_rollover(line):
+                        self.doRollover()
+                    if self.stream is None:
+                        self.stream = self._open()
+                    self.stream.write(line)
+                self.stream.flush()
+            except OSError:
+                self.handleError(records[-1])
+
+    def __should_rollover(self, line: str) -> bool:
+        if self.backupCount <= 0:
+            return False
+        if self.rollover_at is not None and time.time() >= self.rollover_at:
+            self.rollover_at = time.time() + self.interval
+            return True
+        return bool(self.maxBytes) and self.stream is not None and self.stream.tell() + len(line) >= self.maxBytes
+
+
+class DropQueueHandler(logging.handlers.QueueHandler):
+    """
+    Передача записей в ограниченную очередь без блокировки вызывающего потока (event loop).
+        Записи не форматируются (это делает поток записи), при переполнении очереди запись отбрасывается
+        и учитывается в ``dropped``.
+    """
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped: int = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg, record.args = record.getMessage(), None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogWriter(threading.Thread):
+    """Фоновый поток записи: забирает из очереди всё накопленное (до ``BATCH_SIZE``) и пишет одной пачкой."""
+    BATCH_SIZE: int = 512
+    POLL_INTERVAL: float = 1
+
+    def __init__(self, log_queue: queue.Queue, handlers: list[logging.Handler], queue_handler: DropQueueHandler):
+        super().__init__(name=self.__class__.__name__, daemon=True)
+        self.queue = log_queue
+        self.handlers = handlers
+        self.queue_handler = queue_handler
+        self._reported_drops = 0
+
+    def run(self) -> None:
+        stopped = False
+        while not stopped:
+            try:
+                batch = [self.queue.get(timeout=self.POLL_INTERVAL)]
+            except queue.Empty:
+                batch = []
+            while len(batch) < self.BATCH_SIZE:
+                try:
+                    batch.append(self.queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                stopped = True
+                batch = [record for record in batch if record is not None]
+            self.__report_drops(batch)
+            if batch:
+                self.__write(batch)
+
+    def __report_drops(self, batch: list[logging.LogRecord]) -> None:
+        """Запись о потерянных при переполнении очереди записях."""
+        dropped = self.queue_handler.dropped
+        if dropped == self._reported_drops:
+            return
+        batch.append(logging.getLogger(__name__).makeRecord(
+            __name__, logging.WARNING, __file__, 0,
+            f"Очередь лога переполнена: отброшено записей - {dropped - self._reported_drops} (всего {dropped}).",
+            None, None,
+        ))
+        self._reported_drops = dropped
+
+    def __write(self, batch: list[logging.LogRecord]) -> None:
+        for handler in self.handlers:
+            if isinstance(handler, RotatingJsonFileHandler):
+                handler.write_batch(batch)
+                continue
+            for record in batch:
+                if record.levelno >= handler.level:
+                    handler.handle(record)
+
+
+class AppLogger(Singleton):
+    """
+    Логирование приложения: модули пишут через ``logging.getLogger(__name__)``, корневой логгер передаёт записи
+        в ограниченную очередь (``DropQueueHandler``), а поток ``LogWriter`` пачками пишет JSON строки
+        в `LOG_NAME` (все записи) и `ERROR_LOG_NAME` (ERROR и выше). В режиме отладки записи дублируются в stderr.
+        Уровни задаются настройками ``LOG_LEVEL`` и ``LOG_LEVELS`` (по модулям) и применяются без перезапуска.
+    """
+    QUEUE_SIZE: int = 10000
+    CONSOLE_FORMAT: str = "%(asctime)s %(levelname)s %(name)s: %(message)s"
+
+    def __init__(self) -> None:
+        if hasattr(self, "settings"):
+            return
+        self.settings = Settings()
+        self.queue_handler: DropQueueHandler | None = None
+        self._writer: LogWriter | None = None
+        self._module_loggers: set[str] = set()
+
+    @property
+    def dropped(self) -> int:
+        """Записи, отброшенные при переполнении очереди."""
+        return self.queue_handler.dropped if self.queue_handler is not None else 0
+
+    def start(self) -> None:
+        """Замена обработчиков корневого логгера очередью и запуск потока записи."""
+        if self._writer is not None:
+            return
+        handlers: list[logging.Handler] = [
+            self.__file_handler(self.settings.dir_log_name, logging.NOTSET),
+            self.__file_handler(self.settings.dir_error_name, logging.ERROR),
+        ]
+        if self.settings.debug:
+            console = logging.StreamHandler(sys.stderr)
+            console.setFormatter(logging.Formatter(self.CONSOLE_FORMAT))
+            handlers.append(console)
+
+        log_queue: queue.Queue = queue.Queue(self.QUEUE_SIZE)
+        self.queue_handler = DropQueueHandler(log_queue)
+        root = logging.getLogger()
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+        root.addHandler(self.queue_handler)
+        self.apply_levels()
+
+        self._writer = LogWriter(log_queue, handlers, self.queue_handler)
+        self._writer.start()
+
+    def stop(self, timeout: float = 5) -> None:
+        """Запись накопленных записей и остановка потока записи."""
+        if self._writer is None:
+            return
+        logging.getLogger().removeHandler(self.queue_handler)
+        try:
+            self.queue_handler.queue.put(None, timeout=timeout)
+        except queue.Full:
+            pass
+        self._writer.join(timeout)
+        for handler in self._writer.handlers:
+            handler.close()
+        self._writer = None
+
+    def apply_levels(self) -> None:
+        """Применение уровней логирования корневого логгера и модулей из настроек."""
+        logging.getLogger().setLevel(self.settings.log_level)
+        levels = self.settings.log_levels
+        for name in self._module_loggers - levels.keys():
+            logging.getLogger(name).setLevel(logging.NOTSET)
+        for name, level in levels.items():
+            logging.getLogger(name).setLevel(level)
+        self._module_loggers = set(levels)
+
+    def on_settings_changed(self, old: SettingsSnapshot | None, new: SettingsSnapshot) -> None:
+        """Применение новых уровней (подписчик ``Settings.subscribe``). Файлы лога меняются после перезапуска."""
+        if new.changed(old, "APP", "LOG_LEVEL", "LOG_LEVELS"):
+            self.apply_levels()
+
+    def __file_handler(self, path: str, level: int) -> RotatingJsonFileHandler:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        handler = RotatingJsonFileHandler(
+            path,
+            max_bytes=self.settings.log_max_bytes,
+            backup_count=self.settings.log_backups,
+            interval=self.settings.log_rotate_interval,
+        )
+        handler.setLevel(level)
+        return handler
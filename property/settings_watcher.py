@@ -0,0 +1,141 @@
+import asyncio as io
+import configparser
+import ctypes
+import ctypes.util
+import logging
+import os
+import struct
+from typing import Callable
+
+from property.settings import Settings
+
+logger = logging.getLogger(__name__)
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = os.O_CLOEXEC
+EVENT_HEADER = struct.Struct("iIII")
+
+
+class SettingsWatcher:
+    """
+    Перечитывание `settings.ini` при изменении файла без перезапуска приложения.
+        Изменения отслеживаются через inotify (ctypes) на директории файла: редакторы часто сохраняют файл
+        через переименование временного файла, и наблюдение за самим файлом при этом теряется.
+        Дескриптор inotify читается в event loop (``loop.add_reader``), без потоков.
+        Серия событий одного сохранения объединяется за ``DEBOUNCE`` секунд.
+        Без inotify (не Linux) время изменения файла проверяется раз в ``POLL_INTERVAL`` секунд.
+    """
+    DEBOUNCE: float = 0.2
+    POLL_INTERVAL: float = 5
+
+    def __init__(self, path: str | None = None) -> None:
+        """
+        :param path: Путь к файлу настроек (по умолчанию ``Settings.SETTINGS_PATH``).
+        """
+        self.path = os.path.abspath(path or Settings.SETTINGS_PATH)
+        self.reloads: int = 0
+        self._loop: io.AbstractEventLoop | None = None
+        self._fd: int | None = None
+        self._timer: io.TimerHandle | None = None
+        self._mtime: float | None = None
+
+    async def start(self) -> None:
+        """Запуск наблюдения за файлом настроек."""
+        self._loop = io.get_running_loop()
+        self._fd = self.__inotify_watch(os.path.dirname(self.path))
+        if self._fd is not None:
+            self._loop.add_reader(self._fd, self.__on_events)
+        else:
+            self._mtime = self.__get_mtime()
+            self.__schedule(self.POLL_INTERVAL, self.__poll)
+
+    def stop(self) -> None:
+        """Остановка наблюдения."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._fd is not None:
+            self._loop.remove_reader(self._fd)
+            os.close(self._fd)
+            self._fd = None
+
+    def reload(self) -> bool:
+        """
+        Перечитывание файла настроек. При ошибке остаются прежние настройки.
+
+        :return: Были ли заменены настройки.
+        """
+        try:
+            replaced = Settings.reload()
+        except (OSError, configparser.Error, KeyError) as e:
+            logger.error("Настройки %s не применены: %r", self.path, e)
+            return False
+        if replaced:
+            self.reloads += 1
+            logger.info("Настройки %s перечитаны (версия %s).", self.path, Settings().snapshot.version)
+        return replaced
+
+    @staticmethod
+    def __inotify_watch(directory: str) -> int | None:
+        """
+        Создание дескриптора inotify на изменение файлов директории.
+
+        :param directory: Директория файла настроек.
+
+        :return: Дескриптор или None, если inotify недоступен.
+        """
+        libc_name = ctypes.util.find_library("c")
+        if libc_name is None:
+            return None
+        libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(libc, "inotify_init1"):
+            return None
+        fd = libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if fd < 0:
+            return None
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+        if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+
+    def __on_events(self) -> None:
+        """Разбор событий inotify: перечитывание откладывается, пока файл сохраняется."""
+        try:
+            data = os.read(self._fd, 4096)
+        except BlockingIOError:
+            return
+        file_name = os.fsencode(os.path.basename(self.path))
+        offset = 0
+        while offset + EVENT_HEADER.size <= len(data):
+            _wd, _mask, _cookie, name_length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + name_length].rstrip(b"\0")
+            offset += name_length
+            if name == file_name:
+                self.__schedule(self.DEBOUNCE, self.reload)
+
+    def __poll(self) -> None:
+        mtime = self.__get_mtime()
+        if mtime != self._mtime:
+            self._mtime = mtime
+            self.reload()
+        self.__schedule(self.POLL_INTERVAL, self.__poll)
+
+    def __get_mtime(self) -> float | None:
+        try:
+            return os.stat(self.path).st_mtime
+        except OSError:
+            return None
+
+    def __schedule(self, delay: float, callback: Callable[[], None]) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = self._loop.call_later(delay, self.__fire, callback)
+
+    def __fire(self, callback: Callable[[], None]) -> None:
+        self._timer = None
+        callback()
@@ -0,0 +1,85 @@
+import importlib.util
+import os
+import sys
+import time
+from types import ModuleType
+
+
+def lazy_import(name: str) -> ModuleType:
+    """
+    Отложенный импорт модуля: модуль исполняется при первом обращении к его атрибуту.
+        Так тяжёлые зависимости (SQLAlchemy, motor, asyncpg) не загружаются до первого использования.
+
+    :param name: Полное имя модуля.
+
+    :return: Модуль (уже загруженный или отложенный).
+    """
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        raise ModuleNotFoundError(f"No module named {name!r}", name=name)
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_module(module: ModuleType) -> ModuleType:
+    """Принудительная загрузка отложенного модуля (``lazy_import``)."""
+    getattr(module, "__dict__")
+    return module
+
+
+def process_age() -> float | None:
+    """Время (секунды) с запуска процесса по `/proc`, включая запуск интерпретатора. None - вне Linux."""
+    try:
+        with open("/proc/self/stat") as stat, open("/proc/uptime") as uptime:
+            start_ticks = int(stat.read().rsplit(")", 1)[1].split()[19])
+            return float(uptime.read().split()[0]) - start_ticks / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class StartupProfile:
+    """Замер длительности фаз запуска приложения (ключ ``--startup-profile``)."""
+
+    def __init__(self, enabled: bool = False, started: float | None = None) -> None:
+        """
+        :param enabled: Выводить отчёт.
+        :param started: Начало отсчёта (``time.perf_counter``), по умолчанию - создание профиля.
+        """
+        self.enabled = enabled
+        self.started = time.perf_counter() if started is None else started
+        self.phases: list[tuple[str, float, float]] = []
+        self._last = self.started
+
+    def mark(self, phase: str, at: float | None = None) -> None:
+        """
+        Завершение фазы: длительность считается от конца предыдущей.
+
+        :param phase: Название фазы.
+        :param at: Время окончания фазы (``time.perf_counter``), по умолчанию - текущее.
+
+        :return: None.
+        """
+        now = time.perf_counter() if at is None else at
+        self.phases.append((phase, now - self._last, now - self.started))
+        self._last = now
+
+    def report(self) -> None:
+        """Вывод отчёта (если профиль включён)."""
+        if not self.enabled:
+            return
+        # Запуск интерпретатора до начала отсчёта (точность /proc - 10 мс).
+        age = process_age()
+        offset = age - (time.perf_counter() - self.started) if age is not None else None
+        lines = [f"{"фаза":<32} {"длительность":>12} {"от начала":>12} {"от запуска процесса":>20}"]
+        for name, duration, since_start in self.phases:
+            since_process = f"{(since_start + offset) * 1000:.1f} мс" if offset is not None else "-"
+            lines.append(
+                f"{name:<32} {duration * 1000:>9.1f} мс {since_start * 1000:>9.1f} мс {since_process:>20}"
+            )
+        print("Профиль запуска:", *lines, sep="\n\t")
@@ -0,0 +1,163 @@
+import asyncio as io
+import logging
+import time
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, Coroutine, Iterable
+
+logger = logging.getLogger(__name__)
+
+type ActionHandler = Callable[[list[dict]], Coroutine[Any, Any, None]]
+
+
+@dataclass(slots=True)
+class TokenBucket:
+    """Ограничение частоты: ``rate`` токенов в секунду, но не более ``capacity`` подряд."""
+    rate: float
+    capacity: float
+    tokens: float = field(init=False)
+    updated: float = field(init=False, default_factory=time.monotonic)
+
+    def __post_init__(self) -> None:
+        self.tokens = self.capacity
+
+    def refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_take(self) -> bool:
+        """
+        Списание токена.
+
+        :return: Был ли доступен токен.
+        """
+        self.refill()
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+    def delay(self) -> float:
+        """Время (секунды) до появления следующего токена."""
+        self.refill()
+        return max(1 - self.tokens, 0) / self.rate if self.rate else float("inf")
+
+
+@dataclass(slots=True)
+class DispatchStats:
+    """Счётчики диспетчера: принятые действия, запуски обработчиков и отложенные ограничением частоты запуски."""
+    submitted: int = 0
+    invocations: int = 0
+    deferred: int = 0
+    unknown: int = 0
+
+    @property
+    def coalesced(self) -> int:
+        """Действия, объединённые с другими в один запуск обработчика."""
+        return self.submitted - self.invocations
+
+
+class NotificationDispatcher:
+    """
+    Этап исполнения сработавших уведомлений между планировщиком и окнами/браузером.
+        Уведомления, поступившие в пределах ``window`` секунд, группируются по действию,
+        и обработчик каждого действия вызывается один раз на всю группу.
+        Частота вызовов каждого обработчика ограничена ``TokenBucket``: если токена нет,
+        группа не теряется, а ждёт токена и дополняется уведомлениями, пришедшими за это время.
+    """
+
+    def __init__(self, handlers: dict[str, ActionHandler], window: float = 0, rate: float = 0, burst: int = 1) -> None:
+        """
+        :param handlers: Обработчики групп уведомлений по имени действия (`action` тела уведомления).
+        :param window: Окно объединения (секунды), 0 - объединяются только уведомления одного срабатывания.
+        :param rate: Допустимая частота вызовов обработчика одного действия (в секунду), 0 - без ограничения.
+        :param burst: Количество вызовов подряд до включения ограничения частоты.
+        """
+        self._handlers = handlers
+        self.configure(window, rate, burst)
+        self._pending: dict[str, list[dict]] = {action: [] for action in handlers}
+        self._timer: io.TimerHandle | None = None
+        self._tasks: set[io.Task] = set()
+        self.stats = DispatchStats()
+
+    def __len__(self) -> int:
+        return sum(map(len, self._pending.values()))
+
+    def configure(self, window: float = 0, rate: float = 0, burst: int = 1) -> None:
+        """
+        Изменение окна объединения и ограничения частоты. Накопленные уведомления сохраняются.
+
+        :param window: Окно объединения (секунды).
+        :param rate: Допустимая частота вызовов обработчика одного действия (в секунду), 0 - без ограничения.
+        :param burst: Количество вызовов подряд до включения ограничения частоты.
+
+        :return: None.
+        """
+        self.window = window
+        self._buckets: dict[str, TokenBucket | None] = {
+            action: TokenBucket(rate=rate, capacity=max(burst, 1)) if rate else None for action in self._handlers
+        }
+
+    def submit(self, notices: Iterable[dict]) -> None:
+        """
+        Постановка уведомлений в очередь. Обработчики вызываются не раньше чем через ``window`` секунд.
+
+        :param notices: Тела уведомлений (поле `action` - список действий).
+
+        :return: None.
+        """
+        for notice in notices:
+            for action in dict.fromkeys(notice.get("action") or ()):
+                pending = self._pending.get(action)
+                if pending is None:
+                    self.stats.unknown += 1
+                    continue
+                pending.append(notice)
+                self.stats.submitted += 1
+        if len(self):
+            self.__arm(self.window)
+
+    def stop(self) -> None:
+        """Остановка таймера. Неотправленные уведомления остаются в очереди."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _on_timer(self) -> None:
+        """Вызов обработчиков всех накопленных групп, для которых есть токен."""
+        self._timer = None
+        retry_in = None
+        for action, notices in self._pending.items():
+            if not notices:
+                continue
+            bucket = self._buckets[action]
+            if bucket is not None and not bucket.try_take():
+                self.stats.deferred += 1
+                retry_in = min(bucket.delay(), retry_in if retry_in is not None else float("inf"))
+                continue
+            self._pending[action] = []
+            self.stats.invocations += 1
+            self.__create_task(self._handlers[action](notices), action)
+        if retry_in is not None:
+            self.__arm(retry_in)
+
+    def __arm(self, delay: float) -> None:
+        """Взвод таймера, если он ещё не взведён на более ранний срок."""
+        loop = io.get_running_loop()
+        fire_at = loop.time() + delay
+        if self._timer is not None:
+            if self._timer.when() <= fire_at:
+                return
+            self._timer.cancel()
+        self._timer = loop.call_at(fire_at, self._on_timer)
+
+    def __create_task(self, coroutine: Coroutine, action: str) -> None:
+        task = io.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(partial(self.__task_done, action=action))
+
+    def __task_done(self, task: io.Task, action: str) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Ошибка исполнения действия `%s`: %r", action, task.exception(), exc_info=task.exception())
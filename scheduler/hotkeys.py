@@ -0,0 +1,183 @@
+import asyncio as io
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, ClassVar, Coroutine
+
+from pynput.keyboard import GlobalHotKeys, HotKey, Key
+
+from property.helpers import percentiles
+
+logger = logging.getLogger(__name__)
+
+type HotkeyHandler = Callable[[], Coroutine[Any, Any, None]]
+
+
+@dataclass(slots=True)
+class HotkeyStats:
+    """
+    Статистика горячих клавиш: нажатия, открытия, объединённые повторы, подготовки
+        и последние ``LATENCY_SAMPLES`` задержек от нажатия до показа окна (секунды).
+    """
+    pressed: int = 0
+    handled: int = 0
+    coalesced: int = 0
+    prewarmed: int = 0
+    latency: deque[float] = field(default_factory=lambda: deque(maxlen=HotkeyStats.LATENCY_SAMPLES))
+
+    LATENCY_SAMPLES: ClassVar[int] = 256
+
+    def summary(self) -> dict[str, int | dict[str, float]]:
+        """
+        Сводка статистики.
+
+        :return: Счётчики и перцентили задержки нажатие -> окно (мс).
+        """
+        return {
+            "pressed": self.pressed, "handled": self.handled, "coalesced": self.coalesced,
+            "prewarmed": self.prewarmed,
+            "latency_ms": {name: round(value * 1000, 1) for name, value in percentiles(self.latency).items()},
+        }
+
+
+class PrewarmHotKeys(GlobalHotKeys):
+    """
+    ``GlobalHotKeys``, который дополнительно сообщает о нажатии первого модификатора сочетаний
+        (``on_modifier`` вызывается в потоке pynput), пока остальные клавиши сочетания ещё не нажаты.
+    """
+
+    def __init__(self, hotkeys: dict[str, Callable[[], None]], on_modifier: Callable[[], None]) -> None:
+        """
+        :param hotkeys: Обработчики по сочетаниям клавиш (формат ``HotKey.parse``).
+        :param on_modifier: Обработчик нажатия модификатора, когда другие модификаторы сочетаний не нажаты.
+        """
+        self._modifiers = {
+            key for combination in hotkeys for key in HotKey.parse(combination) if isinstance(key, Key)
+        }
+        self._pressed_modifiers: set[Key] = set()
+        self._on_modifier = on_modifier
+        super().__init__(hotkeys)
+
+    def _on_press(self, key, *args) -> None:
+        canonical = self.canonical(key)
+        if canonical in self._modifiers:
+            if not self._pressed_modifiers:
+                self._on_modifier()
+            self._pressed_modifiers.add(canonical)
+        super()._on_press(key, *args)
+
+    def _on_release(self, key, *args) -> None:
+        self._pressed_modifiers.discard(self.canonical(key))
+        super()._on_release(key, *args)
+
+
+class HotkeyPipeline:
+    """
+    Обработка горячих клавиш в event loop.
+        Нажатия приходят из потока pynput (``trigger`` через ``call_soon_threadsafe``) и не копятся в очереди:
+        нажатие в пределах ``debounce`` секунд от предыдущего или пока обработчик ещё работает (открыто меню)
+        объединяется с ним. Нажатие первого модификатора (``prewarm``) заранее запускает подготовку
+        (соединения бд, справочники), но не чаще раза в ``prewarm_interval`` секунд.
+        Задержка от нажатия до показа первого окна (``visible``) попадает в ``stats``.
+    """
+
+    def __init__(self, handler: HotkeyHandler, prewarm: HotkeyHandler | None = None,
+                 debounce: float = 0.5, prewarm_interval: float = 60) -> None:
+        """
+        :param handler: Корутина обработки нажатия (открытие меню).
+        :param prewarm: Корутина подготовки к обработке нажатия.
+        :param debounce: Окно объединения повторных нажатий (секунды).
+        :param prewarm_interval: Минимальный интервал между подготовками (секунды).
+        """
+        self._handler = handler
+        self._prewarm = prewarm
+        self.debounce = debounce
+        self.prewarm_interval = prewarm_interval
+        self.stats = HotkeyStats()
+        self._wakeup = io.Event()
+        self._pending: float | None = None
+        self._pressed_at: float | None = None
+        self._busy = False
+        self._stopped = False
+        self._last_trigger = float("-inf")
+        self._prewarmed_at = float("-inf")
+        self._prewarm_task: io.Task | None = None
+
+    def listener(self, combination: str, stop_combination: str) -> PrewarmHotKeys:
+        """
+        Создание (не запуск) слушателя клавиатуры, передающего нажатия в текущий event loop.
+
+        :param combination: Сочетание клавиш обработчика.
+        :param stop_combination: Сочетание клавиш остановки ``run``.
+
+        :return: Слушатель pynput.
+        """
+        loop = io.get_running_loop()
+
+        def on_trigger() -> None:
+            loop.call_soon_threadsafe(self.trigger, time.perf_counter())
+
+        return PrewarmHotKeys(
+            {combination: on_trigger, stop_combination: lambda: loop.call_soon_threadsafe(self.stop)},
+            on_modifier=lambda: loop.call_soon_threadsafe(self.prewarm),
+        )
+
+    def trigger(self, pressed_at: float | None = None) -> None:
+        """
+        Нажатие сочетания клавиш.
+
+        :param pressed_at: Время нажатия (``time.perf_counter``), по умолчанию - текущее.
+
+        :return: None.
+        """
+        pressed_at = time.perf_counter() if pressed_at is None else pressed_at
+        self.stats.pressed += 1
+        if self._busy or self._pending is not None or pressed_at - self._last_trigger < self.debounce:
+            self.stats.coalesced += 1
+            return
+        self._last_trigger = self._pending = pressed_at
+        self._wakeup.set()
+
+    def prewarm(self) -> None:
+        """Запуск подготовки в фоне, если она не выполнялась последние ``prewarm_interval`` секунд."""
+        now = time.monotonic()
+        if self._prewarm is None or self._prewarm_task is not None or now - self._prewarmed_at < self.prewarm_interval:
+            return
+        self._prewarmed_at = now
+        self.stats.prewarmed += 1
+        self._prewarm_task = io.create_task(self._prewarm())
+        self._prewarm_task.add_done_callback(self.__prewarm_done)
+
+    def visible(self) -> None:
+        """Окно обработчика показано: учёт задержки от нажатия (только первого окна после нажатия)."""
+        if self._pressed_at is None:
+            return
+        self.stats.latency.append(time.perf_counter() - self._pressed_at)
+        self._pressed_at = None
+
+    def stop(self) -> None:
+        """Остановка ``run`` после завершения текущего обработчика."""
+        self._stopped = True
+        self._wakeup.set()
+
+    async def run(self) -> None:
+        """Обработка нажатий до ``stop``. Исключения обработчика прерывают цикл."""
+        while not self._stopped:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            if self._stopped or self._pending is None:
+                continue
+            self._pressed_at, self._pending = self._pending, None
+            self._busy = True
+            try:
+                self.stats.handled += 1
+                await self._handler()
+            finally:
+                self._busy = False
+                self._pressed_at = None
+
+    def __prewarm_done(self, task: io.Task) -> None:
+        self._prewarm_task = None
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning("Ошибка подготовки к открытию меню: %r", task.exception())
@@ -0,0 +1,122 @@
+import asyncio as io
+import json
+import logging
+import uuid
+from datetime import datetime
+
+import asyncpg
+from sqlalchemy import make_url
+from sqlalchemy.exc import SQLAlchemyError
+
+from property.settings import DataBaseSettings, SettingsSnapshot
+from scheduler.scheduler import ReminderScheduler, ScheduledReminder
+
+logger = logging.getLogger(__name__)
+
+
+class ReminderChangesListener:
+    """
+    Применение изменений таблицы `reminder` к расписанию через LISTEN/NOTIFY.
+        Изменения приходят от триггера ``reminder_notify_trigger`` (docker-init-db/postgres/6.*).
+        После каждого (пере)подключения выполняется полная синхронизация расписания,
+        т.к. уведомления, отправленные пока соединения не было, теряются.
+    """
+    CHANNEL: str = "reminder_changes"
+    KEEPALIVE: float = 60
+    RECONNECT_DELAY: tuple[float, float] = (1, 60)
+    CONNECTION_OPTIONS: tuple[str, ...] = ("DB_NAME", "DB_USER", "DB_PASSWORD", "DB_HOST", "DB_PORT")
+
+    def __init__(self, scheduler: ReminderScheduler, url: str | None = None) -> None:
+        """
+        :param scheduler: Расписание, к которому применяются изменения.
+        :param url: Ссылка для подключения к бд (по умолчанию из `settings.ini`).
+        """
+        self._own_url = url is None
+        if url is None:
+            url = DataBaseSettings().get_postgres_url
+        self.scheduler = scheduler
+        self._dsn = self.__make_dsn(url)
+        self._connection: asyncpg.Connection | None = None
+        self._stopped = False
+
+    async def run(self) -> None:
+        """
+        Прослушивание канала с переподключением и полной синхронизацией после обрыва.
+            Ошибка синхронизации (чтение напоминаний через SQLAlchemy) тоже приводит к переподключению.
+        """
+        delay = self.RECONNECT_DELAY[0]
+        while not self._stopped:
+            try:
+                await self.__listen()
+                delay = self.RECONNECT_DELAY[0]
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError, io.TimeoutError, SQLAlchemyError) as e:
+                logger.warning("Соединение LISTEN %s потеряно: %r. Повтор через %s сек.", self.CHANNEL, e, delay)
+                await io.sleep(delay)
+                delay = min(delay * 2, self.RECONNECT_DELAY[1])
+            finally:
+                await self.__close()
+
+    async def stop(self) -> None:
+        """Остановка прослушивания."""
+        self._stopped = True
+        await self.__close()
+
+    def on_settings_changed(self, old: SettingsSnapshot | None, new: SettingsSnapshot) -> None:
+        """
+        Переподключение к новой бд (подписчик ``Settings.subscribe``).
+            После подключения расписание полностью синхронизируется с новой бд.
+        """
+        if not self._own_url or not new.changed(old, "DB", *self.CONNECTION_OPTIONS):
+            return
+        self._dsn = self.__make_dsn(DataBaseSettings().get_postgres_url)
+        if self._connection is not None and not self._connection.is_closed():
+            self._connection.terminate()
+
+    @staticmethod
+    def __make_dsn(url: str) -> str:
+        return make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+    async def __listen(self) -> None:
+        """Одна сессия прослушивания: подключение, LISTEN, полная синхронизация, ожидание обрыва."""
+        terminated = io.Event()
+        dsn = self._dsn
+        self._connection = await asyncpg.connect(dsn)
+        self._connection.add_termination_listener(lambda _: terminated.set())
+        await self._connection.add_listener(self.CHANNEL, self._on_notify)
+        await self.scheduler.resync()
+
+        while not self._stopped and not terminated.is_set():
+            try:
+                await io.wait_for(terminated.wait(), timeout=self.KEEPALIVE)
+            except io.TimeoutError:
+                await self._connection.execute("SELECT 1", timeout=self.KEEPALIVE)
+
+        if not self._stopped and self._dsn == dsn:
+            raise ConnectionResetError("Соединение закрыто сервером")
+
+    async def __close(self) -> None:
+        if self._connection is not None and not self._connection.is_closed():
+            await self._connection.close(timeout=5)
+        self._connection = None
+
+    def _on_notify(self, _connection: asyncpg.Connection, _pid: int, _channel: str, payload: str) -> None:
+        """
+        Применение одного изменения к расписанию.
+
+        :param payload: JSON (uuid, op, fire_at, status, mongo_uuid, repeat_name, repeat_count).
+
+        :return: None.
+        """
+        change = json.loads(payload)
+        reminder_uuid = uuid.UUID(change["uuid"])
+        if change["op"] == "DELETE" or change["status"]:
+            self.scheduler.cancel(reminder_uuid)
+            return
+
+        reminder = ScheduledReminder.from_row(
+            reminder_uuid, change["mongo_uuid"], datetime.fromisoformat(change["fire_at"]),
+            change["repeat_name"], change["repeat_count"],
+        )
+        if reminder is None or reminder.on_start:
+            return
+        self.scheduler.add(reminder)
@@ -0,0 +1,294 @@
+import asyncio as io
+import heapq
+import itertools
+import logging
+import time
+import uuid
+from dataclasses import dataclass, field, replace
+from functools import partial
+from datetime import datetime, timedelta
+from typing import Callable, Coroutine, Iterable, Any
+
+logger = logging.getLogger(__name__)
+
+type DispatchCallback = Callable[[list[ScheduledReminder]], Coroutine[Any, Any, None]]
+type LoaderCallback = Callable[[datetime | None], Coroutine[Any, Any, Iterable[ScheduledReminder | None]]]
+type HeapEntry = tuple[float, int, ScheduledReminder]
+
+
+@dataclass(slots=True)
+class ScheduledReminder:
+    """Запись расписания напоминания."""
+    REPEAT_ON_START = "on_start"
+    REPEAT_ON_OFF = "on_off"
+
+    uuid: uuid.UUID
+    mongo_uuid: str
+    fire_at: datetime
+    repeat_days: int | None = None
+    on_start: bool = False
+    cancelled: bool = False
+    fire_ts: float = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.fire_ts = self.fire_at.timestamp()
+
+    @classmethod
+    def from_row(cls, reminder_uuid: uuid.UUID, mongo_uuid: str, fire_at: datetime,
+                 repeat_name: str | None = None, repeat_count: int | None = None) -> "ScheduledReminder | None":
+        """
+        Создание записи расписания из строки таблицы `reminder`.
+
+        :param reminder_uuid: ID напоминания.
+        :param mongo_uuid: Ссылка на тело уведомления.
+        :param fire_at: Дата и время исполнения.
+        :param repeat_name: Название периода повторений.
+        :param repeat_count: Период повторений (дни).
+
+        :return: Запись расписания или None, если напоминание не планируется по времени (``on_off``).
+        """
+        if repeat_name == cls.REPEAT_ON_OFF:
+            return None
+        on_start = repeat_name == cls.REPEAT_ON_START
+        return cls(
+            uuid=reminder_uuid,
+            mongo_uuid=mongo_uuid,
+            fire_at=datetime.now() if on_start else fire_at,
+            repeat_days=repeat_count,
+            on_start=on_start,
+        )
+
+    def next_fire_at(self, now: datetime | None = None) -> datetime | None:
+        """
+        Следующее время срабатывания повторяющегося напоминания.
+
+        :param now: Время относительно которого ищется следующее срабатывание.
+
+        :return: Ближайшее время в будущем или None для неповторяющихся напоминаний.
+        """
+        if not self.repeat_days:
+            return None
+        if now is None:
+            now = datetime.now()
+        period = timedelta(days=self.repeat_days)
+        skipped = max(int((now - self.fire_at) // period), 0) + 1
+        return self.fire_at + skipped * period
+
+    def reschedule(self, fire_at: datetime) -> "ScheduledReminder":
+        """Копия записи с новым временем срабатывания."""
+        return replace(self, fire_at=fire_at, cancelled=False)
+
+
+class ReminderScheduler:
+    """
+    Планировщик напоминаний на min-heap по времени срабатывания.
+        Между срабатываниями event loop не просыпается: таймер ``loop.call_at`` взводится только на ближайшую запись.
+        Отмена ленивая - запись помечается и выбрасывается при достижении вершины кучи.
+        При заданном ``horizon`` в памяти держатся только записи ближайших ``horizon`` секунд,
+        по достижении горизонта расписание перезагружается.
+        Напоминания ``on_start`` не отмечаются выполненными в бд и загружаются при каждой синхронизации,
+        поэтому срабатывают один раз за запуск процесса: сработавшие запоминаются в ``_started``.
+        Если обработка сработавших записей завершилась ошибкой (бд недоступна), они возвращаются в расписание
+        через ``DISPATCH_RETRY`` секунд (уведомление может быть показано повторно, но не теряется).
+    """
+    MAX_SLEEP: float = 60
+    FIRE_TOLERANCE: float = 0.005
+
+    HORIZON_RETRY: float = 60
+    DISPATCH_RETRY: float = 60
+
+    def __init__(self, dispatch: DispatchCallback, loader: LoaderCallback | None = None,
+                 horizon: float | None = None) -> None:
+        """
+        :param dispatch: Корутина обработки сработавших напоминаний.
+        :param loader: Корутина загрузки напоминаний до указанного времени (None - все) при полной синхронизации.
+        :param horizon: Горизонт загрузки расписания (секунды), None - загружаются все напоминания.
+        """
+        self._dispatch = dispatch
+        self._loader = loader
+        self.horizon = horizon
+        self._loaded_until: float | None = None
+        self._heap: list[HeapEntry] = []
+        self._entries: dict[uuid.UUID, ScheduledReminder] = {}
+        self._counter = itertools.count()
+        self._timer: io.TimerHandle | None = None
+        self._loop: io.AbstractEventLoop | None = None
+        self._tasks: set[io.Task] = set()
+        self._in_flight: set[uuid.UUID] = set()
+        self._started: set[uuid.UUID] = set()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, reminder_uuid: uuid.UUID) -> bool:
+        return reminder_uuid in self._entries
+
+    async def start(self, load: bool = True) -> None:
+        """
+        Запуск таймера.
+
+        :param load: Загрузить напоминания через ``loader`` (иначе загрузку выполнит первый ``resync``).
+
+        :return: None.
+        """
+        self._loop = io.get_running_loop()
+        if load:
+            await self.resync()
+
+    async def resync(self) -> None:
+        """Полная перезагрузка расписания через ``loader`` (до горизонта)."""
+        if self._loader is None:
+            self._arm()
+            return
+        loaded_until = time.time() + self.horizon if self.horizon is not None else None
+        reminders = await self._loader(datetime.fromtimestamp(loaded_until) if loaded_until is not None else None)
+        self.reload(reminders, loaded_until=loaded_until)
+
+    def stop(self) -> None:
+        """Остановка таймера. Запущенные обработчики не прерываются."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def reload(self, reminders: Iterable[ScheduledReminder | None], loaded_until: float | None = None) -> None:
+        """
+        Замена всего расписания за O(n).
+
+        :param reminders: Новые записи расписания (None пропускаются).
+        :param loaded_until: Время (timestamp), до которого загружены записи.
+
+        :return: None.
+        """
+        self._loaded_until = loaded_until
+        self._entries = {}
+        for reminder in reminders:
+            if self.__is_pending(reminder) and reminder.uuid not in self._in_flight:
+                self._entries[reminder.uuid] = reminder
+        self._heap = [(reminder.fire_ts, next(self._counter), reminder) for reminder in self._entries.values()]
+        heapq.heapify(self._heap)
+        self._arm()
+
+    def add(self, reminder: ScheduledReminder | None) -> None:
+        """
+        Добавление (или замена по uuid) записи расписания за O(log n).
+
+        :param reminder: Запись расписания.
+
+        :return: None.
+        """
+        if not self.__is_pending(reminder):
+            return
+        if self._loaded_until is not None and reminder.fire_ts >= self._loaded_until:
+            self.cancel(reminder.uuid)
+            return
+        old_reminder = self._entries.get(reminder.uuid)
+        if old_reminder is not None:
+            if old_reminder == reminder:
+                return
+            old_reminder.cancelled = True
+        self._entries[reminder.uuid] = reminder
+        heapq.heappush(self._heap, (reminder.fire_ts, next(self._counter), reminder))
+        if self._heap[0][2] is reminder:
+            self._arm()
+
+    def cancel(self, reminder_uuid: uuid.UUID) -> bool:
+        """
+        Отмена записи расписания.
+
+        :param reminder_uuid: ID напоминания.
+
+        :return: Была ли запись в расписании.
+        """
+        self._in_flight.discard(reminder_uuid)  # Не возвращать в расписание при ошибке обработки.
+        reminder = self._entries.pop(reminder_uuid, None)
+        if reminder is None:
+            return False
+        reminder.cancelled = True
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [entry for entry in self._heap if not entry[2].cancelled]
+            heapq.heapify(self._heap)
+        return True
+
+    def _arm(self) -> None:
+        """Взвод таймера на ближайшую неотменённую запись."""
+        if self._loop is None:
+            return
+        while self._heap and self._heap[0][2].cancelled:
+            heapq.heappop(self._heap)
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        deadlines = [deadline for deadline in (self._heap[0][0] if self._heap else None, self._loaded_until)
+                     if deadline is not None]
+        if not deadlines:
+            return
+        delay = min(max(min(deadlines) - time.time(), 0), self.MAX_SLEEP)
+        self._timer = self._loop.call_at(self._loop.time() + delay, self._on_timer)
+
+    def _on_timer(self) -> None:
+        """Извлечение всех наступивших записей и запуск их обработки."""
+        self._timer = None
+        deadline = time.time() + self.FIRE_TOLERANCE
+        due_reminders = []
+        while self._heap and self._heap[0][0] <= deadline:
+            _, _, reminder = heapq.heappop(self._heap)
+            if reminder.cancelled:
+                continue
+            del self._entries[reminder.uuid]
+            if reminder.on_start:
+                self._started.add(reminder.uuid)
+            due_reminders.append(reminder)
+
+        if due_reminders:
+            self.__create_task(self.__dispatch_due(due_reminders), "Ошибка обработки напоминаний")
+        if self._loaded_until is not None and self._loaded_until <= deadline:
+            self._loaded_until = None
+            self.__create_task(self.__extend_horizon(), "Ошибка загрузки расписания")
+        self._arm()
+
+    async def __dispatch_due(self, reminders: list[ScheduledReminder]) -> None:
+        """Обработка сработавших записей. Пока она идёт, записи не загружаются повторно при ``reload``."""
+        reminder_uuids = {reminder.uuid for reminder in reminders}
+        self._in_flight |= reminder_uuids
+        try:
+            await self._dispatch(reminders)
+        except Exception:
+            self.__retry_dispatch(reminders)
+            raise
+        finally:
+            self._in_flight -= reminder_uuids
+
+    def __retry_dispatch(self, reminders: list[ScheduledReminder]) -> None:
+        """
+        Возврат необработанных записей в расписание через ``DISPATCH_RETRY`` секунд.
+            Записи, отменённые или заменённые во время обработки, не возвращаются.
+        """
+        retry_at = datetime.now() + timedelta(seconds=self.DISPATCH_RETRY)
+        for reminder in reminders:
+            if reminder.uuid not in self._in_flight or reminder.uuid in self._entries:
+                continue
+            self._started.discard(reminder.uuid)
+            self.add(reminder.reschedule(retry_at))
+
+    def __is_pending(self, reminder: ScheduledReminder | None) -> bool:
+        """Запись нужно планировать: не None и не уже сработавшее в этом процессе напоминание ``on_start``."""
+        return reminder is not None and not (reminder.on_start and reminder.uuid in self._started)
+
+    async def __extend_horizon(self) -> None:
+        """Загрузка следующего окна расписания. При ошибке повтор через ``HORIZON_RETRY`` секунд."""
+        try:
+            await self.resync()
+        except Exception:
+            self._loaded_until = time.time() + self.HORIZON_RETRY
+            self._arm()
+            raise
+
+    def __create_task(self, coroutine: Coroutine, error_msg: str) -> None:
+        task = self._loop.create_task(coroutine)
+        self._tasks.add(task)
+        task.add_done_callback(partial(self.__task_done, error_msg=error_msg))
+
+    def __task_done(self, task: io.Task, error_msg: str) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("%s: %r", error_msg, task.exception(), exc_info=task.exception())
@@ -0,0 +1,159 @@
+import asyncio as io
+import logging
+import time
+from array import array
+from typing import Any, Callable, Coroutine
+
+from pynput import keyboard, mouse
+
+logger = logging.getLogger(__name__)
+
+type BreakCallback = Callable[[int, float], Coroutine[Any, Any, None]]
+
+
+class MinuteCounter:
+    """
+    Кольцевой буфер количества событий по минутам за последние ``size`` минут (``array``, без объекта на событие).
+        Пишет один поток (слушатель pynput), поэтому запись не требует блокировок;
+        минуты без событий обнуляются при следующем событии.
+    """
+    __slots__ = ("counts", "minute", "last")
+
+    def __init__(self, size: int) -> None:
+        self.counts = array("I", bytes(4 * size))
+        self.minute: int = 0
+        self.last: float = 0.0
+
+    def hit(self, *_args) -> None:
+        """Учёт события (аргументы обработчика pynput игнорируются)."""
+        now = time.time()
+        minute = int(now // 60)
+        if minute != self.minute:
+            self.__advance(minute)
+        self.counts[minute % len(self.counts)] += 1
+        self.last = now
+
+    def get(self, minute: int) -> int:
+        """Количество событий за минуту (номер минуты с начала эпохи), 0 - вне буфера."""
+        if minute > self.minute or minute <= self.minute - len(self.counts):
+            return 0
+        return self.counts[minute % len(self.counts)]
+
+    def __advance(self, minute: int) -> None:
+        size = len(self.counts)
+        for stale in range(max(self.minute + 1, minute - size + 1), minute + 1):
+            self.counts[stale % size] = 0
+        self.minute = minute
+
+
+class WorkSessionTracker:
+    """
+    Учёт непрерывной работы за компьютером для напоминаний о перерыве.
+        Слушатели клавиатуры и мыши pynput только увеличивают счётчик текущей минуты (``MinuteCounter``),
+        а раз в ``CHECK_INTERVAL`` секунд event loop по этим счётчикам находит последний перерыв -
+        не менее ``idle`` секунд без событий - и время непрерывной работы после него.
+        Когда время работы превышает ``break_time`` (и далее каждые ``break_time``), вызывается ``on_break``.
+        Напоминания повторяются не чаще раза в ``MIN_REMIND_INTERVAL`` секунд при любом ``break_time``.
+    """
+    HISTORY_MINUTES: int = 24 * 60
+    CHECK_INTERVAL: float = 30
+    MIN_REMIND_INTERVAL: float = 60
+
+    def __init__(self, on_break: BreakCallback, break_time: Callable[[], float],
+                 idle: Callable[[], float]) -> None:
+        """
+        :param on_break: Корутина напоминания (минуты непрерывной работы, часы работы за ``HISTORY_MINUTES``).
+        :param break_time: Время непрерывной работы до напоминания (секунды), читается при каждой проверке.
+        :param idle: Время без событий, которое считается перерывом (секунды), читается при каждой проверке.
+        """
+        self._on_break = on_break
+        self._break_time = break_time
+        self._idle = idle
+        self.keyboard_counter = MinuteCounter(self.HISTORY_MINUTES)
+        self.mouse_counter = MinuteCounter(self.HISTORY_MINUTES)
+        self._listeners: list[keyboard.Listener | mouse.Listener] = []
+        self._reminded_at: float | None = None
+        self._stopped = False
+
+    def start(self) -> None:
+        """Запуск слушателей клавиатуры и мыши (потоки pynput)."""
+        key_hit, mouse_hit = self.keyboard_counter.hit, self.mouse_counter.hit
+        self._listeners = [
+            keyboard.Listener(on_press=key_hit),
+            mouse.Listener(on_move=mouse_hit, on_click=mouse_hit, on_scroll=mouse_hit),
+        ]
+        for listener in self._listeners:
+            listener.start()
+
+    def stop(self) -> None:
+        """Остановка слушателей и проверок."""
+        self._stopped = True
+        for listener in self._listeners:
+            listener.stop()
+        self._listeners = []
+
+    def is_active(self, minute: int) -> bool:
+        """Были ли события клавиатуры или мыши за минуту."""
+        return bool(self.keyboard_counter.get(minute) or self.mouse_counter.get(minute))
+
+    @property
+    def last_activity(self) -> float:
+        """Время (timestamp) последнего события клавиатуры или мыши."""
+        return max(self.keyboard_counter.last, self.mouse_counter.last)
+
+    def active_since(self, now: float | None = None) -> float | None:
+        """
+        Начало непрерывной работы: первая активная минута после последнего перерыва.
+
+        :param now: Текущее время (timestamp).
+
+        :return: Timestamp начала или None, если сейчас перерыв.
+        """
+        now = time.time() if now is None else now
+        idle = self._idle()
+        if now - self.last_activity >= idle:
+            return None
+        idle_minutes = max(int(idle // 60), 1)
+        minute = int(now // 60)
+        start, gap = minute, 0
+        for minute in range(minute, minute - self.HISTORY_MINUTES, -1):
+            if self.is_active(minute):
+                start, gap = minute, 0
+            else:
+                gap += 1
+                if gap >= idle_minutes:
+                    break
+        return start * 60.0
+
+    def worked_hours(self, now: float | None = None) -> float:
+        """Количество часов с событиями клавиатуры или мыши за последние ``HISTORY_MINUTES`` минут."""
+        minute = int((time.time() if now is None else now) // 60)
+        return sum(map(self.is_active, range(minute - self.HISTORY_MINUTES + 1, minute + 1))) / 60
+
+    async def check(self, now: float | None = None) -> None:
+        """
+        Проверка времени непрерывной работы и напоминание о перерыве.
+
+        :param now: Текущее время (timestamp).
+
+        :return: None.
+        """
+        now = time.time() if now is None else now
+        active_since = self.active_since(now)
+        if active_since is None:
+            self._reminded_at = None
+            return
+        break_time = max(self._break_time(), self.MIN_REMIND_INTERVAL)
+        since_reminder = now - max(active_since, self._reminded_at or active_since)
+        if since_reminder >= break_time:
+            self._reminded_at = now
+            await self._on_break(round((now - active_since) / 60), round(self.worked_hours(now), 1))
+
+    async def run(self) -> None:
+        """Проверки раз в ``CHECK_INTERVAL`` секунд (но не реже, чем ``break_time``) до ``stop``."""
+        while not self._stopped:
+            await io.sleep(min(self.CHECK_INTERVAL, max(self._break_time(), self.MIN_REMIND_INTERVAL)))
+            try:
+                await self.check()
+            except Exception as e:
+                logger.exception("Ошибка проверки времени работы: %r", e)